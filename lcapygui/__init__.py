@@ -1,9 +1,12 @@
 """
 Root-level lcapy-gui objects.
 These can be imported directly from lcapy-gui.
+
+These are imported lazily so that importing a submodule, say
+lcapygui.components.sketch, does not import Tk, matplotlib, and
+Lcapy.
 """
 
-from .ui.tk.lcapytk import LcapyTk
 import sys
 
 if sys.version_info < (3, 8):
@@ -23,3 +26,12 @@ pkg = importlib_resources.files('lcapygui')
 __datadir__ = pkg / 'data'
 
 __libdir__ = __datadir__ / 'lib'
+
+
+def __getattr__(name):
+
+    if name == 'LcapyTk':
+        from .ui.tk.lcapytk import LcapyTk
+
+        return LcapyTk
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
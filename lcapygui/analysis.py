@@ -0,0 +1,82 @@
+"""Circuit analyses that can be run in a worker process.  These take
+netlist strings rather than circuits so that the arguments are
+cheap to pickle."""
+
+from .jobs import progress
+
+
+def make_circuit(netlist):
+
+    from lcapy import Circuit
+
+    progress('Parsing netlist')
+    return Circuit(netlist)
+
+
+def remove_independent_sources(cct):
+
+    cct = cct.copy()
+    values = list(cct.elements.values())
+    for cpt in values:
+        if cpt.is_independent_source:
+            cct.remove(cpt.name)
+    return cct
+
+
+def quantity(netlist, name, attr):
+    """Return attribute `attr` of the component or node `name`, for
+    example, `v`, `i`, `Z`, or `V.n`."""
+
+    cct = make_circuit(netlist)
+
+    progress('Solving')
+    result = cct[name]
+    for part in attr.split('.'):
+        result = getattr(result, part)
+    return result
+
+
+def nodal_equations(netlist):
+
+    cct = make_circuit(netlist)
+
+    progress('Performing nodal analysis')
+    na = cct.nodal_analysis()
+
+    progress('Creating equations')
+    return na.nodal_equations()
+
+
+def mesh_equations(netlist):
+
+    cct = make_circuit(netlist)
+
+    progress('Performing loop analysis')
+    la = cct.loop_analysis()
+
+    progress('Creating equations')
+    return la.mesh_equations()
+
+
+def twoport(netlist, input_cpt, output_cpt, kind):
+
+    cct = remove_independent_sources(make_circuit(netlist))
+
+    progress('Solving')
+    return cct.twoport(input_cpt, output_cpt, model=kind)
+
+
+def transfer_function(netlist, input_cpt, output_cpt, kind):
+
+    cct = remove_independent_sources(make_circuit(netlist))
+
+    progress('Solving')
+    if kind == 'Voltage ratio':
+        return cct.voltage_gain(input_cpt, output_cpt)
+    elif kind == 'Current ratio':
+        return cct.current_gain(input_cpt, output_cpt)
+    elif kind == 'Transimpedance':
+        return cct.transimpedance(input_cpt, output_cpt)
+    elif kind == 'Transadmittance':
+        return cct.transadmittance(input_cpt, output_cpt)
+    raise ValueError('Unknown kind')
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from hashlib import sha1
+
+
+def fingerprint(cct):
+    """Return hash of the electrically relevant parts of a circuit:
+    the component names, types, nodes, and arguments (including
+    initial conditions).  Drawing options are ignored and so are the
+    names of wires since these are often anonymous."""
+
+    lines = []
+    for cpt in cct.elements.values():
+        name = cpt.type if cpt.type in ('W', 'O') else cpt.name
+        keyword = cpt.keyword[1] if cpt.keyword else ''
+        lines.append(' '.join((name, cpt.type, keyword) +
+                              tuple(cpt.node_names) +
+                              tuple(str(arg) for arg in cpt.args)))
+
+    # The order of the netlist does not matter.
+    lines.sort()
+    return sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """In-memory cache of analysis results keyed by the circuit
+    fingerprint, the analysis function, and its arguments.  The least
+    recently used results are discarded when there are more than
+    `max_entries`."""
+
+    def __init__(self, max_entries=64):
+
+        self.max_entries = max_entries
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, cct, func, args=()):
+
+        return (fingerprint(cct), func.__module__, func.__name__, args)
+
+    def lookup(self, key):
+        """Return (True, result) if cached otherwise (False, None)."""
+
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return True, self.results[key]
+
+        self.misses += 1
+        return False, None
+
+    def save(self, key, result):
+
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+    def clear(self):
+
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+
+        return len(self.results)
+
+    def __repr__(self):
+
+        return '%s(entries=%d, hits=%d, misses=%d)' % (
+            self.__class__.__name__, len(self), self.hits, self.misses)
@@ -0,0 +1,206 @@
+"""Headless batch analysis of schematic files.  Each file is loaded
+with the same model as the GUI, but with a user interface that draws
+to an offscreen figure and records messages rather than showing
+dialogs.  The requested analyses are run and the results are written as JSON,
+LaTeX, or a PNG image of the schematic.  Files are processed in
+parallel by a pool of worker processes."""
+
+from os import makedirs
+from os.path import abspath, basename, commonpath, dirname, join, relpath, \
+    splitext
+import json
+from . import analysis
+from .ui.headless import OffscreenUI
+
+
+# Analysis names and descriptions of their arguments.
+analyses = {
+    'voltage': 'voltage[:node] for the node voltages (default all nodes)',
+    'tf': 'tf:input:output[:kind] for a transfer function, kind is'
+    ' voltage, current, transimpedance, or transadmittance',
+    'twoport': 'twoport:input:output:model for a twoport, model is'
+    ' A, B, G, H, S, T, Y, or Z',
+    'nodal': 'nodal for the nodal equations',
+    'mesh': 'mesh for the mesh equations'
+}
+
+tf_kinds = {'voltage': 'Voltage ratio', 'current': 'Current ratio',
+            'transimpedance': 'Transimpedance',
+            'transadmittance': 'Transadmittance'}
+
+formats = ('json', 'tex', 'png')
+
+
+class BatchUI(OffscreenUI):
+    """User interface for a model without a display; the schematic is
+    drawn on an offscreen figure and messages that would be shown in
+    dialogs are recorded in `messages`."""
+
+    NAME = 'lcapy-batch'
+
+
+def parse_analysis(spec, cct):
+    """Return list of (name, func, args) for the analysis `spec`, see
+    `analyses`."""
+
+    parts = spec.split(':')
+    name, args = parts[0], parts[1:]
+
+    if name == 'voltage':
+        if args == []:
+            args = [node for node in cct.nodes
+                    if node != '0' and node[0] != '_']
+        return [('V(%s)' % node, analysis.quantity, (node, 'V'))
+                for node in args]
+    elif name == 'tf' and len(args) in (2, 3):
+        kind = tf_kinds[args[2] if len(args) == 3 else 'voltage']
+        return [('%s %s to %s' % (kind, args[0], args[1]),
+                 analysis.transfer_function, (args[0], args[1], kind))]
+    elif name == 'twoport' and len(args) == 3:
+        return [('%s twoport %s to %s' % (args[2], args[0], args[1]),
+                 analysis.twoport, tuple(args))]
+    elif name == 'nodal' and args == []:
+        return [('Nodal equations', analysis.nodal_equations, ())]
+    elif name == 'mesh' and args == []:
+        return [('Mesh equations', analysis.mesh_equations, ())]
+    raise ValueError('Unknown analysis %s' % spec)
+
+
+def latex(result):
+
+    try:
+        return result.latex()
+    except AttributeError:
+        return str(result)
+
+
+def write_tex(pathname, title, results):
+
+    with open(pathname, 'w') as f:
+        f.write('%% %s\n' % title)
+        for result in results:
+            f.write('%% %s\n' % result['name'])
+            f.write('\\begin{equation}\n%s\n\\end{equation}\n\n' %
+                    result['latex'])
+
+
+def analyse(model, specs, messages):
+    """Run the analyses `specs` for the circuit of `model` and return a
+    list of result dictionaries.  Errors are appended to `messages`."""
+
+    # This has a ground node added if needed.
+    netlist = model.analysis_circuit.netlist()
+
+    results = []
+    for spec in specs:
+        try:
+            items = parse_analysis(spec, model.circuit)
+        except (ValueError, KeyError) as e:
+            messages.append(('error', str(e)))
+            continue
+
+        for name, func, args in items:
+            try:
+                result = func(netlist, *args)
+            except Exception as e:
+                messages.append(('error', '%s: %s' % (name, e)))
+                continue
+            results.append({'name': name, 'expr': str(result),
+                            'latex': latex(result)})
+    return results
+
+
+def failed(model, messages):
+
+    return (model.circuit.elements == {} or
+            any(kind == 'error' for kind, _ in messages))
+
+
+def output_names(pathnames):
+    """Return the output filename, without extension, for each of the
+    schematic files `pathnames`.  This is the basename of the file
+    unless this is not unique, in which case the path relative to the
+    common directory of the files is used."""
+
+    names = [splitext(basename(pathname))[0] for pathname in pathnames]
+    if len(set(names)) == len(names):
+        return names
+
+    pathnames = [abspath(pathname) for pathname in pathnames]
+    topdir = commonpath([dirname(pathname) for pathname in pathnames])
+    return [splitext(relpath(pathname, topdir))[0]
+            for pathname in pathnames]
+
+
+def process_file(pathname, specs, outdir, formats=('json', ), name=None):
+    """Run the analyses `specs` for the schematic file `pathname` and
+    write the results to `outdir`.  The output files are called `name`
+    with the extension for the format; by default, `name` is the
+    basename of `pathname`.  This returns a summary dictionary."""
+
+    ui = BatchUI()
+    model = ui.load(pathname)
+
+    summary = {'filename': pathname, 'results': [],
+               'messages': ui.messages, 'outputs': []}
+
+    if failed(model, ui.messages):
+        summary['failed'] = True
+        return summary
+
+    summary['results'] = analyse(model, specs, ui.messages)
+    summary['failed'] = any(kind == 'error' for kind, _ in ui.messages)
+
+    if name is None:
+        name = splitext(basename(pathname))[0]
+    stem = join(outdir, name)
+    makedirs(dirname(stem) or '.', exist_ok=True)
+
+    if 'png' in formats:
+        ui.savefig(stem + '.png')
+        summary['outputs'].append(stem + '.png')
+    if 'tex' in formats:
+        write_tex(stem + '.tex', pathname, summary['results'])
+        summary['outputs'].append(stem + '.tex')
+    if 'json' in formats:
+        summary['outputs'].append(stem + '.json')
+        with open(stem + '.json', 'w') as f:
+            json.dump(summary, f, indent=1)
+
+    return summary
+
+
+def _process_file(args):
+
+    pathname = args[0]
+    try:
+        return process_file(*args)
+    except Exception as e:
+        return {'filename': pathname, 'failed': True, 'results': [],
+                'messages': [('error', str(e))], 'outputs': []}
+
+
+def process_files(pathnames, specs, outdir, formats=('json', ),
+                  num_workers=None):
+    """Process the schematic files `pathnames`, in parallel if
+    `num_workers` is not 1.  This yields the summary for each file as
+    it is completed.  Files with the same basename have their outputs
+    in subdirectories of `outdir`, see `output_names()`."""
+
+    tasks = [(pathname, specs, outdir, formats, name)
+             for pathname, name in zip(pathnames, output_names(pathnames))]
+
+    if num_workers == 1 or len(tasks) < 2:
+        for task in tasks:
+            yield _process_file(task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from multiprocessing import get_context
+
+    # Spawn rather than fork for consistency with the GUI.
+    with ProcessPoolExecutor(num_workers,
+                             mp_context=get_context('spawn')) as executor:
+        futures = [executor.submit(_process_file, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
@@ -6,8 +6,6 @@ from .tf import TF
 from .utils import point_in_polygon
 
 from numpy import array, nan
-from lcapy.opts import Opts
-from lcapy.schemmisc import Pos
 
 from typing import Union
 from abc import ABC, abstractmethod
@@ -67,6 +65,8 @@ class Component(ABC):
         # otherwise it is an Opts object created when the component is
         # loaded from a file.
         if opts is None:
+            from lcapy.opts import Opts
+
             opts = Opts()
         else:
             opts = opts.copy()
@@ -74,9 +74,12 @@ class Component(ABC):
         self.name = name
         self.nodes = nodes
         self.opts = opts
+        self._tf = None
         self.control = None
         self.attrs = ''
         self.annotations = []
+        # Matplotlib artists used to draw the component
+        self.artists = []
         self.label = ''
         self.voltage_label = ''
         self.current_label = ''
@@ -215,10 +218,9 @@ class Component(ABC):
 
     def _sketch_lookup(self, model):
 
-        ui = model.ui
         style = model.preferences.style
 
-        sketch = ui.sketchlib.lookup(self.sketch_key, style)
+        sketch = model.sketchlib.lookup(self.sketch_key, style)
         return sketch
 
     def draw(self, model, **kwargs):
@@ -241,6 +243,8 @@ class Component(ABC):
 
     def make_kwargs(self, model, **kwargs):
 
+        from lcapy.opts import Opts
+
         opts = Opts(self.attrs)
 
         line_width = model.preferences.line_width
@@ -303,6 +307,8 @@ class Component(ABC):
     @property
     def midpoint(self):
 
+        from lcapy.schemmisc import Pos
+
         return Pos(self.tf.transform((0, 0)))
 
     @property
@@ -443,6 +449,16 @@ class Component(ABC):
 
         return point_in_polygon(xb, yb, path)
 
+    @property
+    def bbox(self):
+        """Return axis-aligned bounding box (xmin, ymin, xmax, ymax)
+        of the component's hit-test region."""
+
+        path = self.tf.transform(array(self.bbox_path) * 0.9)
+        xmin, ymin = path.min(axis=0)
+        xmax, ymax = path.max(axis=0)
+        return xmin, ymin, xmax, ymax
+
     def netitem_nodes(self, node_names):
 
         parts = []
@@ -480,6 +496,7 @@ class Component(ABC):
         # requires the node positions to be passed as arguments.
         if nodes is not None:
             self.nodes = nodes
+            self.invalidate_tf()
 
         # This updates the opts such as `right` that cannot be
         # determined until the node positions are defined.   However,
@@ -489,13 +506,10 @@ class Component(ABC):
             self.opts = opts
 
     def choose_node_name(self, m, nodes):
+        """Return name for the new node `m`; `nodes` is the NameIndex of
+        the node names in use."""
 
-        num = 1
-        while True:
-            name = str(num)
-            if name not in nodes:
-                return name
-            num += 1
+        return nodes.choose()
 
     def make_tf(self, x1, y1, x2, y2, pin1, pin2):
 
@@ -517,11 +531,28 @@ class Component(ABC):
         return self.make_tf(node1.pos.x, node1.pos.y, node2.pos.x, node2.pos.y,
                             pin1, pin2)
 
+    def _tf_key(self):
+
+        node1 = self.node1
+        node2 = self.node2
+        pins = self.pins
+
+        return (node1.pos.x, node1.pos.y, node2.pos.x, node2.pos.y,
+                self.pinname1, self.pinname2,
+                tuple(pins[self.pinname1][1:]),
+                tuple(pins[self.pinname2][1:]))
+
     @property
     def tf(self):
 
-        # If this was cached then need to update if the node
-        # positions are changed.
-        tf = self.find_tf(self.pinname1, self.pinname2)
+        # The transform is cached and only recomputed when the
+        # node positions or pins change.
+        key = self._tf_key()
+        if self._tf is None or self._tf[0] != key:
+            self._tf = key, self.find_tf(self.pinname1, self.pinname2)
+
+        return self._tf[1]
+
+    def invalidate_tf(self):
 
-        return tf
+        self._tf = None
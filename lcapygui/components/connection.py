@@ -49,7 +49,7 @@ class Connection(Bipole):
         sketch.draw_old(model, offset=offset,
                         angle=angle, snap=False, **kwargs)
 
-        sketcher = model.ui.sketcher
+        sketcher = model.sketcher
         sketcher.stroke_line(x1, y1, x2, y2, **kwargs)
 
     def split_node_pos(self, x, y, step=1, flip=False):
@@ -138,6 +138,13 @@ class Connection(Bipole):
         r = sqrt((x - xm)**2 + (y - ym)**2)
         return r < 0.5
 
+    @property
+    def bbox(self):
+
+        xm = self.midpoint.x
+        ym = self.midpoint.y
+        return xm - 0.5, ym - 0.5, xm + 0.5, ym + 0.5
+
     def choose_node_name(self, m, nodes):
 
         if m == 0 and self.symbol_kind in ('vcc', 'vdd'):
@@ -33,6 +33,6 @@ class Fixed(Component):
         if 'invisible' in kwargs or 'nodraw' in kwargs or 'ignore' in kwargs:
             return
 
-        tf = self.find_tf(self.pinname1, self.pinname2)
+        tf = self.tf
         sketch = self._sketch_lookup(model)
         sketch.draw(model, tf, **kwargs)
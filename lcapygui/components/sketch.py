@@ -1,6 +1,4 @@
-from lcapy import Circuit
 from .tf import TF
-from .svgparse import SVGParse
 from os.path import join
 from matplotlib.path import Path
 
@@ -45,12 +43,17 @@ class Sketch:
         return self.kwargs.get('color', 'black')
 
     @classmethod
-    def load(cls, sketch_key, style='american', complain=True):
+    def svg_filename(cls, sketch_key, style='american'):
 
         from lcapygui import __datadir__
 
         dirname = __datadir__ / 'svg' / style
-        svg_filename = dirname / (sketch_key + '.svg')
+        return dirname / (sketch_key + '.svg')
+
+    @classmethod
+    def load(cls, sketch_key, style='american', complain=True):
+
+        svg_filename = cls.svg_filename(sketch_key, style)
 
         if not svg_filename.exists():
 
@@ -66,6 +69,8 @@ class Sketch:
     @classmethod
     def load_file(cls, svg_filename):
 
+        from .svgparse import SVGParse
+
         svg = SVGParse(svg_filename)
 
         sketch_paths = []
@@ -84,6 +89,8 @@ class Sketch:
         dirname = join('lcapygui', 'data', 'svg', style)
         svg_filename = join(dirname, sketch_key + '.svg')
 
+        from lcapy import Circuit
+
         a = Circuit()
 
         net = sketch_net
@@ -213,7 +220,7 @@ class Sketch:
                 xoffset, yoffset = self.horizontal_wire_offsets()
                 # Hack to simplify positioning
                 xoffset = 0
-        elif cpt_type in ('P', ):
+        elif cpt_type in ('A', 'O', 'P'):
             xoffset = 0
             yoffset = 0
         else:
@@ -241,7 +248,7 @@ class Sketch:
 
     def draw_old(self, model, offset=(0, 0), scale=1, angle=0, **kwargs):
 
-        sketcher = model.ui.sketcher
+        sketcher = model.sketcher
 
         tf = TF().rotate_deg(angle).scale(scale * self.SCALE)
         tf = tf.translate(*offset)
@@ -250,7 +257,7 @@ class Sketch:
 
     def draw(self, model, tf, **kwargs):
 
-        sketcher = model.ui.sketcher
+        sketcher = model.sketcher
 
         # TODO, simplify  (tf.scale() but don't want to scale the offset)
 
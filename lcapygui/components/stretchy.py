@@ -61,7 +61,7 @@ class Stretchy(Component):
         kwargs.pop('mirror', False)
         kwargs.pop('invert', False)
 
-        sketcher = model.ui.sketcher
+        sketcher = model.sketcher
         sketcher.stroke_line(*p1, *p1p, **kwargs)
         sketcher.stroke_line(*p2p, *p2, **kwargs)
 
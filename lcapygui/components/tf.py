@@ -20,6 +20,38 @@ class TF(Affine2D):
         x0, y0 = xpos1
         x1, y1 = xpos2
 
+        # Solve u + j v = (a - j b) (x + j y) + (c + j d) in closed
+        # form using the two pairs of points.
+        dx = x1 - x0
+        dy = y1 - y0
+        den = dx * dx + dy * dy
+
+        if den == 0:
+            # Coincident points; fall back to least squares solution.
+            return cls._from_points_pair_pinv(xpos1, upos1, xpos2, upos2)
+
+        du = u1 - u0
+        dv = v1 - v0
+
+        a = (du * dx + dv * dy) / den
+        b = (du * dy - dv * dx) / den
+        c = u0 - a * x0 - b * y0
+        d = v0 + b * x0 - a * y0
+
+        obj = cls.from_values(a, -b, b, a, c, d)
+        # Hack since Affine2D hardwires class
+        obj.__class__ = cls
+        return obj
+
+    @classmethod
+    def _from_points_pair_pinv(cls, xpos1, upos1, xpos2, upos2):
+
+        u0, v0 = upos1
+        u1, v1 = upos2
+
+        x0, y0 = xpos1
+        x1, y1 = xpos2
+
         A = array(((x0, y0, 1, 0), (y0, -x0, 0, 1),
                    (x1, y1, 1, 0), (y1, -x1, 0, 1)))
 
@@ -27,8 +59,6 @@ class TF(Affine2D):
 
         m = dot(pinv(A), u)
 
-        H = array(((m[0], m[1], m[2]), (-m[1], m[0], m[3]), (0, 0, 1)))
-
         obj = cls.from_values(m[0], -m[1], m[1], m[0], m[2], m[3])
         # Hack since Affine2D hardwires class
         obj.__class__ = cls
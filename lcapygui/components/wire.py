@@ -9,7 +9,7 @@ class Wire(Bipole):
 
     def draw(self, model, **kwargs):
 
-        sketcher = model.ui.sketcher
+        sketcher = model.sketcher
 
         x1, y1 = self.node1.x, self.node1.y
         x2, y2 = self.node2.x, self.node2.y
@@ -0,0 +1,120 @@
+"""Vectorised evaluation of Lcapy expressions for plotting.
+
+Lcapy's `evaluate()` method lambdifies the expression on every call
+and then evaluates it one point at a time.  Here the expression is
+lambdified once, with the domain variable and the other symbols as
+arguments, and the compiled function is cached on the expression.  It
+is then evaluated for a whole vector of points in a single call; new
+symbol values do not require the expression to be substituted."""
+
+import numpy as np
+
+
+def _heaviside(arg, zero=0.5):
+
+    return np.heaviside(np.real(arg), zero)
+
+
+def _sign(arg):
+
+    return 2 * _heaviside(arg) - 1
+
+
+def _rect(arg):
+
+    return _heaviside(arg + 0.5) - _heaviside(arg - 0.5)
+
+
+def _sincn(arg):
+
+    return np.sinc(arg)
+
+
+def _sincu(arg):
+
+    return np.sinc(arg / np.pi)
+
+
+def _sqrt(arg):
+
+    # Use the principal square root for negative arguments.
+    return np.emath.sqrt(arg)
+
+
+_functions = {'Heaviside': _heaviside, 'UnitStep': _heaviside,
+              'sign': _sign, 'rect': _rect, 'sincn': _sincn,
+              'sincu': _sincu, 'sqrt': _sqrt}
+
+
+def lambdify_sympy(sexpr, varname, symbols):
+    """Return function f(arg, *values) that evaluates the SymPy
+    expression `sexpr` where `arg` is the value of the variable
+    `varname` and `values` are the values of `symbols`.  The arguments
+    can be arrays that are broadcast together."""
+
+    from sympy import lambdify, DiracDelta
+
+    if sexpr.has(DiracDelta):
+        # These need to be plotted as arrows.
+        raise ValueError('Cannot vectorise expression with Dirac deltas')
+
+    # Use the symbols from the expression so that the assumptions
+    # match.
+    names = dict((symbol.name, symbol) for symbol in sexpr.free_symbols)
+    args = [names.get(name, name) for name in (varname, ) + tuple(symbols)]
+
+    unknown = set(names) - {varname} - set(symbols)
+    if unknown:
+        raise ValueError('Undefined symbols %s' % ', '.join(sorted(unknown)))
+
+    return lambdify(args, sexpr, [_functions, 'numpy', 'scipy'])
+
+
+def compile_expr(expr, symbols):
+    """Return function f(arg, *values) that evaluates `expr` where `arg`
+    is a vector for the domain variable and `values` are the values of
+    `symbols`.  The function is cached on `expr`.  This raises
+    ValueError if the expression cannot be vectorised."""
+
+    if getattr(expr, 'var', None) is None:
+        raise ValueError('Expression has no domain variable')
+
+    symbols = tuple(symbols)
+    cache = expr.__dict__.setdefault('_compiled', {})
+    if symbols not in cache:
+        cache[symbols] = lambdify_sympy(expr.doit().sympy, expr.var.name,
+                                        symbols)
+    return cache[symbols]
+
+
+def evaluate(expr, arg, defs=None):
+    """Evaluate `expr` for the vector `arg` of the domain variable with
+    the other symbols defined by the dictionary `defs`.  The result is
+    real if the imaginary parts are zero.  This raises ValueError if
+    the expression cannot be vectorised."""
+
+    if defs is None:
+        defs = {}
+
+    symbols = sorted(defs)
+    func = compile_expr(expr, symbols)
+
+    arg = np.asarray(arg, dtype=float)
+    try:
+        with np.errstate(all='ignore'):
+            result = func(arg, *[defs[symbol] for symbol in symbols])
+            # A constant expression returns a scalar.
+            result = np.broadcast_to(np.asarray(result, dtype=complex),
+                                     arg.shape).copy()
+    except (TypeError, NameError, AttributeError, ZeroDivisionError) as e:
+        raise ValueError('Cannot vectorise expression: %s' % e)
+
+    # Let Lcapy find the limits where the result is undefined, say
+    # for sin(t) / t at t = 0.
+    undefined = np.isnan(result)
+    if undefined.any() and not undefined.all():
+        result[undefined] = expr.subs(defs).evaluate(arg[undefined])
+
+    if np.allclose(result.imag, 0.0):
+        result = result.real
+    return result
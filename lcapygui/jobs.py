@@ -0,0 +1,302 @@
+from importlib import import_module
+from io import BytesIO
+from multiprocessing import cpu_count, get_context
+from time import monotonic
+import pickle
+
+
+# Progress reporter for the job running in this process; this is
+# None except in a worker process.
+_reporter = None
+
+
+def progress(message):
+    """Report progress of the current job.  This does nothing unless
+    called from a job running in a worker process."""
+
+    if _reporter is not None:
+        _reporter(message)
+
+
+def _rebuild(cls, state, items=None):
+
+    obj = cls.__new__(cls)
+    if items is not None:
+        # Use the builtin container so that subclasses such as
+        # OrderedDict keep their internal state consistent.
+        for base in cls.__mro__:
+            if issubclass(base, dict) and not _is_lcapy_class(base):
+                base.update(obj, items)
+                break
+    obj.__dict__.update(state)
+    return obj
+
+
+def _is_lcapy_class(cls):
+
+    return (getattr(cls, '__module__', None) or '').startswith('lcapy')
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler for Lcapy objects.  Lcapy expressions define
+    __getattr__ which recurses when the default unpickling probes the
+    partially constructed object for __setstate__, so these are
+    rebuilt directly from their __dict__."""
+
+    def reducer_override(self, obj):
+
+        cls = type(obj)
+        if (isinstance(obj, type) or not _is_lcapy_class(cls) or
+                not hasattr(obj, '__dict__')):
+            return NotImplemented
+        if isinstance(obj, dict):
+            return _rebuild, (cls, obj.__dict__, dict(obj))
+        return _rebuild, (cls, obj.__dict__)
+
+
+def dumps(obj):
+
+    f = BytesIO()
+    _Pickler(f, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return f.getvalue()
+
+
+def _worker_main(conn):
+
+    global _reporter
+
+    # Warm up so that the first job does not pay for the import.
+    import_module('lcapy')
+
+    job_id = None
+
+    def reporter(message):
+        conn.send(('progress', job_id, message))
+
+    _reporter = reporter
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        job_id, func, args = request
+        try:
+            result = func(*args)
+            progress('Sending result')
+            conn.send(('done', job_id, dumps(result)))
+        except Exception as e:
+            try:
+                error = dumps(e)
+            except Exception:
+                error = dumps(RuntimeError(str(e)))
+            conn.send(('error', job_id, error))
+
+
+class Job:
+
+    def __init__(self, scheduler, job_id, func, args, description='',
+                 on_done=None, on_error=None):
+
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.description = description
+        self.on_done = on_done
+        self.on_error = on_error
+        self.state = 'pending'
+        self.message = 'Waiting'
+        self.result = None
+        self.error = None
+        self.start_time = monotonic()
+
+    @property
+    def active(self):
+
+        return self.state in ('pending', 'running')
+
+    @property
+    def elapsed(self):
+
+        return monotonic() - self.start_time
+
+    def cancel(self):
+
+        self.scheduler.cancel(self)
+
+
+class _Worker:
+
+    def __init__(self, context):
+
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main,
+                                       args=(child_conn, ), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.job = None
+
+    def submit(self, job):
+
+        self.job = job
+        job.state = 'running'
+        job.message = 'Starting'
+        self.conn.send((job.job_id, job.func, job.args))
+
+    def stop(self, terminate=False):
+
+        if terminate:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        self.conn.close()
+
+
+class JobScheduler:
+    """Run jobs in a pool of worker processes so that long analyses do
+    not block the user interface.  This does not use threads; `poll()`
+    needs to be called periodically from the event loop to dispatch
+    pending jobs and to call the completion callbacks.
+
+    The job function and its arguments must be picklable; circuits
+    are best passed as netlist strings.  A running job is cancelled by
+    terminating its worker process.
+
+    If `on_callback_error` is set, it is called with the job and the
+    exception when a completion callback raises an exception, or when
+    a job fails without an `on_error` callback, rather than the
+    exception propagating out of `poll()`."""
+
+    def __init__(self, num_workers=None):
+
+        if num_workers is None:
+            num_workers = max(1, min(2, cpu_count() - 1))
+
+        # Spawn rather than fork since the parent may be running a
+        # GUI toolkit that is not fork safe.
+        self.context = get_context('spawn')
+        self.num_workers = num_workers
+        self.workers = []
+        self.pending = []
+        self.last_job_id = 0
+        self.on_callback_error = None
+
+    def start(self):
+        """Start the worker processes in advance."""
+
+        while len(self.workers) < self.num_workers:
+            self.workers.append(_Worker(self.context))
+
+    def submit(self, func, *args, description='', on_done=None,
+               on_error=None):
+
+        self.last_job_id += 1
+        job = Job(self, self.last_job_id, func, args, description,
+                  on_done, on_error)
+        self.pending.append(job)
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+
+        if self.pending == []:
+            return
+
+        self.start()
+        for worker in self.workers:
+            if self.pending == []:
+                break
+            if worker.job is None:
+                worker.submit(self.pending.pop(0))
+
+    def _replace(self, worker):
+
+        worker.stop(terminate=True)
+        self.workers.remove(worker)
+        self.workers.append(_Worker(self.context))
+
+    def _receive(self, worker):
+
+        job = worker.job
+        try:
+            kind, job_id, data = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died, say from running out of memory.
+            self._replace(worker)
+            self._finish(job, 'failed', error=RuntimeError(
+                'Worker process for %s died' % job.description))
+            return
+
+        if job_id != job.job_id:
+            return
+
+        if kind == 'progress':
+            job.message = data
+        elif kind == 'done':
+            worker.job = None
+            self._finish(job, 'done', result=pickle.loads(data))
+        elif kind == 'error':
+            worker.job = None
+            self._finish(job, 'failed', error=pickle.loads(data))
+
+    def _finish(self, job, state, result=None, error=None):
+
+        job.state = state
+        job.result = result
+        job.error = error
+        try:
+            if state == 'done' and job.on_done is not None:
+                job.on_done(result)
+            elif state == 'failed':
+                if job.on_error is None:
+                    raise error
+                job.on_error(error)
+        except Exception as e:
+            if self.on_callback_error is None:
+                raise
+            self.on_callback_error(job, e)
+
+    def poll(self):
+        """Handle messages from the workers and call the completion
+        callbacks.  This returns the number of active jobs."""
+
+        for worker in list(self.workers):
+            while worker.job is not None and worker.conn.poll():
+                self._receive(worker)
+
+        self._dispatch()
+        return len(self.pending) + sum([worker.job is not None
+                                        for worker in self.workers])
+
+    def cancel(self, job):
+
+        if not job.active:
+            return
+
+        if job in self.pending:
+            self.pending.remove(job)
+        else:
+            for worker in self.workers:
+                if worker.job is job:
+                    self._replace(worker)
+                    break
+        job.state = 'cancelled'
+        self._dispatch()
+
+    def shutdown(self):
+
+        for job in self.pending:
+            job.state = 'cancelled'
+        self.pending = []
+        for worker in self.workers:
+            if worker.job is not None:
+                worker.job.state = 'cancelled'
+            worker.stop(terminate=worker.job is not None)
+        self.workers = []
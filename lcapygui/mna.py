@@ -0,0 +1,330 @@
+from numpy import (zeros, ones, array, asarray, pi, allclose, empty,
+                   complex128, isnan, nan)
+from numpy.linalg import eig, solve, LinAlgError
+
+
+class NumericMNA:
+    """Numeric modified nodal analysis of a linear circuit with numeric
+    component values.  The circuit is described by the matrices G and
+    C where (G + s C) x = b, with x the node voltages followed by the
+    branch currents of the voltage sources, inductors, and CCVSs.
+
+    Responses are evaluated for a vector of frequencies at once.
+    A generalised eigendecomposition is computed once so that each
+    frequency costs O(n) rather than a matrix solve; if this is
+    inaccurate, say for a defective matrix, each frequency is solved
+    directly.
+
+    A ValueError is raised for components or values that cannot be
+    handled numerically; use the symbolic analysis for these."""
+
+    def __init__(self, cct, defs=None, remove_sources=False, probes=()):
+        """If `remove_sources` is True, the independent sources are
+        removed: the current sources are replaced by open circuits and
+        the voltage sources are kept as short circuits by leaving
+        their values out of b.  `probes` is a sequence of (name,
+        node1, node2) for extra voltage sources, say to apply an
+        excitation or to measure a short circuit current."""
+
+        self.defs = {} if defs is None else defs
+        self.elements = [cpt for cpt in cct.elements.values()
+                         if cpt.type not in ('O', 'P') and not
+                         (remove_sources and cpt.type == 'I')]
+
+        self._merge_nodes(cct)
+
+        self.branches = {}
+        for cpt in self.elements:
+            if cpt.type in ('V', 'L', 'E', 'H'):
+                self.branches[cpt.name] = len(self.branches)
+        for name, node1, node2 in probes:
+            self.branches[name] = len(self.branches)
+
+        self.num_nodes = len(set(self.node_indices.values()) - {None})
+        self.size = self.num_nodes + len(self.branches)
+        self.G = zeros((self.size, self.size))
+        self.C = zeros((self.size, self.size))
+
+        for cpt in self.elements:
+            self._stamp(cpt)
+        for name, node1, node2 in probes:
+            self._stamp_branch(self.branch_index(name),
+                               self.node_indices[node1],
+                               self.node_indices[node2])
+
+    def _merge_nodes(self, cct):
+
+        # Nodes joined by wires are the same electrical node.
+        parent = {}
+
+        def find(name):
+            while parent.setdefault(name, name) != name:
+                name = parent[name]
+            return name
+
+        for name in cct.nodes:
+            find(name)
+        for cpt in self.elements:
+            if cpt.type == 'W':
+                root1, root2 = find(cpt.node_names[0]), find(cpt.node_names[1])
+                if root1 != root2:
+                    parent[root2] = root1
+
+        ground = find('0') if '0' in parent else find(list(parent)[0])
+
+        self.node_indices = {}
+        indices = {}
+        for name in parent:
+            root = find(name)
+            if root == ground:
+                self.node_indices[name] = None
+                continue
+            if root not in indices:
+                indices[root] = len(indices)
+            self.node_indices[name] = indices[root]
+
+    def value(self, arg):
+        """Return numeric value of a component argument."""
+
+        from lcapy import expr
+
+        try:
+            return float(arg)
+        except ValueError:
+            pass
+
+        try:
+            return float(complex(expr(arg).subs(self.defs).sympy).real)
+        except (TypeError, ValueError, AttributeError):
+            raise ValueError('Cannot evaluate %s numerically' % arg)
+
+    def node_index(self, node_name):
+
+        return self.node_indices[node_name]
+
+    def branch_index(self, name):
+
+        return self.num_nodes + self.branches[name]
+
+    def control_index(self, cpt):
+        """Return index of the branch current controlling the CCCS or
+        CCVS `cpt`."""
+
+        name = cpt.args[0]
+        if name not in self.branches:
+            raise ValueError('Unknown controlling source %s for %s' %
+                             (name, cpt.name))
+        return self.branch_index(name)
+
+    def _add(self, M, row, col, value):
+
+        if row is not None and col is not None:
+            M[row, col] += value
+
+    def _stamp_conductance(self, M, n1, n2, value):
+
+        self._add(M, n1, n1, value)
+        self._add(M, n2, n2, value)
+        self._add(M, n1, n2, -value)
+        self._add(M, n2, n1, -value)
+
+    def _stamp_branch(self, k, n1, n2):
+
+        # Branch current k flows from n1 through the element to n2.
+        self._add(self.G, n1, k, 1)
+        self._add(self.G, n2, k, -1)
+        self._add(self.G, k, n1, 1)
+        self._add(self.G, k, n2, -1)
+
+    def _stamp(self, cpt):
+
+        nodes = [self.node_indices[name] for name in cpt.node_names]
+        keyword = cpt.keyword[1] if cpt.keyword else ''
+
+        if cpt.type == 'W':
+            return
+        elif cpt.type == 'R':
+            R = self.value(cpt.args[0])
+            if R == 0:
+                raise ValueError('Cannot handle zero resistance for %s '
+                                 'numerically' % cpt.name)
+            self._stamp_conductance(self.G, nodes[0], nodes[1], 1 / R)
+        elif cpt.type == 'C':
+            self._stamp_conductance(self.C, nodes[0], nodes[1],
+                                    self.value(cpt.args[0]))
+        elif cpt.type == 'L':
+            k = self.branch_index(cpt.name)
+            self._stamp_branch(k, nodes[0], nodes[1])
+            self.C[k, k] -= self.value(cpt.args[0])
+        elif cpt.type == 'V':
+            # The source value is specified by b.
+            self._stamp_branch(self.branch_index(cpt.name),
+                               nodes[0], nodes[1])
+        elif cpt.type == 'I':
+            # The source value is specified by b.
+            pass
+        elif cpt.type == 'E' and keyword == '':
+            k = self.branch_index(cpt.name)
+            gain = self.value(cpt.args[0])
+            self._stamp_branch(k, nodes[0], nodes[1])
+            self._add(self.G, k, nodes[2], -gain)
+            self._add(self.G, k, nodes[3], gain)
+        elif cpt.type == 'G':
+            # The current flows into the positive node.
+            gain = self.value(cpt.args[0])
+            self._add(self.G, nodes[0], nodes[2], -gain)
+            self._add(self.G, nodes[0], nodes[3], gain)
+            self._add(self.G, nodes[1], nodes[2], gain)
+            self._add(self.G, nodes[1], nodes[3], -gain)
+        elif cpt.type == 'F':
+            control = self.control_index(cpt)
+            gain = self.value(cpt.args[1])
+            self._add(self.G, nodes[0], control, gain)
+            self._add(self.G, nodes[1], control, -gain)
+        elif cpt.type == 'H':
+            k = self.branch_index(cpt.name)
+            control = self.control_index(cpt)
+            gain = self.value(cpt.args[1])
+            self._stamp_branch(k, nodes[0], nodes[1])
+            self.G[k, control] -= gain
+        else:
+            raise ValueError('Cannot handle %s numerically' % cpt.name)
+
+    def response(self, s, b, c):
+        """Return c^T (G + s C)^-1 b for each element of the vector s.
+        b and c are vectors of size `self.size`."""
+
+        s = asarray(s, dtype=complex128)
+        try:
+            result = self._response_eig(s, b, c)
+            # Check at a few frequencies.
+            check = s[::max(1, len(s) // 4)]
+            expected = self._response_direct(check, b, c)
+            if allclose(result[::max(1, len(s) // 4)], expected, rtol=1e-6,
+                        atol=1e-9 * abs(expected).max()):
+                return result
+        except LinAlgError:
+            pass
+
+        result = self._response_direct(s, b, c)
+        if isnan(result).all():
+            raise ValueError('Circuit is singular, say with a floating node')
+        return result
+
+    def _response_eig(self, s, b, c):
+
+        # Shift away from s = 0 in case G is singular, say for a
+        # node that is only connected by capacitors.
+        s0 = 1.0 + 0.5j
+        M0 = self.G + s0 * self.C
+        A = solve(M0, self.C)
+        b0 = solve(M0, b)
+        # (G + s C) = M0 (I + (s - s0) A) with A = V diag(lam) V^-1
+        lam, V = eig(A)
+        beta = solve(V, b0)
+        gamma = c @ V
+        return (1 / (1 + (s[:, None] - s0) * lam[None, :])) @ (gamma * beta)
+
+    def _response_direct(self, s, b, c, chunk=64):
+
+        result = empty(len(s), dtype=complex128)
+        for start in range(0, len(s), chunk):
+            sc = s[start:start + chunk]
+            M = self.G[None, :, :] + sc[:, None, None] * self.C[None, :, :]
+            rhs = ones((len(sc), 1, 1)) * b[None, :, None]
+            try:
+                x = solve(M, rhs)[:, :, 0]
+                result[start:start + chunk] = x @ c
+            except LinAlgError:
+                # The circuit is singular at some frequencies, say at
+                # DC for a node only connected by capacitors.
+                for m, Mm in enumerate(M):
+                    try:
+                        result[start + m] = solve(Mm, b) @ c
+                    except LinAlgError:
+                        result[start + m] = nan
+        return result
+
+
+def numeric_transfer_function(cct, input_cpt, output_cpt, kind, f,
+                              defs=None):
+    """Return the frequency response of a transfer function (see
+    analysis.transfer_function) at the frequencies f (Hz).
+
+    The input is a unit voltage source (for a voltage ratio or
+    transadmittance) or a unit current source (for a current ratio or
+    transimpedance) across the nodes of `input_cpt`; the output is the
+    open circuit voltage or short circuit current across the nodes of
+    `output_cpt`.  As for the symbolic analysis, the independent
+    sources are removed."""
+
+    if kind not in ('Voltage ratio', 'Current ratio', 'Transimpedance',
+                    'Transadmittance'):
+        raise ValueError('Unknown kind')
+
+    voltage_input = kind in ('Voltage ratio', 'Transadmittance')
+    current_output = kind in ('Current ratio', 'Transadmittance')
+
+    inp, inm = cct[input_cpt].node_names[0:2]
+    outp, outm = cct[output_cpt].node_names[0:2]
+
+    probes = []
+    if voltage_input:
+        probes.append(('V_in_', inp, inm))
+    if current_output:
+        probes.append(('V_out_', outp, outm))
+
+    mna = NumericMNA(cct, defs, remove_sources=True, probes=probes)
+
+    b = zeros(mna.size)
+    if voltage_input:
+        b[mna.branch_index('V_in_')] = 1
+    else:
+        # Unit current into the positive input node.
+        for name, sign in ((inp, 1), (inm, -1)):
+            index = mna.node_index(name)
+            if index is not None:
+                b[index] = sign
+
+    c = zeros(mna.size)
+    if current_output:
+        # The probe current flows from the positive output node through
+        # the short circuit; Lcapy measures the current into it.
+        c[mna.branch_index('V_out_')] = -1
+    else:
+        for name, sign in ((outp, 1), (outm, -1)):
+            index = mna.node_index(name)
+            if index is not None:
+                c[index] = sign
+
+    s = 2j * pi * array(f, dtype=float)
+    return mna.response(s, b, c)
+
+
+class NumericTransferFunction:
+    """Transfer function of a circuit that can be evaluated
+    numerically; the netlist is only parsed when first needed."""
+
+    def __init__(self, netlist, input_cpt, output_cpt, kind):
+
+        self.netlist = netlist
+        self.input_cpt = input_cpt
+        self.output_cpt = output_cpt
+        self.kind = kind
+        self._cct = None
+
+    @property
+    def cct(self):
+
+        if self._cct is None:
+            from lcapy import Circuit
+
+            self._cct = Circuit(self.netlist)
+        return self._cct
+
+    def frequency_response(self, f, defs=None):
+        """Return the complex response at the frequencies f (Hz)."""
+
+        return numeric_transfer_function(self.cct, self.input_cpt,
+                                         self.output_cpt, self.kind,
+                                         f, defs)
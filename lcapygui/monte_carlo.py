@@ -0,0 +1,220 @@
+"""Monte Carlo tolerance analysis.  The component values with a
+tolerance are made symbolic so that the circuit is solved
+symbolically only once.  The result is compiled to a vectorised
+function (see sweep.py) that is evaluated for every random sample,
+optionally across the worker processes of a JobScheduler."""
+
+import numpy as np
+from .sweep import Sweep
+
+
+distributions = ('Uniform', 'Normal', 'Fixed')
+
+
+class Tolerance:
+    """Distribution of a value.  For a uniform distribution the value is
+    within `tolerance` (a fraction) of `nominal`.  For a normal
+    distribution, `tolerance` is three standard deviations."""
+
+    def __init__(self, nominal, tolerance=0.0, distribution='Uniform'):
+
+        if distribution not in distributions:
+            raise ValueError('Unknown distribution %s' % distribution)
+        if tolerance < 0:
+            raise ValueError('Negative tolerance %g' % tolerance)
+
+        self.nominal = nominal
+        self.tolerance = tolerance
+        self.distribution = distribution
+
+    @classmethod
+    def parse(cls, text):
+        """Parse, say, `1e3 5%` or `1e3 5% normal`; without a tolerance
+        the value is fixed."""
+
+        parts = text.replace(',', ' ').split()
+        if parts == []:
+            raise ValueError('No nominal value')
+
+        nominal = float(parts[0])
+        if len(parts) == 1:
+            return cls(nominal, 0.0, 'Fixed')
+
+        tolerance = parts[1]
+        if tolerance.endswith('%'):
+            tolerance = float(tolerance[:-1]) / 100
+        else:
+            tolerance = float(tolerance)
+
+        distribution = 'Uniform'
+        if len(parts) > 2:
+            distribution = parts[2].capitalize()
+        return cls(nominal, tolerance, distribution)
+
+    def sample(self, rng, num_samples):
+
+        if self.distribution == 'Uniform':
+            deviation = rng.uniform(-1, 1, num_samples)
+        elif self.distribution == 'Normal':
+            deviation = rng.normal(0, 1 / 3, num_samples)
+        else:
+            deviation = np.zeros(num_samples)
+        return self.nominal * (1 + self.tolerance * deviation)
+
+    def __str__(self):
+
+        if self.distribution == 'Fixed':
+            return '%g' % self.nominal
+        return '%g %g%% %s' % (self.nominal, self.tolerance * 100,
+                               self.distribution.lower())
+
+
+def toleranced_netlist(cct, names):
+    """Return netlist of `cct` where the values of the components
+    `names` are replaced by symbols with the component names so that
+    they can be varied after a single symbolic analysis."""
+
+    lines = []
+    for cpt in cct.elements.values():
+        if cpt.name in names:
+            # Keep the other arguments, such as initial conditions.
+            lines.append(cpt._netmake(args=(cpt.name, ) +
+                                      tuple(cpt.args[1:])))
+        else:
+            lines.append(str(cpt))
+    return '\n'.join(lines)
+
+
+def nominal_values(cct):
+    """Return dictionary of the numeric values of the resistors,
+    capacitors, and inductors keyed by component name."""
+
+    values = {}
+    for cpt in cct.elements.values():
+        if cpt.type not in ('R', 'C', 'L') or cpt.args == ():
+            continue
+        try:
+            values[cpt.name] = float(cpt.args[0])
+        except (TypeError, ValueError):
+            pass
+    return values
+
+
+def sample(tolerances, num_samples, seed=None):
+    """Return array of random samples with a row for each sample and a
+    column for each entry of the dictionary `tolerances`.  The samples
+    are drawn here, rather than in the workers, so that they only
+    depend on `seed`."""
+
+    rng = np.random.default_rng(seed)
+    samples = np.zeros((num_samples, len(tolerances)))
+    for m, tolerance in enumerate(tolerances.values()):
+        samples[:, m] = tolerance.sample(rng, num_samples)
+    return samples
+
+
+class MonteCarlo(Sweep):
+    """Monte Carlo analysis of expression `expr` for `num_samples`
+    random samples of the symbols given by the dictionary of
+    `tolerances`.  The results are kept in memory unless `pathname` is
+    specified."""
+
+    def __init__(self, expr, tolerances, num_samples, points, seed=None,
+                 pathname=None, chunk_size=4096):
+
+        self.tolerances = tolerances
+        self.seed = seed
+
+        super(MonteCarlo, self).__init__(
+            expr, list(tolerances), sample(tolerances, num_samples, seed),
+            points, pathname, chunk_size)
+
+    def values(self, part=None):
+        """Return the results as real values.  `part` is 'dB', 'phase'
+        (radians), 'real', or 'imag'; the default is 'dB' for complex
+        results and 'real' otherwise."""
+
+        if self.writer.pathname is not None:
+            # Read back the results from the file.
+            if self.writer.is_numpy:
+                results = np.load(self.writer.pathname)
+            else:
+                results = np.loadtxt(self.writer.pathname, delimiter=',',
+                                     skiprows=1, dtype=complex, ndmin=2)
+            results = results[:, len(self.symbols):]
+        else:
+            results = self.results
+
+        if part is None:
+            part = 'dB' if self.is_complex else 'real'
+        with np.errstate(divide='ignore'):
+            if part == 'dB':
+                return 20 * np.log10(abs(results))
+            elif part == 'phase':
+                return np.angle(results)
+            elif part == 'real':
+                return results.real
+            elif part == 'imag':
+                return results.imag
+        raise ValueError('Unknown part %s' % part)
+
+    def percentiles(self, q=(1, 50, 99), part=None):
+        """Return array of percentiles with a row for each of `q` and a
+        column for each point."""
+
+        return np.percentile(self.values(part), q, axis=0)
+
+    def histogram(self, point, bins=50, part=None):
+        """Return histogram (counts, edges) at the point nearest
+        `point`."""
+
+        index = abs(self.points - point).argmin()
+        return np.histogram(self.values(part)[:, index], bins=bins)
+
+    def ylabel(self, part=None):
+
+        if part is None:
+            part = 'dB' if self.is_complex else 'real'
+        return {'dB': 'Magnitude (dB)', 'phase': 'Phase (radians)',
+                'real': 'Real', 'imag': 'Imaginary'}[part]
+
+    def xlabel(self):
+
+        return 'Frequency (Hz)' if self.is_complex else 'Time (s)'
+
+    def plot_envelope(self, q=(1, 50, 99), part=None, axes=None):
+        """Plot the percentile envelopes; the first and last percentiles
+        are shaded."""
+
+        from matplotlib.pyplot import subplots
+
+        if axes is None:
+            fig, axes = subplots()
+
+        envelope = self.percentiles(q, part)
+        axes.fill_between(self.points, envelope[0], envelope[-1],
+                          alpha=0.3, label='%g%%-%g%%' % (q[0], q[-1]))
+        for m in range(1, len(q) - 1):
+            axes.plot(self.points, envelope[m], label='%g%%' % q[m])
+        if self.is_complex:
+            axes.set_xscale('log')
+        axes.set_xlabel(self.xlabel())
+        axes.set_ylabel(self.ylabel(part))
+        axes.set_title('%d samples' % len(self.combos))
+        axes.legend()
+        axes.grid(True)
+        return axes
+
+    def plot_histogram(self, point, bins=50, part=None, axes=None):
+
+        from matplotlib.pyplot import subplots
+
+        if axes is None:
+            fig, axes = subplots()
+
+        index = abs(self.points - point).argmin()
+        axes.hist(self.values(part)[:, index], bins=bins)
+        axes.set_xlabel(self.ylabel(part))
+        axes.set_ylabel('Count')
+        axes.set_title('%s = %g' % (self.xlabel(), self.points[index]))
+        return axes
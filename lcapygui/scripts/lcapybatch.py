@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""lcapy-batch V0.0.1
+Copyright (c) 2023 Michael P. Hayes, UC ECE, NZ
+
+Usage: lcapy-batch [--analysis analysis] [--format format] infile.sch ...
+"""
+
+from argparse import ArgumentParser
+from os import makedirs
+import sys
+
+
+def main(argv=None):
+
+    from lcapygui.batch import analyses, formats, process_files
+
+    if argv is None:
+        argv = sys.argv
+
+    parser = ArgumentParser(
+        description='Analyse lcapy schematics without a GUI.',
+        epilog='Analyses: ' + '; '.join(analyses.values()))
+    parser.add_argument('--version', action='version',
+                        version=__doc__.split('\n')[0])
+    parser.add_argument('--analysis', '-a', type=str, action='append',
+                        dest='analyses', default=None,
+                        help='analysis to perform (can be repeated)')
+    parser.add_argument('--format', '-f', type=str, action='append',
+                        dest='formats', default=None, choices=formats,
+                        help='output format (can be repeated), default json')
+    parser.add_argument('--outdir', '-o', type=str, default='.',
+                        help='directory for the output files')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='number of worker processes, default the'
+                        ' number of cores')
+    parser.add_argument('filenames', type=str, nargs='+',
+                        help='schematic filename(s)')
+
+    args = parser.parse_args(argv[1:])
+
+    specs = args.analyses or ['voltage']
+    makedirs(args.outdir, exist_ok=True)
+
+    failures = 0
+    for summary in process_files(args.filenames, specs, args.outdir,
+                                 args.formats or ['json'], args.jobs):
+        for kind, message in summary['messages']:
+            print('%s: %s: %s' % (summary['filename'], kind, message),
+                  file=sys.stderr)
+        if summary['failed']:
+            failures += 1
+            print('%s: failed' % summary['filename'])
+        else:
+            print('%s: %s' % (summary['filename'],
+                              ', '.join(summary['outputs'])))
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
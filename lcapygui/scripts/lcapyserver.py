@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""lcapy-server V0.0.1
+Copyright (c) 2023 Michael P. Hayes, UC ECE, NZ
+
+Usage: lcapy-server [--host host] [--port port] [--jobs jobs]
+"""
+
+from argparse import ArgumentParser
+import sys
+
+
+def main(argv=None):
+
+    from lcapygui.server import serve
+
+    if argv is None:
+        argv = sys.argv
+
+    parser = ArgumentParser(
+        description='Serve lcapy schematic rendering and analysis over'
+        ' HTTP.',
+        epilog='POST a netlist to /render?format=png|svg&engine='
+        'sketch|circuitikz or to /analyse?analysis=voltage')
+    parser.add_argument('--version', action='version',
+                        version=__doc__.split('\n')[0])
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='address to listen on, default 127.0.0.1')
+    parser.add_argument('--port', '-p', type=int, default=8086,
+                        help='port to listen on, default 8086')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='number of worker processes, default one less'
+                        ' than the number of cores')
+    parser.add_argument('--queue', '-q', type=int, default=64,
+                        help='maximum number of queued requests, default 64')
+    parser.add_argument('--batch', '-b', type=int, default=8,
+                        help='maximum number of requests sent to a worker'
+                        ' together, default 8')
+    parser.add_argument('--timeout', '-t', type=float, default=60,
+                        help='request timeout in seconds, default 60')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        default=False, help='log requests')
+
+    args = parser.parse_args(argv[1:])
+
+    serve(args.host, args.port, args.jobs, args.queue, args.batch,
+          args.timeout, args.verbose)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,8 +7,6 @@ Usage: lcapy-tk [infile.sch]
 
 from argparse import ArgumentParser
 import sys
-from lcapygui import LcapyTk
-from lcapy import expr as lcapify
 
 
 def schtex_exception(type, value, tb):
@@ -52,9 +50,13 @@ def main(argv=None):
     if args.pdb:
         sys.excepthook = schtex_exception
 
+    from lcapygui import LcapyTk
+
     e = LcapyTk(args.filenames, debug=args.debug)
 
     if args.expr is not None:
+        from lcapy import expr as lcapify
+
         dialog = e.show_expr_dialog(lcapify(args.expr))
         dialog.topmost()
 
@@ -10,7 +10,7 @@ import sys
 from lcapygui.components.sketch import Sketch
 from lcapygui.components.tf import TF
 from lcapygui.components.cpt_maker import cpt_make_from_sketch_key
-from lcapygui.ui.tk.sketcher import Sketcher
+from lcapygui.ui.sketcher import Sketcher
 from matplotlib.pyplot import subplots, show
 
 
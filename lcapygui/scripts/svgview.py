@@ -9,7 +9,7 @@ from argparse import ArgumentParser
 import sys
 from lcapygui.components.sketch import Sketch
 from lcapygui.components.tf import TF
-from lcapygui.ui.tk.sketcher import Sketcher
+from lcapygui.ui.sketcher import Sketcher
 from matplotlib.pyplot import subplots, show
 from matplotlib.path import Path
 
@@ -0,0 +1,377 @@
+"""Local HTTP service that renders netlists as PNG or SVG images and
+runs analyses, say for embedding schematics in documentation.
+
+The work is done by a pool of worker processes that are warmed up by
+importing lcapy and sympy and loading the sketch library, so a request
+does not pay for these.  Requests wait in a bounded queue; when the
+queue is full the service responds with 503.  Queued requests are
+sent to the workers in batches to reduce the per-request overhead.
+
+The endpoints are:
+
+GET /health
+POST /render?format=png|svg&engine=sketch|circuitikz
+POST /analyse?analysis=voltage&analysis=tf:1:2
+
+where the request body is the netlist.  See batch.py for the
+analyses."""
+
+from concurrent.futures import CancelledError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from queue import Queue, Empty, Full
+from threading import Event, Semaphore, Thread
+from time import monotonic
+from urllib.parse import urlparse, parse_qs
+import json
+
+
+content_types = {'png': 'image/png', 'svg': 'image/svg+xml',
+                 'json': 'application/json'}
+
+engines = ('sketch', 'circuitikz')
+
+
+def _init_worker():
+
+    from importlib import import_module
+    from .ui.headless import shared_sketchlib
+
+    # Pay for the imports and the sketch library when the worker
+    # starts rather than for the first request.
+    import_module('lcapy')
+    import_module('sympy')
+    shared_sketchlib()
+
+
+def _warm():
+
+    return True
+
+
+def render(netlist, format='png', engine='sketch'):
+    """Return the image of `netlist` as bytes."""
+
+    if format not in ('png', 'svg'):
+        raise ValueError('Unknown format %s' % format)
+
+    if engine == 'circuitikz':
+        from lcapy import Circuit
+        from os.path import join
+        from tempfile import TemporaryDirectory
+
+        # This requires LaTeX and a converter for the format.
+        with TemporaryDirectory() as dirname:
+            pathname = join(dirname, 'schematic.' + format)
+            Circuit(netlist).draw(pathname)
+            with open(pathname, 'rb') as f:
+                return f.read()
+
+    elif engine != 'sketch':
+        raise ValueError('Unknown engine %s' % engine)
+
+    from .ui.headless import OffscreenUI
+
+    ui = OffscreenUI()
+    model = ui.loads(netlist)
+    for kind, message in ui.messages:
+        if kind == 'error':
+            raise ValueError(message)
+
+    model.on_best_fit()
+    f = BytesIO()
+    ui.savefig(f, format=format)
+    return f.getvalue()
+
+
+def analyse(netlist, specs):
+    """Return dictionary of the results of the analyses `specs` of
+    `netlist` and any messages."""
+
+    from .batch import analyse, failed
+    from .ui.headless import NullUI
+
+    ui = NullUI()
+    model = ui.loads(netlist)
+    if failed(model, ui.messages):
+        return {'results': [], 'messages': ui.messages, 'failed': True}
+
+    results = analyse(model, specs, ui.messages)
+    return {'results': results, 'messages': ui.messages,
+            'failed': any(kind == 'error' for kind, _ in ui.messages)}
+
+
+functions = {'render': render, 'analyse': analyse}
+
+
+def run_batch(requests):
+    """Run the list of (name, args) `requests` and return a list of
+    ('done', result) or ('error', message)."""
+
+    replies = []
+    for name, args in requests:
+        try:
+            replies.append(('done', functions[name](*args)))
+        except Exception as e:
+            replies.append(('error', str(e)))
+    return replies
+
+
+class Request:
+
+    def __init__(self, name, args):
+
+        self.name = name
+        self.args = args
+        self.event = Event()
+        self.state = 'queued'
+        self.result = None
+
+    def finish(self, state, result):
+
+        self.state = state
+        self.result = result
+        self.event.set()
+
+    def wait(self, timeout=None):
+
+        return self.event.wait(timeout)
+
+
+class Service:
+    """Pool of warm worker processes fed from a queue of at most
+    `max_queue` requests.  Up to `batch_size` queued requests are sent
+    to a worker together; the dispatcher waits up to `batch_delay`
+    seconds for a batch to fill.  At most one batch per worker is
+    outstanding so that the queue is the only backlog."""
+
+    def __init__(self, num_workers=None, max_queue=64, batch_size=8,
+                 batch_delay=0.01):
+
+        from multiprocessing import cpu_count
+
+        if num_workers is None:
+            num_workers = max(1, cpu_count() - 1)
+
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue = Queue(max_queue)
+        self.slots = Semaphore(num_workers)
+        self.executor = None
+        # Futures for the batches sent to the workers
+        self.futures = set()
+        self.dispatcher = None
+        self.running = False
+        self.num_requests = 0
+        self.num_batches = 0
+        self.num_rejected = 0
+
+    def start(self):
+
+        from concurrent.futures import ProcessPoolExecutor, wait
+        from multiprocessing import get_context
+
+        # Spawn rather than fork for consistency with the GUI.
+        self.executor = ProcessPoolExecutor(
+            self.num_workers, mp_context=get_context('spawn'),
+            initializer=_init_worker)
+        wait([self.executor.submit(_warm)
+              for m in range(self.num_workers)])
+
+        self.running = True
+        self.dispatcher = Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def submit(self, name, *args):
+        """Queue a request; this raises queue.Full if the queue is
+        full."""
+
+        request = Request(name, args)
+        try:
+            self.queue.put_nowait(request)
+        except Full:
+            self.num_rejected += 1
+            raise
+        self.num_requests += 1
+        return request
+
+    def _next_batch(self):
+
+        try:
+            batch = [self.queue.get(timeout=0.1)]
+        except Empty:
+            return []
+
+        deadline = monotonic() + self.batch_delay
+        while len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self.queue.get(timeout=timeout))
+                else:
+                    batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _dispatch(self):
+
+        while self.running:
+            if not self.slots.acquire(timeout=0.1):
+                continue
+            batch = self._next_batch()
+            if batch == []:
+                self.slots.release()
+                continue
+
+            for request in batch:
+                request.state = 'running'
+            self.num_batches += 1
+            future = self.executor.submit(
+                run_batch, [(request.name, request.args)
+                            for request in batch])
+            self.futures.add(future)
+            future.add_done_callback(
+                lambda future, batch=batch: self._batch_done(batch, future))
+
+    def _batch_done(self, batch, future):
+
+        self.futures.discard(future)
+        self.slots.release()
+        try:
+            replies = future.result()
+        except CancelledError:
+            replies = [('error', 'Shutting down')] * len(batch)
+        except Exception as e:
+            # Say a worker process died.
+            replies = [('error', str(e))] * len(batch)
+
+        for request, (state, result) in zip(batch, replies):
+            request.finish(state, result)
+
+    def stats(self):
+
+        return {'workers': self.num_workers, 'queued': self.queue.qsize(),
+                'max_queue': self.queue.maxsize,
+                'requests': self.num_requests, 'batches': self.num_batches,
+                'rejected': self.num_rejected}
+
+    def shutdown(self):
+
+        self.running = False
+        if self.dispatcher is not None:
+            self.dispatcher.join()
+        while True:
+            try:
+                self.queue.get_nowait().finish('error', 'Shutting down')
+            except Empty:
+                break
+        if self.executor is not None:
+            # Cancel the batches that have not started; shutdown()
+            # only does this itself for Python 3.9 and later.
+            for future in list(self.futures):
+                future.cancel()
+            self.executor.shutdown()
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+
+    server_version = 'lcapy-server'
+
+    def reply(self, code, data, content_type='json'):
+
+        if content_type == 'json':
+            data = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_types[content_type])
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def error(self, code, message):
+
+        self.reply(code, {'error': message})
+
+    def do_GET(self):
+
+        if urlparse(self.path).path == '/health':
+            self.reply(200, self.server.service.stats())
+        else:
+            self.error(404, 'Unknown path %s' % self.path)
+
+    def do_POST(self):
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        length = int(self.headers.get('Content-Length', 0))
+        netlist = self.rfile.read(length).decode('utf-8')
+        if netlist.strip() == '':
+            self.error(400, 'Expecting netlist')
+            return
+
+        if url.path == '/render':
+            format = query.get('format', ['png'])[0]
+            engine = query.get('engine', ['sketch'])[0]
+            if format not in ('png', 'svg') or engine not in engines:
+                self.error(400, 'Unknown format or engine')
+                return
+            args = ('render', netlist, format, engine)
+        elif url.path == '/analyse':
+            args = ('analyse', netlist, query.get('analysis', ['voltage']))
+        else:
+            self.error(404, 'Unknown path %s' % url.path)
+            return
+
+        try:
+            request = self.server.service.submit(*args)
+        except Full:
+            self.error(503, 'Too many requests')
+            return
+
+        if not request.wait(self.server.request_timeout):
+            self.error(504, 'Timed out')
+            return
+
+        if request.state == 'error':
+            self.error(400, request.result)
+        elif url.path == '/render':
+            self.reply(200, request.result, format)
+        else:
+            self.reply(200, request.result)
+
+    def log_message(self, format, *args):
+
+        if self.server.verbose:
+            super(RequestHandler, self).log_message(format, *args)
+
+
+class Server(ThreadingHTTPServer):
+    """HTTP server for `service`; a request that takes longer than
+    `timeout` seconds gets a 504 response."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, timeout=60, verbose=False):
+
+        super(Server, self).__init__(address, RequestHandler)
+        self.service = service
+        self.request_timeout = timeout
+        self.verbose = verbose
+
+
+def serve(host='127.0.0.1', port=8086, num_workers=None, max_queue=64,
+          batch_size=8, timeout=60, verbose=False):
+
+    service = Service(num_workers, max_queue, batch_size)
+    service.start()
+    server = Server((host, port), service, timeout, verbose)
+    print('Serving on http://%s:%d' % (host, port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
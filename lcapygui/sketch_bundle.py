@@ -0,0 +1,190 @@
+from .components.sketch import Sketch, SketchPath
+from .sketch_cache import SketchCache
+from matplotlib.path import Path as MPath
+from numpy import array, concatenate, memmap, float64, uint8
+from hashlib import sha1
+import json
+import struct
+
+
+class SketchBundle:
+    """Memory-mapped bundle of the aligned sketches for all the styles.
+
+    The file has an 8 byte magic string, the format version and header
+    length as 32 bit little-endian integers, a JSON header, the
+    concatenated vertices (little-endian float64 pairs), and the
+    concatenated path codes (uint8).  The header has a table of the
+    distinct path styles and an index mapping style and sketch key to
+    the path offsets, path style indices, sketch size, and the hash
+    of the SVG file.  Sketches are sliced from the mapped arrays
+    without copying.
+
+    The bundle is created with `build_bundle()`; this needs rerunning
+    when the SVG files change.  The SVG hashes are recorded so that
+    the tests can check that the bundle is up to date."""
+
+    MAGIC = b'LCAPYSKB'
+    VERSION = 2
+    ALIGN = 16
+
+    def __init__(self, filename):
+
+        with open(filename, 'rb') as f:
+            magic = f.read(len(self.MAGIC))
+            if magic != self.MAGIC:
+                raise ValueError('%s is not a sketch bundle' % filename)
+            version, header_len = struct.unpack('<II', f.read(8))
+            if version != self.VERSION:
+                raise ValueError('Unsupported sketch bundle version %d'
+                                 % version)
+            header = json.loads(f.read(header_len).decode('utf-8'))
+
+        if header['align_version'] != SketchCache.VERSION:
+            raise ValueError('Sketch bundle %s is out of date' % filename)
+
+        self.filename = filename
+        self.styles = header['styles']
+        self.index = header['index']
+        self.vertices = memmap(filename, dtype='<f8', mode='r',
+                               offset=header['vertices_offset'],
+                               shape=(header['num_vertices'], 2))
+        self.codes = memmap(filename, dtype=uint8, mode='r',
+                            offset=header['codes_offset'],
+                            shape=(header['num_vertices'], ))
+
+    @classmethod
+    def default_filename(cls):
+
+        from lcapygui import __datadir__
+
+        return __datadir__ / 'sketches.bundle'
+
+    @classmethod
+    def default(cls):
+        """Return the bundle shipped with the package or None if it
+        is missing or unusable."""
+
+        filename = cls.default_filename()
+        if not filename.exists():
+            return None
+        try:
+            return cls(str(filename))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def keys(self, style='american'):
+
+        return list(self.index.get(style, {}))
+
+    def lookup(self, sketch_key, style='american'):
+        """Return sketch or None if not in the bundle."""
+
+        try:
+            entry = self.index[style][sketch_key]
+        except KeyError:
+            return None
+
+        paths = []
+        for start, stop, style_index, symbol in entry['paths']:
+            path = MPath(self.vertices[start:stop], self.codes[start:stop])
+            paths.append(SketchPath(path, self.styles[style_index], symbol))
+
+        return Sketch(paths, entry['width'], entry['height'])
+
+
+def svg_hash(svg_filename):
+
+    with open(svg_filename, 'rb') as f:
+        return sha1(f.read()).hexdigest()
+
+
+def build_bundle(filename=None, styles=('american', 'british', 'european')):
+    """Parse and align the SVG files for each style and pack them into
+    a sketch bundle."""
+
+    from lcapygui import __datadir__
+
+    if filename is None:
+        filename = SketchBundle.default_filename()
+
+    index = {}
+    path_styles = []
+    path_style_indices = {}
+    all_vertices = []
+    all_codes = []
+    num_vertices = 0
+
+    for style in styles:
+        index[style] = {}
+        svg_filenames = sorted((__datadir__ / 'svg' / style).glob('*.svg'))
+
+        for svg_filename in svg_filenames:
+            sketch_key = svg_filename.stem
+            try:
+                sketch = Sketch.load(sketch_key, style=style)
+            except Exception as e:
+                print('Skipping %s for %s: %s' % (sketch_key, style, e))
+                continue
+
+            paths = []
+            for spath in sketch.paths:
+                path = spath.path
+                codes = path.codes
+                if codes is None:
+                    codes = array([MPath.LINETO] * len(path.vertices),
+                                  dtype=uint8)
+                    codes[0] = MPath.MOVETO
+
+                key = json.dumps(spath.style, sort_keys=True)
+                if key not in path_style_indices:
+                    path_style_indices[key] = len(path_styles)
+                    path_styles.append(spath.style)
+
+                start = num_vertices
+                num_vertices += len(path.vertices)
+                all_vertices.append(array(path.vertices, dtype=float64))
+                all_codes.append(array(codes, dtype=uint8))
+                paths.append((start, num_vertices, path_style_indices[key],
+                              spath.symbol))
+
+            index[style][sketch_key] = {
+                'paths': paths, 'width': sketch.width,
+                'height': sketch.height,
+                'hash': svg_hash(svg_filename)}
+
+    vertices = concatenate(all_vertices).astype('<f8').tobytes()
+    codes = concatenate(all_codes).tobytes()
+
+    def align(offset):
+        return -(-offset // SketchBundle.ALIGN) * SketchBundle.ALIGN
+
+    # The header contains the array offsets so iterate until its
+    # length is stable.
+    header = {'align_version': SketchCache.VERSION,
+              'num_vertices': num_vertices,
+              'vertices_offset': 0,
+              'codes_offset': 0,
+              'styles': path_styles,
+              'index': index}
+    while True:
+        header_bytes = json.dumps(header,
+                                  separators=(',', ':')).encode('utf-8')
+        start = len(SketchBundle.MAGIC) + 8 + len(header_bytes)
+        vertices_offset = align(start)
+        codes_offset = align(vertices_offset + len(vertices))
+        if (header['vertices_offset'] == vertices_offset and
+                header['codes_offset'] == codes_offset):
+            break
+        header['vertices_offset'] = vertices_offset
+        header['codes_offset'] = codes_offset
+
+    with open(filename, 'wb') as f:
+        f.write(SketchBundle.MAGIC)
+        f.write(struct.pack('<II', SketchBundle.VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * (vertices_offset - start))
+        f.write(vertices)
+        f.write(b'\0' * (codes_offset - vertices_offset - len(vertices)))
+        f.write(codes)
+
+    return filename
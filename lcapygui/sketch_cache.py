@@ -0,0 +1,111 @@
+from .components.sketch import Sketch, SketchPath
+from hashlib import sha1
+from pathlib import Path
+from matplotlib.path import Path as MPath
+from numpy import array, concatenate, load, savez, cumsum, zeros
+import json
+import os
+
+
+class SketchCache:
+    """On-disk cache of aligned sketches, one .npz file per style and
+    sketch key.  This avoids parsing the SVG files each session.  An
+    entry is used if the SVG file has the same modification time or,
+    failing that, the same hash as when the entry was created."""
+
+    # Increment this if the parsing or alignment of sketches changes.
+    VERSION = 1
+
+    def __init__(self, dirname=None):
+
+        if dirname is None:
+            dirname = Path('~/.lcapy/sketches').expanduser()
+        self.dirname = Path(dirname) / ('v%d' % self.VERSION)
+
+    def _filename(self, sketch_key, style):
+
+        return self.dirname / style / (sketch_key + '.npz')
+
+    def _hash(self, svg_filename):
+
+        return sha1(Path(svg_filename).read_bytes()).hexdigest()
+
+    def load(self, sketch_key, style, svg_filename):
+        """Return cached sketch or None if not cached or out of date."""
+
+        filename = self._filename(sketch_key, style)
+        if not filename.exists():
+            return None
+
+        try:
+            with load(filename, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+
+                if meta['version'] != self.VERSION:
+                    return None
+
+                mtime = os.stat(svg_filename).st_mtime
+                if mtime != meta['mtime'] and \
+                   self._hash(svg_filename) != meta['hash']:
+                    return None
+
+                vertices = data['vertices']
+                codes = data['codes']
+                offsets = data['offsets']
+        except (OSError, ValueError, KeyError):
+            # Corrupt or unreadable entry
+            return None
+
+        paths = []
+        for m, (style_dict, symbol) in enumerate(zip(meta['styles'],
+                                                     meta['symbols'])):
+            start, stop = offsets[m], offsets[m + 1]
+            path = MPath(vertices[start:stop], codes[start:stop])
+            paths.append(SketchPath(path, style_dict, symbol))
+
+        return Sketch(paths, meta['width'], meta['height'])
+
+    def save(self, sketch_key, style, svg_filename, sketch):
+        """Save sketch to the cache; failures are ignored since the
+        cache is only an optimisation."""
+
+        filename = self._filename(sketch_key, style)
+
+        vertices = [spath.path.vertices for spath in sketch.paths]
+        codes = []
+        for spath in sketch.paths:
+            path = spath.path
+            if path.codes is None:
+                # Implicit MOVETO followed by LINETOs
+                pcodes = array([MPath.LINETO] * len(path.vertices),
+                               dtype=MPath.code_type)
+                pcodes[0] = MPath.MOVETO
+            else:
+                pcodes = path.codes
+            codes.append(pcodes)
+
+        offsets = concatenate(([0], cumsum([len(v) for v in vertices])))
+        if vertices == []:
+            vertices = [zeros((0, 2))]
+            codes = [zeros(0, dtype=MPath.code_type)]
+
+        meta = {'version': self.VERSION,
+                'mtime': os.stat(svg_filename).st_mtime,
+                'hash': self._hash(svg_filename),
+                'width': sketch.width,
+                'height': sketch.height,
+                'styles': [spath.style for spath in sketch.paths],
+                'symbols': [spath.symbol for spath in sketch.paths]}
+
+        try:
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename so that another
+            # process never sees a partially written entry.
+            tmp_filename = filename.with_suffix('.%d.tmp' % os.getpid())
+            with open(tmp_filename, 'wb') as f:
+                savez(f, meta=json.dumps(meta),
+                      vertices=concatenate(vertices),
+                      codes=concatenate(codes), offsets=offsets)
+            os.replace(tmp_filename, filename)
+        except OSError:
+            pass
@@ -1,11 +1,15 @@
 from .components.sketch import Sketch
+from .sketch_cache import SketchCache
+from .sketch_bundle import SketchBundle
 
 
 class SketchLibrary:
 
-    def __init__(self):
+    def __init__(self, cache=True, bundle=True):
 
         self.sketches = {}
+        self.cache = SketchCache() if cache else None
+        self.bundle = SketchBundle.default() if bundle else None
 
     def _check_style(self, style):
 
@@ -14,6 +18,27 @@ class SketchLibrary:
             raise ValueError('Unsupported style %s, must be either %s'
                              % (style,  ', '.join(styles)))
 
+    def _load(self, sketch_key, style):
+
+        if self.bundle is not None:
+            sketch = self.bundle.lookup(sketch_key, style)
+            if sketch is not None:
+                return sketch
+
+        if self.cache is None:
+            return Sketch.load(sketch_key, style=style, complain=True)
+
+        svg_filename = Sketch.svg_filename(sketch_key, style)
+        if not svg_filename.exists():
+            # Let Sketch complain.
+            return Sketch.load(sketch_key, style=style, complain=True)
+
+        sketch = self.cache.load(sketch_key, style, svg_filename)
+        if sketch is None:
+            sketch = Sketch.load(sketch_key, style=style, complain=True)
+            self.cache.save(sketch_key, style, svg_filename, sketch)
+        return sketch
+
     def lookup(self, sketch_key, style='american'):
 
         self._check_style(style)
@@ -23,7 +48,18 @@ class SketchLibrary:
 
         if sketch_key not in self.sketches[style]:
 
-            sketch = Sketch.load(sketch_key, style=style, complain=True)
+            sketch = self._load(sketch_key, style)
             self.sketches[style][sketch_key] = sketch
 
         return self.sketches[style][sketch_key]
+
+    def preload(self, style='american'):
+        """Load all the sketches in the bundle for the style."""
+
+        self._check_style(style)
+
+        if self.bundle is None:
+            return
+
+        for sketch_key in self.bundle.keys(style):
+            self.lookup(sketch_key, style)
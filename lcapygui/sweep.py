@@ -0,0 +1,303 @@
+"""Parameter sweeps.  An expression, say a node voltage or transfer
+function found by symbolic analysis, is compiled once and evaluated
+for every combination of the swept symbol values.  The combinations
+are split into chunks that can be evaluated by the worker processes
+of a JobScheduler and the results are streamed to a CSV or NumPy
+file."""
+
+from itertools import product
+from os.path import splitext
+import numpy as np
+from .evaluate import lambdify_sympy
+
+
+def parse_values(text):
+    """Parse a list of values, say `1, 2, 5`, or a range `start:stop:num`
+    or `start:stop:num:log` for logarithmic spacing."""
+
+    text = text.strip()
+    if text == '':
+        raise ValueError('No values')
+
+    if ':' not in text:
+        parts = text.replace(',', ' ').split()
+        return np.array([float(part) for part in parts])
+
+    parts = [part.strip() for part in text.split(':')]
+    if len(parts) == 3:
+        parts.append('lin')
+    if len(parts) != 4 or parts[3] not in ('lin', 'log'):
+        raise ValueError('Expecting start:stop:num or start:stop:num:log')
+
+    start, stop, num = float(parts[0]), float(parts[1]), int(parts[2])
+    if parts[3] == 'log':
+        return np.geomspace(start, stop, num)
+    return np.linspace(start, stop, num)
+
+
+def load_values(pathname):
+    """Load the values for each symbol from a file where each line has
+    a symbol name followed by one or more comma or space separated
+    values.  This returns a dictionary of the text for each symbol."""
+
+    values = {}
+    with open(pathname) as f:
+        for line in f.readlines():
+            if line.strip() == '':
+                continue
+            delim = ',' if ',' in line else None
+            parts = line.split(delim)
+            if len(parts) < 2:
+                raise ValueError(
+                    'Need comma or space separated definitions')
+            values[parts[0].strip()] = ', '.join(part.strip()
+                                                 for part in parts[1:])
+    return values
+
+
+def make_grid(values):
+    """Return array of all combinations of the values; each row is a
+    combination with a column for each symbol (in the order of the
+    dictionary `values`)."""
+
+    if values == {}:
+        return np.zeros((1, 0))
+    return np.array(list(product(*values.values())), dtype=float)
+
+
+# Compiled functions in this process, keyed by expression, variable,
+# and symbols, so that a worker compiles an expression once.
+_compiled = {}
+
+
+def evaluate_chunk(sexpr, varname, symbols, combos, arg):
+    """Return array with a row for each combination of symbol values in
+    `combos` and a column for each element of `arg`."""
+
+    key = (sexpr, varname, tuple(symbols))
+    if key not in _compiled:
+        _compiled[key] = lambdify_sympy(sexpr, varname, symbols)
+    func = _compiled[key]
+
+    values = [combos[:, m][:, None] for m in range(len(symbols))]
+    with np.errstate(all='ignore'):
+        result = func(np.asarray(arg)[None, :], *values)
+    return np.broadcast_to(np.asarray(result, dtype=complex),
+                           (len(combos), len(arg))).copy()
+
+
+class SweepWriter:
+    """Write sweep results to a CSV file or, if the filename ends in
+    .npy, a NumPy file.  Each row has the symbol values followed by the
+    results for each point."""
+
+    def __init__(self, pathname, symbols, points, num_rows,
+                 is_complex=False):
+
+        self.pathname = pathname
+        self.is_complex = is_complex
+        self.is_numpy = splitext(pathname)[1] == '.npy'
+        self.closed = False
+        dtype = complex if is_complex else float
+        num_cols = len(symbols) + len(points)
+
+        if self.is_numpy:
+            from numpy.lib.format import open_memmap
+
+            self.array = open_memmap(pathname, mode='w+', dtype=dtype,
+                                     shape=(num_rows, num_cols))
+            self.file = None
+        else:
+            self.file = open(pathname, 'w')
+            self.file.write(','.join(list(symbols) +
+                                     ['%g' % point for point in points]))
+            self.file.write('\n')
+
+    def format(self, value):
+
+        if self.is_complex:
+            return '%.12g%+.12gj' % (value.real, value.imag)
+        return '%.12g' % value
+
+    def write(self, start, combos, results):
+
+        if not self.is_complex:
+            results = results.real
+
+        if self.is_numpy:
+            self.array[start:start + len(combos), :combos.shape[1]] = combos
+            self.array[start:start + len(combos), combos.shape[1]:] = results
+            return
+
+        for combo, result in zip(combos, results):
+            self.file.write(','.join(['%.12g' % value for value in combo] +
+                                     [self.format(value)
+                                      for value in result]))
+            self.file.write('\n')
+        self.file.flush()
+
+    def close(self):
+
+        if self.closed:
+            return
+        self.closed = True
+        if self.is_numpy:
+            self.array.flush()
+            del self.array
+        else:
+            self.file.close()
+
+
+class ArrayWriter:
+    """Keep sweep results in memory; each row of `array` has the symbol
+    values followed by the results for each point."""
+
+    def __init__(self, symbols, points, num_rows, is_complex=False):
+
+        self.pathname = None
+        self.is_complex = is_complex
+        self.array = np.zeros((num_rows, len(symbols) + len(points)),
+                              dtype=complex if is_complex else float)
+
+    def write(self, start, combos, results):
+
+        if not self.is_complex:
+            results = results.real
+
+        self.array[start:start + len(combos), :combos.shape[1]] = combos
+        self.array[start:start + len(combos), combos.shape[1]:] = results
+
+    def close(self):
+
+        pass
+
+
+class Sweep:
+    """Sweep of expression `expr` over the values of `symbols`.  Each row
+    of the array `combos` has the values of the symbols for one
+    evaluation, see `make_grid()`.  `points` are the times for a time
+    domain expression or the frequencies (Hz) for a Laplace or Fourier
+    domain expression.  The results are written to the file
+    `pathname` or, if this is None, kept in memory."""
+
+    def __init__(self, expr, symbols, combos, points, pathname=None,
+                 chunk_size=256):
+
+        self.symbols = list(symbols)
+        self.points = np.asarray(points, dtype=float)
+        self.combos = np.asarray(combos, dtype=float)
+        self.chunk_size = chunk_size
+
+        if expr.is_time_domain or expr.is_fourier_domain:
+            self.arg = self.points
+        elif expr.is_angular_fourier_domain:
+            self.arg = 2 * np.pi * self.points
+        elif expr.is_laplace_domain:
+            self.arg = 2j * np.pi * self.points
+        else:
+            raise ValueError('Cannot sweep expression in this domain')
+
+        self.sexpr = expr.doit().sympy
+        self.varname = expr.var.name
+        # Check that the expression can be compiled.
+        lambdify_sympy(self.sexpr, self.varname, self.symbols)
+
+        self.is_complex = not expr.is_time_domain
+        if pathname is None:
+            self.writer = ArrayWriter(self.symbols, self.points,
+                                      len(self.combos), self.is_complex)
+        else:
+            self.writer = SweepWriter(pathname, self.symbols, self.points,
+                                      len(self.combos), self.is_complex)
+        self.num_chunks = (len(self.combos) + chunk_size - 1) // chunk_size
+        self.num_done = 0
+        # Results of chunks finished out of order.
+        self.pending = {}
+        self.jobs = []
+        self.error = None
+
+    @property
+    def results(self):
+        """Array of results with a row for each combination and a column
+        for each point; this requires the results to be kept in
+        memory."""
+
+        return self.writer.array[:, len(self.symbols):]
+
+    @property
+    def finished(self):
+
+        return self.num_done == self.num_chunks or self.error is not None
+
+    def chunk_args(self, index):
+
+        start = index * self.chunk_size
+        return (self.sexpr, self.varname, self.symbols,
+                self.combos[start:start + self.chunk_size], self.arg)
+
+    def run(self, scheduler=None, on_done=None, on_error=None):
+        """Evaluate the chunks using the worker processes of `scheduler`,
+        or in this process if `scheduler` is None.  `on_done` is called
+        when the results have been written."""
+
+        self.on_done = on_done
+        self.on_error = on_error
+
+        for index in range(self.num_chunks):
+            if scheduler is None:
+                try:
+                    result = evaluate_chunk(*self.chunk_args(index))
+                except Exception as e:
+                    self.failed(e)
+                    return
+                self.chunk_done(index, result)
+                continue
+
+            self.jobs.append(scheduler.submit(
+                evaluate_chunk, *self.chunk_args(index),
+                description='Sweep chunk %d' % (index + 1),
+                on_done=lambda result, index=index:
+                self.chunk_done(index, result),
+                on_error=self.failed))
+
+    def wait(self, scheduler, interval=0.05):
+        """Wait for the chunks submitted to `scheduler`; this is for use
+        without an event loop."""
+
+        from time import sleep
+
+        while not self.finished:
+            scheduler.poll()
+            sleep(interval)
+
+    def chunk_done(self, index, result):
+
+        # Write the chunks in order.
+        self.pending[index] = result
+        while self.num_done in self.pending:
+            start = self.num_done * self.chunk_size
+            result = self.pending.pop(self.num_done)
+            self.writer.write(start, self.combos[start:start + len(result)],
+                              result)
+            self.num_done += 1
+
+        if self.num_done == self.num_chunks:
+            self.writer.close()
+            if self.on_done is not None:
+                self.on_done(self)
+
+    def failed(self, error):
+
+        if self.error is not None:
+            return
+        self.error = error
+        self.cancel()
+        if self.on_error is None:
+            raise error
+        self.on_error(error)
+
+    def cancel(self):
+
+        for job in self.jobs:
+            job.cancel()
+        self.writer.close()
@@ -0,0 +1,44 @@
+from lcapygui import __datadir__
+from lcapygui.batch import output_names, process_files
+from os import makedirs
+from os.path import dirname, exists, join
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+import json
+import unittest
+
+
+class BatchTester(unittest.TestCase):
+
+    def test_output_names(self):
+        """Check output names are unique"""
+
+        self.assertEqual(output_names(['a/x.sch', 'b/y.sch']), ['x', 'y'])
+        self.assertEqual(output_names(['a/x.sch', 'b/x.sch']),
+                         [join('a', 'x'), join('b', 'x')])
+
+    def test_process_files(self):
+        """Check JSON summary matches the returned summary"""
+
+        sch = __datadir__ / 'lib' / 'DC' / 'DC-voltage-divider1.sch'
+
+        with TemporaryDirectory() as tmpdir:
+            pathnames = [join(tmpdir, 'a', 'x.sch'),
+                         join(tmpdir, 'b', 'x.sch')]
+            for pathname in pathnames:
+                makedirs(dirname(pathname))
+                copyfile(sch, pathname)
+
+            outdir = join(tmpdir, 'out')
+            summaries = list(process_files(pathnames, ['voltage', 'bogus'],
+                                           outdir, num_workers=1))
+
+            for summary, name in zip(summaries, ('a', 'b')):
+                json_filename = join(outdir, name, 'x.json')
+                self.assertTrue(exists(json_filename))
+                with open(json_filename) as f:
+                    saved = json.load(f)
+                self.assertTrue(summary['failed'])
+                self.assertEqual(saved['failed'], summary['failed'])
+                self.assertEqual(saved['outputs'], summary['outputs'])
+
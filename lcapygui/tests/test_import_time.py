@@ -0,0 +1,37 @@
+from subprocess import run
+import sys
+import unittest
+
+
+# Modules that are slow to import and so should only be imported when
+# needed.
+slow_modules = ('lcapy', 'sympy', 'matplotlib.pyplot', 'tkinter')
+
+script = """
+import sys
+import %s
+print(' '.join(name for name in %r if name in sys.modules))
+"""
+
+
+class ImportTimeTester(unittest.TestCase):
+
+    def imported(self, module):
+        """Return the slow modules imported with `module`."""
+
+        # A new interpreter is needed since the modules may already
+        # be imported by other tests.
+        result = run([sys.executable, '-c', script % (module, slow_modules)],
+                     capture_output=True, text=True, check=True)
+        return result.stdout.split()
+
+    def test_import(self):
+        """Check lcapygui is imported without Lcapy, SymPy, pyplot, or Tk"""
+
+        self.assertEqual(self.imported('lcapygui'), [])
+
+    def test_sketch_import(self):
+        """Check sketch module is imported without Lcapy, SymPy, pyplot,
+        or Tk"""
+
+        self.assertEqual(self.imported('lcapygui.components.sketch'), [])
@@ -0,0 +1,38 @@
+from lcapygui.jobs import JobScheduler
+from time import monotonic, sleep
+import unittest
+
+
+class JobsTester(unittest.TestCase):
+
+    def wait(self, jobs, timeout=60):
+
+        start = monotonic()
+        while jobs.poll():
+            self.assertLess(monotonic() - start, timeout)
+            sleep(0.05)
+
+    def test_callback_error(self):
+        """Check failing callbacks are passed to on_callback_error"""
+
+        jobs = JobScheduler(num_workers=1)
+        errors = []
+        results = []
+        jobs.on_callback_error = lambda job, e: errors.append(
+            (job.description, str(e)))
+
+        def on_done(result):
+            raise RuntimeError('Broken dialog')
+
+        try:
+            jobs.submit(abs, -1, description='first', on_done=on_done)
+            jobs.submit(abs, -2, description='second',
+                        on_done=results.append)
+            jobs.submit(abs, 'x', description='third')
+            self.wait(jobs)
+        finally:
+            jobs.shutdown()
+
+        self.assertEqual(results, [2])
+        self.assertEqual([error[0] for error in errors], ['first', 'third'])
+        self.assertEqual(errors[0][1], 'Broken dialog')
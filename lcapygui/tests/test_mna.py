@@ -0,0 +1,76 @@
+from lcapy import Circuit, j, pi
+from lcapygui.mna import NumericMNA, numeric_transfer_function
+import unittest
+
+
+class MNATester(unittest.TestCase):
+
+    def test_transfer_functions(self):
+        """Check numeric transfer functions against Lcapy"""
+
+        cct = Circuit("""
+        P0 1 0
+        R1 1 2 1e3
+        R2 2 0 2e3
+        C1 2 0 1e-6
+        R3 2 3 500
+        P1 3 0
+        """)
+
+        kinds = (('Voltage ratio', cct.voltage_gain),
+                 ('Current ratio', cct.current_gain),
+                 ('Transimpedance', cct.transimpedance),
+                 ('Transadmittance', cct.transadmittance))
+
+        f = (0.0, 10.0, 100.0, 1e4)
+        for kind, method in kinds:
+            H = method('P0', 'P1')
+            H1 = numeric_transfer_function(cct, 'P0', 'P1', kind, f)
+            for fm, H1m in zip(f, H1):
+                expected = complex(H(j * 2 * pi * fm).evaluate())
+                self.assertAlmostEqual(H1m / expected, 1, 9, kind)
+
+    def test_removed_sources(self):
+        """Check numeric transfer functions with sources removed"""
+
+        for cpt in ('F1 4 0 V2 2', 'H1 4 0 V2 2'):
+            cct = Circuit("""
+            P0 1 0
+            R1 1 2 1e3
+            V2 2 3 5
+            I1 3 0 2
+            C1 3 0 1e-6
+            R2 4 0 500
+            P1 4 0
+            """)
+            cct.add(cpt)
+
+            H = cct.voltage_gain('P0', 'P1')
+            H1 = numeric_transfer_function(cct, 'P0', 'P1', 'Voltage ratio',
+                                           (100.0, ))
+            expected = complex(H(j * 2 * pi * 100.0).evaluate())
+            self.assertAlmostEqual(H1[0] / expected, 1, 9, cpt)
+
+    def test_zero_resistance(self):
+        """Check zero resistance is not handled numerically"""
+
+        cct = Circuit("""
+        V1 1 0
+        R1 1 2 0
+        R2 2 0 1e3
+        """)
+
+        self.assertRaises(ValueError, NumericMNA, cct)
+
+    def test_unknown_control(self):
+        """Check controlling source must be in the circuit"""
+
+        for cpt in ('F1 2 0 V2 2', 'H1 2 0 V2 2', 'F1 2 0 R1 2'):
+            cct = Circuit("""
+            V1 1 0
+            R1 1 0 1e3
+            R2 2 0 1e3
+            """)
+            cct.add(cpt)
+
+            self.assertRaises(ValueError, NumericMNA, cct)
@@ -0,0 +1,34 @@
+from lcapy import Circuit
+from lcapygui.monte_carlo import Tolerance, toleranced_netlist
+import unittest
+
+
+class MonteCarloTester(unittest.TestCase):
+
+    def test_toleranced_netlist(self):
+        """Check toleranced netlist keeps initial conditions"""
+
+        cct = Circuit("""
+        V1 1 0 step 1
+        R1 1 2 1e3
+        C1 2 0_2 1e-6 5
+        L1 2 3 1e-3 2
+        """)
+
+        netlist = toleranced_netlist(cct, ('R1', 'C1', 'L1'))
+        cct2 = Circuit(netlist + '\n')
+        self.assertEqual(str(cct2.R1.args[0]), 'R1')
+        self.assertEqual(tuple(str(arg) for arg in cct2.C1.args), ('C1', '5'))
+        self.assertEqual(tuple(str(arg) for arg in cct2.L1.args), ('L1', '2'))
+        self.assertEqual(str(cct2.V1), str(cct.V1))
+
+    def test_tolerance_parse(self):
+        """Check tolerances are parsed"""
+
+        tolerance = Tolerance.parse('1e3 5% normal')
+        self.assertEqual(tolerance.nominal, 1e3)
+        self.assertEqual(tolerance.tolerance, 0.05)
+        self.assertEqual(tolerance.distribution, 'Normal')
+
+        for text in ('', 'x', '1e3 x', '1e3 -5%', '1e3 5% cauchy'):
+            self.assertRaises(ValueError, Tolerance.parse, text)
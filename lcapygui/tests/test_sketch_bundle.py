@@ -0,0 +1,31 @@
+from lcapygui import __datadir__
+from lcapygui.sketch_bundle import SketchBundle, svg_hash
+import unittest
+
+
+class SketchBundleTester(unittest.TestCase):
+
+    def test_coverage(self):
+        """Check bundle has every SVG sketch"""
+
+        bundle = SketchBundle.default()
+        self.assertIsNotNone(bundle)
+
+        for style in ('american', 'british', 'european'):
+            svg_keys = set(path.stem for path in
+                           (__datadir__ / 'svg' / style).glob('*.svg'))
+            self.assertEqual(set(bundle.keys(style)), svg_keys, style)
+
+    def test_stale(self):
+        """Check bundle is up to date with the SVG files; if not, run
+        make bundle"""
+
+        bundle = SketchBundle.default()
+        self.assertIsNotNone(bundle)
+
+        for style in ('american', 'british', 'european'):
+            for sketch_key, entry in bundle.index[style].items():
+                svg_filename = __datadir__ / 'svg' / style / \
+                    (sketch_key + '.svg')
+                self.assertEqual(entry['hash'], svg_hash(svg_filename),
+                                 style + ' ' + sketch_key)
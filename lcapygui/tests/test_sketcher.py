@@ -0,0 +1,25 @@
+from matplotlib.figure import Figure
+from lcapygui.ui.sketcher import Sketcher
+import unittest
+
+
+class SketcherTester(unittest.TestCase):
+
+    def test_list_styles(self):
+        """Check lines with list valued styles are batched"""
+
+        sketcher = Sketcher(Figure().add_subplot(), batch=True)
+        sketcher.begin_group('owner')
+        for m in range(2):
+            sketcher.stroke_line(0, 0, 1, m, linestyle=(0, [2, 1]))
+        self.assertEqual(len(sketcher.layers), 1)
+        self.assertEqual(sketcher.end_group(), [])
+
+    def test_unhashable_styles(self):
+        """Check lines with unhashable styles are not batched"""
+
+        sketcher = Sketcher(Figure().add_subplot(), batch=True)
+        sketcher.begin_group('owner')
+        lines = sketcher.stroke_line(0, 0, 1, 1, gid={'a': 1})
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(sketcher.layers, {})
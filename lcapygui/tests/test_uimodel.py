@@ -0,0 +1,31 @@
+from lcapygui.ui.headless import NullUI
+import unittest
+
+
+class UIModelTester(unittest.TestCase):
+
+    def test_things_create(self):
+        """Check components are created in bulk"""
+
+        model = NullUI().new()
+        cpts = model.things_create([('V', (0, 0, 0, 2), {'value': '10'}),
+                                    ('R', (0, 2, 2, 2), {'value': '1e4'}),
+                                    ('C', (2, 2, 2, 0), {'value': 'C1'}),
+                                    ('W', (2, 0, 0, 0))])
+
+        self.assertEqual([cpt.name for cpt in cpts], ['V1', 'R1', 'C1', 'W1'])
+        self.assertEqual(model.circuit.R1.args[0], '1e4')
+        self.assertEqual(len(model.history), 1)
+
+    def test_things_create_invalid(self):
+        """Check no components are created if a value is invalid"""
+
+        model = NullUI().new()
+        self.assertRaises(ValueError, model.things_create,
+                          [('R', (0, 0, 2, 0), {'value': '1e3'}),
+                           ('R', (2, 0, 4, 0), {'value': '10k'})])
+
+        self.assertEqual(list(model.circuit.elements), [])
+        self.assertEqual(len(model.history), 0)
+        model.things_create([('R', (0, 0, 2, 0), {'value': '1e3'})])
+        self.assertEqual(list(model.circuit.elements), ['R1'])
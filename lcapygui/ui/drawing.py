@@ -10,6 +10,9 @@ class Drawing():
         self.debug = debug
         self.xsize = model.preferences.xsize
         self.ysize = model.preferences.ysize
+        # Cached background and artists for blitting
+        self.background = None
+        self.animated = []
 
         self.ax = self.fig.add_subplot(111)
 
@@ -39,9 +42,10 @@ class Drawing():
 
         self.ax.set_axisbelow(True)
 
-    def savefig(self, filename):
+    def savefig(self, filename, **kwargs):
 
-        self.fig.savefig(filename, bbox_inches='tight', pad_inches=0)
+        self.fig.savefig(filename, bbox_inches='tight', pad_inches=0,
+                         **kwargs)
 
     def set_view(self, xmin, ymin, xmax, ymax):
 
@@ -74,3 +78,47 @@ class Drawing():
         if self.debug:
             print('refresh')
         self.fig.canvas.draw()
+
+    def begin_animation(self, artists):
+        """Draw everything except the artists to be animated and cache
+        the result as the background for blitting."""
+
+        if self.debug:
+            print('begin animation')
+
+        for artist in artists:
+            artist.set_animated(True)
+        self.animated = list(artists)
+
+        canvas = self.fig.canvas
+        canvas.draw()
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+
+    def animate(self, artists):
+        """Restore the cached background and blit the artists on top."""
+
+        if self.background is None:
+            self.begin_animation(artists)
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+
+        for artist in artists:
+            artist.set_animated(True)
+            self.ax.draw_artist(artist)
+        self.animated = list(artists)
+
+        canvas.blit(self.fig.bbox)
+
+    def end_animation(self):
+        """Return the animated artists to normal drawing."""
+
+        if self.debug:
+            print('end animation')
+
+        for artist in self.animated:
+            artist.set_animated(False)
+        self.animated = []
+        self.background = None
+
+        self.fig.canvas.draw()
@@ -0,0 +1,293 @@
+"""User interfaces for models that run without a display, say for
+batch processing, a server, or benchmarks.  These do not import
+tkinter.
+
+NullUI discards drawing and dialogs, RecordingUI records the calls
+the model makes to the user interface, and OffscreenUI draws the
+schematic on an offscreen Agg figure so that it can be saved as an
+image."""
+
+
+# Sketch library shared by the user interfaces in this process since
+# it is slow to load.
+_sketchlib = None
+
+
+def shared_sketchlib():
+
+    global _sketchlib
+
+    if _sketchlib is None:
+        from ..sketch_library import SketchLibrary
+
+        _sketchlib = SketchLibrary()
+    return _sketchlib
+
+
+class NullSketcher:
+    """Sketcher that draws nothing."""
+
+    def __init__(self):
+
+        self.batch = False
+
+    def begin_group(self, owner=None):
+
+        pass
+
+    def end_group(self):
+
+        return []
+
+    def remove_group(self, owner):
+
+        pass
+
+    def flush(self):
+
+        pass
+
+    def clear(self):
+
+        pass
+
+    def remove(self, patch):
+
+        pass
+
+    def _nothing(self, *args, **kwargs):
+
+        return None
+
+    stroke_line = stroke_arc = stroke_rect = _nothing
+    stroke_circle = stroke_filled_circle = stroke_polygon = _nothing
+    stroke_path = text = sketch = _nothing
+
+
+class HeadlessCanvas:
+
+    def __init__(self, drawing=None, sketcher=None):
+
+        self.drawing = drawing
+        self.sketcher = sketcher
+
+
+class NullUI:
+    """User interface without a display.  Messages that would be shown
+    in dialogs are kept in `messages`; other dialogs are ignored and
+    file dialogs return '' as if cancelled.  Analysis jobs are run
+    synchronously."""
+
+    NAME = 'lcapy-headless'
+
+    def __init__(self, debug=0):
+
+        from .. import __version__
+
+        self.debug = debug
+        self.version = __version__
+        self.messages = []
+        self.model = None
+        self.canvas = HeadlessCanvas(sketcher=NullSketcher())
+
+    @property
+    def sketcher(self):
+
+        return self.canvas.sketcher
+
+    @property
+    def sketchlib(self):
+
+        return shared_sketchlib()
+
+    def new(self, uimodel_class=None):
+        """Create a model using this user interface."""
+
+        if uimodel_class is None:
+            from .uimodelmph import UIModelMPH
+
+            uimodel_class = UIModelMPH
+
+        self.model = uimodel_class(self)
+        return self.model
+
+    def load(self, pathname):
+
+        model = self.new()
+        model.load(pathname)
+        return model
+
+    def loads(self, netlist):
+        """Create a model for the netlist string `netlist`."""
+
+        from lcapy import Circuit
+
+        model = self.new()
+        # A string without a newline is treated as a filename.
+        try:
+            circuit = Circuit(netlist.strip() + '\n')
+        except Exception as e:
+            model.exception(e)
+            return model
+        model.load_from_circuit(circuit)
+        return model
+
+    def record(self, name, *args, **kwargs):
+        """Called for each user interface request that has no effect."""
+
+        pass
+
+    def __getattr__(self, name):
+
+        # Other dialogs, say show_expr_dialog, do nothing.
+        if name.startswith('show_') or name.endswith('_dialog'):
+            def dialog(*args, **kwargs):
+                self.record(name, *args, **kwargs)
+                if name.endswith('file_dialog'):
+                    return ''
+            return dialog
+        raise AttributeError(name)
+
+    def run_job(self, description, func, args=(), on_done=None,
+                on_error=None):
+
+        self.record('run_job', description, func, *args)
+        try:
+            result = func(*args)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return
+        if on_done is not None:
+            on_done(result)
+
+    def show_error_dialog(self, message):
+
+        self.record('show_error_dialog', message)
+        self.messages.append(('error', message))
+
+    def show_info_dialog(self, message):
+
+        self.record('show_info_dialog', message)
+        self.messages.append(('info', message))
+
+    def show_message_dialog(self, message, title=''):
+
+        self.record('show_message_dialog', message, title)
+        self.messages.append(('message', message))
+
+    def show_warning_dialog(self, message):
+
+        self.record('show_warning_dialog', message)
+        self.messages.append(('warning', message))
+
+    def animate(self, artists):
+
+        pass
+
+    def begin_animation(self, artists):
+
+        pass
+
+    def clear(self, grid=None):
+
+        self.sketcher.clear()
+
+    def end_animation(self):
+
+        pass
+
+    def refresh(self):
+
+        self.sketcher.flush()
+
+    def set_filename(self, filename):
+
+        pass
+
+    def set_view(self, xmin, ymin, xmax, ymax):
+
+        pass
+
+    def save(self, pathname):
+
+        self.record('save', pathname)
+
+    def screenshot(self, pathname):
+
+        self.record('screenshot', pathname)
+
+    def quit(self):
+
+        pass
+
+
+class RecordingUI(NullUI):
+    """User interface without a display that records the requests made
+    by the model in `calls` as (name, args, kwargs); this is useful for
+    testing the models."""
+
+    def __init__(self, debug=0):
+
+        super(RecordingUI, self).__init__(debug)
+        self.calls = []
+
+    def record(self, name, *args, **kwargs):
+
+        self.calls.append((name, args, kwargs))
+
+    def refresh(self):
+
+        self.record('refresh')
+        super(RecordingUI, self).refresh()
+
+
+class OffscreenUI(RecordingUI):
+    """User interface that draws on an offscreen matplotlib figure using
+    the Agg renderer.  Use `savefig()` to write an image of the
+    schematic."""
+
+    FIGSIZE = (12, 7.2)
+
+    def new(self, uimodel_class=None):
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from .drawing import Drawing
+        from .sketcher import Sketcher
+
+        model = super(OffscreenUI, self).new(uimodel_class)
+
+        fig = Figure(figsize=self.FIGSIZE, frameon=False)
+        FigureCanvasAgg(fig)
+        fig.subplots_adjust(left=0, bottom=0, right=1,
+                            top=1, wspace=0, hspace=0)
+        drawing = Drawing(self, fig, model, self.debug)
+        self.canvas = HeadlessCanvas(drawing, Sketcher(drawing.ax,
+                                                       self.debug,
+                                                       batch=True))
+        return model
+
+    def clear(self, grid='on'):
+
+        self.canvas.drawing.clear(grid)
+        self.sketcher.clear()
+
+    def refresh(self):
+
+        super(OffscreenUI, self).refresh()
+        self.canvas.drawing.refresh()
+
+    def set_view(self, xmin, ymin, xmax, ymax):
+
+        self.canvas.drawing.set_view(xmin, ymin, xmax, ymax)
+
+    def savefig(self, pathname, **kwargs):
+
+        self.sketcher.flush()
+        self.canvas.drawing.savefig(pathname, **kwargs)
+
+    def screenshot(self, pathname):
+
+        self.savefig(pathname)
@@ -0,0 +1,127 @@
+from collections import deque
+
+
+class History:
+    """Log of the edits to undo and redo.  The events to undo are kept
+    in a ring buffer of at most `max_events` events and roughly
+    `max_bytes` bytes (including the events to redo).  When the bytes
+    are exceeded, the events to redo are dropped first, furthest from
+    the current state first, and then the oldest events to undo.
+    Making an edit discards the events to redo.
+
+    A move of the same components as the previous move, within
+    `coalesce_time` seconds of it finishing, is merged with it so
+    that a sequence of small drags is undone in one step.
+
+    If `hook` is set, it is called with the result of stats() after
+    each change, say to watch the memory used in a long session."""
+
+    def __init__(self, max_events=1000, max_bytes=16 * 1024 * 1024,
+                 coalesce_time=1.0):
+
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.coalesce_time = coalesce_time
+        self.events = deque()
+        self.redo_events = []
+        self.nbytes = 0
+        self.num_coalesced = 0
+        self.num_evicted = 0
+        self.hook = None
+
+    def __len__(self):
+
+        return len(self.events)
+
+    def append(self, event):
+        """Record an edit.  This returns the recorded event; this is
+        the previous event if the edit is merged with it."""
+
+        if self.redo_events:
+            for old in self.redo_events:
+                self.nbytes -= old.nbytes
+            self.redo_events.clear()
+        elif self.events and self.coalesces(self.events[-1], event):
+            last = self.events[-1]
+            last.new_positions[:] = event.new_positions
+            self.num_coalesced += 1
+            self.changed()
+            return last
+
+        self.nbytes += event.nbytes
+        self.events.append(event)
+        self.trim()
+        self.changed()
+        return event
+
+    def changed(self):
+
+        if self.hook is not None:
+            self.hook(self.stats())
+
+    def clear(self):
+
+        self.events.clear()
+        self.redo_events.clear()
+        self.nbytes = 0
+        self.changed()
+
+    def coalesces(self, last, event):
+        """Return True if `event` can be merged with the last event."""
+
+        return (event.code == 'M' and last.code == 'M' and
+                event.names == last.names and event.nodes == last.nodes and
+                event.time - last.time <= self.coalesce_time)
+
+    def set_limits(self, max_events=None, max_bytes=None,
+                   coalesce_time=None):
+
+        if max_events is not None:
+            self.max_events = max_events
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if coalesce_time is not None:
+            self.coalesce_time = coalesce_time
+        self.trim()
+        self.changed()
+
+    def stats(self):
+
+        return {'events': len(self.events),
+                'redo_events': len(self.redo_events),
+                'nbytes': self.nbytes, 'max_events': self.max_events,
+                'max_bytes': self.max_bytes,
+                'coalesced': self.num_coalesced,
+                'evicted': self.num_evicted}
+
+    def trim(self):
+        """Drop events until within the limits."""
+
+        while self.redo_events and self.nbytes > self.max_bytes:
+            self.nbytes -= self.redo_events.pop(0).nbytes
+            self.num_evicted += 1
+
+        while self.events and (len(self.events) > self.max_events or
+                               self.nbytes > self.max_bytes):
+            self.nbytes -= self.events.popleft().nbytes
+            self.num_evicted += 1
+
+    def undo_event(self):
+        """Return the event to undo or None."""
+
+        if not self.events:
+            return None
+        event = self.events.pop()
+        self.redo_events.append(event)
+        self.changed()
+        return event
+
+    def redo_event(self):
+        """Return the event to redo or None."""
+
+        if not self.redo_events:
+            return None
+        event = self.redo_events.pop()
+        self.events.append(event)
+        self.changed()
+        return event
@@ -1,7 +1,38 @@
+from sys import getsizeof
+from time import monotonic
+
+
 class HistoryEvent:
+    """Compact record of an edit for undo and redo.  This does not
+    keep the components so that it stays small and remains valid
+    after the components are remade.
+
+    `code` is 'A' (components added), 'D' (components deleted), or
+    'M' (components moved).  `names` are the names of the components
+    and, for 'A' and 'D', `netlist` is their netlist lines.  `nodes`
+    are the names of their nodes, `positions` is an array of the node
+    positions before the edit and, for 'M', `new_positions` is an
+    array of the positions after the edit.  `time` is when the edit
+    was made or, for a move, finished."""
 
-    def __init__(self, code, cpt, nodes=None):
+    def __init__(self, code, names=(), netlist='', nodes=(), positions=None,
+                 new_positions=None):
 
         self.code = code
-        self.cpt = cpt
-        self.nodes = nodes
+        self.names = tuple(names)
+        self.netlist = netlist
+        self.nodes = tuple(nodes)
+        self.positions = positions
+        self.new_positions = new_positions
+        self.time = monotonic()
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the event."""
+
+        nbytes = getsizeof(self) + getsizeof(self.netlist)
+        nbytes += sum(getsizeof(name) for name in self.names + self.nodes)
+        for positions in (self.positions, self.new_positions):
+            if positions is not None:
+                nbytes += positions.nbytes
+        return nbytes
@@ -0,0 +1,50 @@
+class NameIndex:
+    """Chooses unused names, such as R1, R2, ... for components or 1,
+    2, ... for nodes.  `names` is the container of the names in use,
+    say the elements or nodes of a circuit.
+
+    The next number to try for each prefix is remembered so that
+    choosing a name does not scan from 1 each time.  This is a lower
+    bound on the first free number, so `release()` needs to be called
+    when a name is no longer used so that it can be reused."""
+
+    def __init__(self, names):
+
+        self.names = names
+        # Names chosen but not yet added to `names`.
+        self.reserved = set()
+        self.counts = {}
+
+    def __contains__(self, name):
+
+        return name in self.names or name in self.reserved
+
+    def choose(self, prefix=''):
+        """Return the unused name with `prefix` and the lowest number."""
+
+        num = self.counts.get(prefix, 1)
+        while prefix + str(num) in self:
+            num += 1
+        self.counts[prefix] = num
+        return prefix + str(num)
+
+    def reserve(self, name):
+        """Treat `name` as used until `clear_reserved()` is called."""
+
+        self.reserved.add(name)
+
+    def clear_reserved(self):
+
+        self.reserved.clear()
+
+    def release(self, name):
+        """Note that `name` is no longer used."""
+
+        prefix = name.rstrip('0123456789')
+        number = name[len(prefix):]
+        if number == '' or number[0] == '0':
+            return
+
+        num = int(number)
+        if num < self.counts.get(prefix, 1):
+            self.counts[prefix] = num
@@ -19,7 +19,7 @@ class Preferences:
         self.style = 'american'
         self.voltage_dir = 'RP'
         self.grid = 'on'
-        self.line_width = circuitikz_default_line_width,
+        self.line_width = circuitikz_default_line_width
         self.scale = circuitikz_default_scale
         self.show_units = 'false'
         self.xsize = 36
@@ -29,6 +29,12 @@ class Preferences:
         self.line_width_scale = 3.5
         self.node_size = 0.12
         self.node_color = 'black'
+        self.renderer = 'mathtext'
+        # Limits on the undo history and the time (s) within which
+        # drags of the same components are merged
+        self.history_max_events = 1000
+        self.history_max_bytes = 16 * 1024 * 1024
+        self.history_coalesce_time = 1.0
 
         self.load()
 
@@ -44,8 +50,9 @@ class Preferences:
 
     def load(self):
 
-        dirname = self._dirname
-        if not dirname.exists():
+        # Note, the directory is also used for caches so it may
+        # exist without a preferences file.
+        if not self._filename.exists():
             return
 
         s = self._filename.read_text()
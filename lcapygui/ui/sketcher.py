@@ -0,0 +1,259 @@
+from matplotlib.patches import PathPatch, Arc, Circle, Polygon
+from matplotlib.collections import PathCollection, LineCollection
+from matplotlib.path import Path
+from math import degrees
+from numpy import array
+
+
+def _hashable(value):
+    """Return value with lists and arrays, say a dash pattern or RGB
+    color, converted to tuples so that it can be used in a key."""
+
+    if hasattr(value, 'tolist'):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+class Layer:
+    """A collection of paths or line segments, from many owners, that
+    share the same style and are drawn by a single artist."""
+
+    def __init__(self, collection):
+
+        self.collection = collection
+        # Map owner to list of (path, edgecolor, facecolor)
+        self.items = {}
+        self.stale = False
+
+    def update(self):
+
+        items = [item for items in self.items.values() for item in items]
+
+        collection = self.collection
+        if isinstance(collection, LineCollection):
+            collection.set_segments([item[0] for item in items])
+            collection.set_color([item[1] for item in items])
+        else:
+            collection.set_paths([item[0] for item in items])
+            collection.set_edgecolor([item[1] for item in items])
+            collection.set_facecolor([item[2] for item in items])
+        self.stale = False
+
+
+class Sketcher:
+
+    def __init__(self, ax, debug=0, batch=False):
+
+        self.ax = ax
+        self.debug = debug
+        # List of artists created since begin_group() or None
+        self.group = None
+        # Owner of the group, say a component, or None
+        self.owner = None
+        # If batch is True, the sketch paths and lines of a group are
+        # added to shared collections, one per style, rather than
+        # being drawn with their own artists.  The collections are
+        # updated by flush().
+        self.batch = batch
+        self.layers = {}
+
+    def begin_group(self, owner=None):
+        """Start recording the artists that are created, say for a
+        component, so that they can be later removed."""
+
+        self.group = []
+        self.owner = owner
+
+    def end_group(self):
+        """Stop recording and return the recorded artists.  This does
+        not include the batched paths; these are removed with
+        remove_group()."""
+
+        group = self.group
+        self.group = None
+        self.owner = None
+        return group if group is not None else []
+
+    def remove_group(self, owner):
+        """Remove the batched paths for owner."""
+
+        for layer in self.layers.values():
+            if layer.items.pop(owner, None) is not None:
+                layer.stale = True
+
+    def flush(self):
+        """Update the collections for the batched paths."""
+
+        for layer in self.layers.values():
+            if layer.stale:
+                layer.update()
+
+    @property
+    def batching(self):
+
+        return self.batch and self.owner is not None
+
+    def _layer(self, cls, **kwargs):
+
+        key = cls, tuple(sorted((k, _hashable(v)) for k, v in kwargs.items()))
+        try:
+            layer = self.layers.get(key)
+        except TypeError:
+            # Unhashable style, say a dictionary; draw with an artist.
+            return None
+        if layer is None or layer.collection.axes is None:
+            # The collection is orphaned when the axes are cleared.
+            collection = cls([], **kwargs)
+            self.ax.add_collection(collection, autolim=False)
+            layer = Layer(collection)
+            self.layers[key] = layer
+        return layer
+
+    def _batch(self, cls, path, edgecolor, facecolor, **kwargs):
+        """Add path to the layer for its style.  This returns False if
+        the path cannot be batched."""
+
+        layer = self._layer(cls, **kwargs)
+        if layer is None:
+            return False
+        layer.items.setdefault(self.owner, []).append((path, edgecolor,
+                                                       facecolor))
+        layer.stale = True
+        return True
+
+    def _record(self, *artists):
+
+        if self.group is not None:
+            self.group.extend(artists)
+
+    def stroke_line(self, xstart, ystart, xend, yend, color='black', **kwargs):
+
+        if self.batching and self._batch(LineCollection,
+                                         ((xstart, ystart), (xend, yend)),
+                                         color, 'none', **kwargs):
+            return []
+
+        lines = self.ax.plot((xstart, xend), (ystart, yend),
+                             color=color, **kwargs)
+        self._record(*lines)
+        return lines
+
+    def stroke_arc(self, x, y, r, theta1, theta2, **kwargs):
+
+        r *= 2
+        patch = Arc((x, y), r, r, 0, degrees(theta1),
+                    degrees(theta2), **kwargs)
+        self.ax.add_patch(patch)
+        self._record(patch)
+        return patch
+
+    def clear(self):
+
+        self.ax.clear()
+        self.layers = {}
+
+    def stroke_rect(self, xstart, ystart, width, height, **kwargs):
+        # xstart, ystart top left corner
+
+        xend = xstart + width
+        yend = ystart + height
+
+        self.stroke_line(xstart, ystart, xstart, yend, **kwargs)
+        self.stroke_line(xstart, yend, xend, yend, **kwargs)
+        self.stroke_line(xend, yend, xend, ystart, **kwargs)
+        self.stroke_line(xend, ystart, xstart, ystart, **kwargs)
+
+    def stroke_filled_circle(self, x, y, radius=0.5, color='black',
+                             alpha=0.5, **kwargs):
+
+        patch = Circle((x, y), radius, fc=color, alpha=alpha, **kwargs)
+        self.ax.add_patch(patch)
+        self._record(patch)
+        return patch
+
+    def stroke_circle(self, x, y, radius=0.5, color='black',
+                      alpha=0.5, **kwargs):
+
+        patch = Circle((x, y), radius, fc='white',
+                       color=color, alpha=alpha, **kwargs)
+        self.ax.add_patch(patch)
+        self._record(patch)
+        return patch
+
+    def stroke_polygon(self, path, color='black', alpha=0.5,
+                       fill=False, **kwargs):
+
+        patch = Polygon(path, fc=color, alpha=alpha,
+                        fill=fill, **kwargs)
+        self.ax.add_patch(patch)
+        self._record(patch)
+        return patch
+
+    def text(self, x, y, text, **kwargs):
+
+        from lcapy.latex import latex_format_label
+
+        # The matplotlib mathtext parser does not like
+        # dollar signs inside mathrm, e.g., \mathrm{$A_2$}
+        # text = r'$\mathrm{' + latex_format_label(text) + '}$'
+
+        annotation = self.ax.annotate(text, (x, y), **kwargs)
+        self._record(annotation)
+        return annotation
+
+    def stroke_path(self, path, color='black', **kwargs):
+
+        for m in range(len(path) - 1):
+            xstart, ystart = path[m]
+            xend, yend = path[m + 1]
+
+            self.stroke_line(xstart, ystart, xend, yend, color=color, **kwargs)
+
+    def remove(self, patch):
+
+        self.ax.remove(patch)
+
+    def sketch(self, sketch, tf, **kwargs):
+
+        color = kwargs.pop('color', sketch.color)
+        mirror = kwargs.pop('mirror', False)
+        invert = kwargs.pop('invert', False)
+
+        patches = []
+
+        for m, spath in enumerate(sketch.paths):
+            path = spath.path
+            fill = spath.fill
+
+            # Note, the SVG coordinate system has y going down the screen
+            # but Matplotlib's coordinate system has y going up the screen.
+            # Thus we need to invert the sense of mirror.
+
+            if not mirror:
+                vertices = path.vertices * (1, -1)
+                path = Path(vertices, path.codes)
+            if invert:
+                vertices = path.vertices * (-1, 1)
+                path = Path(vertices, path.codes)
+
+            path = path.transformed(tf)
+
+            fill = kwargs.pop('fill', fill)
+
+            if self.debug:
+                color = ['red', 'yellow', 'orange',
+                         'green', 'blue', 'violet'][m % 6]
+
+            if self.batching and self._batch(PathCollection, path, color,
+                                             color if fill else 'none',
+                                             **kwargs):
+                continue
+
+            patch = PathPatch(path, fill=fill, color=color, **kwargs)
+            patches.append(patch)
+            self.ax.add_patch(patch)
+
+        self._record(*patches)
+        return patches
@@ -0,0 +1,133 @@
+from math import floor, isnan
+
+
+class SpatialIndex:
+    """Uniform grid index of component bounding boxes and node
+    positions.  This is used for hit-testing so that only the
+    components and nodes near a point need to be checked.  Nodes are
+    also hashed by their position, rounded to `resolution`, to find
+    the node at a point."""
+
+    def __init__(self, cell_size=2, resolution=1e-3):
+
+        self.cell_size = cell_size
+        self.resolution = resolution
+        # Map cell to set of component/node names
+        self.cpt_cells = {}
+        self.node_cells = {}
+        # Map component/node name to the cells it occupies
+        self.cpt_keys = {}
+        self.node_keys = {}
+        # Map rounded position to node names (a dict to keep the
+        # order) and node name to rounded position
+        self.node_points = {}
+        self.node_point_keys = {}
+
+    def __len__(self):
+
+        return len(self.cpt_keys)
+
+    def _cell(self, x, y):
+
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def point_key(self, x, y):
+        """Return key used to hash position (x, y)."""
+
+        return round(x / self.resolution), round(y / self.resolution)
+
+    def _cells(self, xmin, ymin, xmax, ymax):
+
+        i1, j1 = self._cell(xmin, ymin)
+        i2, j2 = self._cell(xmax, ymax)
+
+        return [(i, j) for i in range(i1, i2 + 1) for j in range(j1, j2 + 1)]
+
+    def clear(self):
+
+        self.cpt_cells.clear()
+        self.node_cells.clear()
+        self.cpt_keys.clear()
+        self.node_keys.clear()
+        self.node_points.clear()
+        self.node_point_keys.clear()
+
+    def add_cpt(self, name, bbox):
+        """Add or update component `name` with bounding box
+        (xmin, ymin, xmax, ymax)."""
+
+        self.remove_cpt(name)
+
+        if any(isnan(v) for v in bbox):
+            return
+
+        cells = self._cells(*bbox)
+        for cell in cells:
+            self.cpt_cells.setdefault(cell, set()).add(name)
+        self.cpt_keys[name] = cells
+
+    def remove_cpt(self, name):
+
+        for cell in self.cpt_keys.pop(name, ()):
+            names = self.cpt_cells[cell]
+            names.discard(name)
+            if not names:
+                del self.cpt_cells[cell]
+
+    def add_node(self, name, x, y):
+        """Add or update node `name` at position (x, y)."""
+
+        self.remove_node(name)
+
+        if isnan(x) or isnan(y):
+            return
+
+        cell = self._cell(x, y)
+        self.node_cells.setdefault(cell, set()).add(name)
+        self.node_keys[name] = cell
+
+        point = self.point_key(x, y)
+        self.node_points.setdefault(point, {})[name] = True
+        self.node_point_keys[name] = point
+
+    def remove_node(self, name):
+
+        point = self.node_point_keys.pop(name, None)
+        if point is not None:
+            names = self.node_points[point]
+            names.pop(name, None)
+            if not names:
+                del self.node_points[point]
+
+        cell = self.node_keys.pop(name, None)
+        if cell is None:
+            return
+        names = self.node_cells[cell]
+        names.discard(name)
+        if not names:
+            del self.node_cells[cell]
+
+    def cpts_near(self, x, y):
+        """Return names of components whose bounding box cells
+        contain (x, y)."""
+
+        return self.cpt_cells.get(self._cell(x, y), set())
+
+    def nodes_at(self, x, y):
+        """Return names of nodes at (x, y)."""
+
+        return list(self.node_points.get(self.point_key(x, y), ()))
+
+    def nodes_in(self, xmin, ymin, xmax, ymax):
+        """Return names of nodes in the cells overlapping the rectangle
+        (xmin, ymin, xmax, ymax)."""
+
+        names = set()
+        for cell in self._cells(xmin, ymin, xmax, ymax):
+            names.update(self.node_cells.get(cell, ()))
+        return names
+
+    def nodes_near(self, x, y, radius=0.5):
+        """Return names of nodes in the cells within `radius` of (x, y)."""
+
+        return self.nodes_in(x - radius, y - radius, x + radius, y + radius)
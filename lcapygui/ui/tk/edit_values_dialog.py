@@ -41,6 +41,8 @@ class EditValuesDialog(Window):
         menudropdowns = [
             MenuDropdown('File', 0,
                          [MenuItem('Load', self.on_load),
+                          MenuItem('Sweep', self.on_sweep),
+                          MenuItem('Monte Carlo', self.on_monte_carlo),
                           ])]
 
         self.add_menu(menudropdowns)
@@ -91,3 +93,13 @@ class EditValuesDialog(Window):
         cct = self.circuit.subs(defs)
 
         self.ui.model.on_show_new_circuit(cct)
+
+    def on_monte_carlo(self, arg):
+
+        self.ui.show_monte_carlo_dialog()
+        self.on_close()
+
+    def on_sweep(self, arg):
+
+        self.ui.show_sweep_dialog()
+        self.on_close()
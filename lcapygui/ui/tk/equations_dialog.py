@@ -1,5 +1,5 @@
 from tkinter.ttk import Button, Label
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
 from .lateximage import LatexImage
 from .window import Window
@@ -45,8 +45,9 @@ class EquationsDialog(Window):
 
     def show_img(self):
 
-        png_filename = LatexImage(self.s).image()
-        img = ImageTk.PhotoImage(Image.open(png_filename), master=self)
+        renderer = self.ui.model.preferences.renderer
+        image = LatexImage(self.s, renderer=renderer).pil_image()
+        img = ImageTk.PhotoImage(image, master=self)
         self.expr_label.config(image=img)
         self.expr_label.photo = img
 
@@ -34,11 +34,13 @@ def make_python(expr):
 
 class ExprDialog(Window):
 
-    def __init__(self, expr, ui, title=''):
+    def __init__(self, expr, ui, title='', numeric=None):
 
         super(ExprDialog, self).__init__(ui, None, title)
 
         self.expr = expr
+        # Numeric version of expr, say a NumericTransferFunction.
+        self.numeric = numeric
         self.titlestr = title
 
         mdd = None
@@ -132,8 +134,8 @@ class ExprDialog(Window):
 
         self.add_menu(menudropdowns)
 
-        png_filename = ExprImage(expr).image()
-        image = Image.open(png_filename)
+        renderer = self.ui.model.preferences.renderer
+        image = ExprImage(expr, renderer).pil_image()
 
         self.expr_label = Label(self, text='', width=image.width + 100,
                                 height=image.height + 100)
@@ -156,9 +158,8 @@ class ExprDialog(Window):
         # if self.ui.model.preferences.show_units == 'true':
         #    e = e * e.units
 
-        png_filename = ExprImage(e).image()
-
-        image = Image.open(png_filename)
+        renderer = self.ui.model.preferences.renderer
+        image = ExprImage(e, renderer).pil_image()
 
         right = pad
         left = pad
@@ -332,7 +333,7 @@ class ExprDialog(Window):
             self.ui.info_dialog('Cannot plot expression')
             return
 
-        self.ui.show_plot_properties_dialog(self.expr)
+        self.ui.show_plot_properties_dialog(self.expr, self.numeric)
 
     def on_python(self, arg):
 
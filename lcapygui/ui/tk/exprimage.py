@@ -3,10 +3,19 @@ from .lateximage import LatexImage
 
 class ExprImage:
 
-    def __init__(self, expr):
+    def __init__(self, expr, renderer='latex'):
 
         self.expr = expr
+        self.renderer = renderer
 
     def image(self):
 
-        return LatexImage(self.expr.latex()).image()
+        return self.latex_image().image()
+
+    def pil_image(self):
+
+        return self.latex_image().pil_image()
+
+    def latex_image(self):
+
+        return LatexImage(self.expr.latex(), renderer=self.renderer)
@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from hashlib import sha1
+from pathlib import Path
+from PIL import Image
+import os
+import shutil
+
+
+class LatexCache:
+    """Cache of rendered LaTeX images keyed by a hash of the LaTeX
+    document and the resolution.  Recently used images are kept in
+    memory; the PNG files are kept on disk and the least recently used
+    files are removed when the total size exceeds `max_bytes`."""
+
+    # Increment this if the rendering changes.
+    VERSION = 1
+
+    def __init__(self, dirname=None, max_items=32, max_bytes=32 * 1024**2):
+
+        if dirname is None:
+            dirname = Path('~/.lcapy/latex').expanduser()
+        self.dirname = Path(dirname) / ('v%d' % self.VERSION)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.images = OrderedDict()
+
+    def key(self, content, dpi):
+
+        return sha1(('%d\n%s' % (dpi, content)).encode('utf-8')).hexdigest()
+
+    def filename(self, key):
+
+        return self.dirname / (key + '.png')
+
+    def lookup(self, key):
+        """Return cached image filename or None if not cached."""
+
+        filename = self.filename(key)
+        if not filename.exists():
+            return None
+        try:
+            # Record the use for the eviction.
+            os.utime(filename)
+        except OSError:
+            pass
+        return str(filename)
+
+    def lookup_image(self, key):
+        """Return cached PIL image or None if not cached."""
+
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+
+        filename = self.lookup(key)
+        if filename is None:
+            return None
+
+        try:
+            with Image.open(filename) as image:
+                image.load()
+        except OSError:
+            return None
+        self._remember(key, image)
+        return image
+
+    def _remember(self, key, image):
+
+        self.images[key] = image
+        while len(self.images) > self.max_items:
+            self.images.popitem(last=False)
+
+    def save(self, key, png_filename):
+        """Copy rendered image into the cache and return the cached
+        filename, or `png_filename` if it cannot be cached."""
+
+        filename = self.filename(key)
+        try:
+            self.dirname.mkdir(parents=True, exist_ok=True)
+            tmp_filename = filename.with_suffix('.%d.tmp' % os.getpid())
+            shutil.copyfile(png_filename, tmp_filename)
+            os.replace(tmp_filename, filename)
+        except OSError:
+            return png_filename
+
+        self.evict()
+        return str(filename)
+
+    def evict(self):
+        """Remove the least recently used files until the cache is
+        within its size limit."""
+
+        entries = []
+        total = 0
+        for filename in self.dirname.glob('*.png'):
+            try:
+                st = filename.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, filename))
+            total += st.st_size
+
+        entries.sort()
+        for mtime, size, filename in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                filename.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+
+        self.images.clear()
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+
+latex_cache = LatexCache()
@@ -1,30 +1,98 @@
 from lcapy.system import tmpfilename, LatexRunner, PDFConverter
+from matplotlib.mathtext import math_to_image
+from PIL import Image
+from .latex_cache import latex_cache
 
 
 class LatexImage:
 
-    def __init__(self, s):
+    # Need amsmath for operatorname
+    template = ('\\documentclass[a4paper]{standalone}\n'
+                '\\usepackage{amsmath}\n'
+                '\\begin{document}\n$%s$\n'
+                '\\end{document}\n')
+
+    renderers = ('mathtext', 'latex')
+
+    def __init__(self, s, dpi=300, cache=latex_cache, renderer='latex'):
+
+        if renderer not in self.renderers:
+            raise ValueError('Unknown renderer %s, must be either %s'
+                             % (renderer, ', '.join(self.renderers)))
 
         self.s = s
+        self.dpi = dpi
+        self.cache = cache
+        self.renderer = renderer
 
-    def image(self):
+    @property
+    def content(self):
 
-        tex_filename = tmpfilename('.tex')
+        return self.template % self.s
+
+    @property
+    def key(self):
+
+        return self.cache.key(self.renderer + '\n' + self.content, self.dpi)
+
+    def render(self):
+        """Render image and return PNG filename.  The mathtext renderer
+        falls back to LaTeX for constructs that mathtext does not
+        support, such as environments."""
+
+        if self.renderer == 'mathtext':
+            try:
+                return self.render_mathtext()
+            except ValueError:
+                pass
+        return self.render_latex()
+
+    def render_mathtext(self):
+
+        png_filename = tmpfilename('.png')
+        math_to_image('$%s$' % self.s, png_filename, dpi=self.dpi,
+                      format='png')
+        return png_filename
+
+    def render_latex(self):
 
-        # Need amsmath for operatorname
-        template = ('\\documentclass[a4paper]{standalone}\n'
-                    '\\usepackage{amsmath}\n'
-                    '\\begin{document}\n$%s$\n'
-                    '\\end{document}\n')
-        content = template % self.s
+        tex_filename = tmpfilename('.tex')
 
-        open(tex_filename, 'w').write(content)
+        open(tex_filename, 'w').write(self.content)
         pdf_filename = tex_filename.replace('.tex', '.pdf')
         latexrunner = LatexRunner()
         latexrunner.run(tex_filename)
 
         png_filename = tex_filename.replace('.tex', '.png')
         pdfconverter = PDFConverter()
-        pdfconverter.to_png(pdf_filename, png_filename, dpi=300)
+        pdfconverter.to_png(pdf_filename, png_filename, dpi=self.dpi)
 
         return png_filename
+
+    def image(self):
+        """Return filename of PNG image, rendering it if not cached."""
+
+        if self.cache is None:
+            return self.render()
+
+        key = self.key
+        png_filename = self.cache.lookup(key)
+        if png_filename is None:
+            png_filename = self.cache.save(key, self.render())
+        return png_filename
+
+    def pil_image(self):
+        """Return PIL image, rendering it if not cached."""
+
+        if self.cache is None:
+            return Image.open(self.render())
+
+        key = self.key
+        image = self.cache.lookup_image(key)
+        if image is None:
+            png_filename = self.cache.save(key, self.render())
+            image = self.cache.lookup_image(key)
+            if image is None:
+                # Cache not writable
+                image = Image.open(png_filename)
+        return image
@@ -4,11 +4,18 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 from os.path import basename
+from threading import Thread
 from ..uimodelmph import UIModelMPH
-from .sketcher import Sketcher
-from .drawing import Drawing
+from ..sketcher import Sketcher
+from ..drawing import Drawing
 from .menu import MenuBar, MenuDropdown, MenuItem, MenuSeparator
 from ...sketch_library import SketchLibrary
+from ...jobs import JobScheduler
+
+
+def _preload():
+
+    import lcapy
 
 
 class LcapyTk(Tk):
@@ -21,10 +28,20 @@ class LcapyTk(Tk):
 
     NAME = 'lcapy-tk'
 
+    # Draw component paths using shared collections
+    sketcher_batch = True
+
+    # Interval (ms) for checking background jobs
+    job_poll_interval = 100
+
     def __init__(self, pathnames=None, uimodel_class=None, debug=0):
 
         from ... import __version__
 
+        # Import Lcapy, and thus SymPy, while the window is created since
+        # this is slow; the import by the first model waits for this.
+        Thread(target=_preload, daemon=True).start()
+
         super().__init__()
 
         self.debug = debug
@@ -33,6 +50,10 @@ class LcapyTk(Tk):
         self.canvas = None
         self.sketchlib = SketchLibrary()
         self.dialogs = {}
+        self.jobs = JobScheduler()
+        self.jobs.on_callback_error = self.on_job_error
+        self.working_dialogs = []
+        self.polling_jobs = False
 
         if uimodel_class is None:
             uimodel_class = UIModelMPH
@@ -114,7 +135,9 @@ class LcapyTk(Tk):
                              MenuItem('Paste', self.on_paste,
                                       accelerator='Ctrl+v'),
                              MenuItem('Values', self.on_edit_values,
-                                      accelerator='Ctrl+V')
+                                      accelerator='Ctrl+V'),
+                             MenuItem('Sweep', self.on_sweep),
+                             MenuItem('Monte Carlo', self.on_monte_carlo)
                          ]),
 
             MenuDropdown('View', 0,
@@ -211,6 +234,9 @@ class LcapyTk(Tk):
         if pathnames is None:
             pathnames = []
 
+        # Show the window before waiting for Lcapy.
+        self.update()
+
         for pathname in pathnames:
             try:
                 self.load(pathname)
@@ -220,12 +246,26 @@ class LcapyTk(Tk):
         if pathnames == []:
             model = self.new()
 
+    def animate(self, artists):
+
+        self.canvas.drawing.animate(artists)
+
+    def begin_animation(self, artists):
+
+        self.canvas.drawing.begin_animation(artists)
+
     def clear(self, grid='on'):
 
         self.canvas.drawing.clear(grid)
 
+    def end_animation(self):
+
+        self.canvas.drawing.end_animation()
+
     def display(self):
 
+        # Start the workers for background analyses once idle.
+        self.after_idle(self.jobs.start)
         self.mainloop()
 
     def enter(self, canvas):
@@ -274,7 +314,8 @@ class LcapyTk(Tk):
         drawing = Drawing(self, fig, model, self.debug)
         canvas.drawing = drawing
         canvas.tab = tab
-        canvas.sketcher = Sketcher(canvas.drawing.ax, self.debug)
+        canvas.sketcher = Sketcher(canvas.drawing.ax, self.debug,
+                                   batch=self.sketcher_batch)
 
         tab.canvas = canvas
 
@@ -304,6 +345,9 @@ class LcapyTk(Tk):
         canvas.md_id = figure.canvas.mpl_connect('motion_notify_event',
                                                  self.on_mouse_event)
 
+        canvas.br_id = figure.canvas.mpl_connect('button_release_event',
+                                                 self.on_release_event)
+
         self.enter(canvas)
 
         return canvas
@@ -475,6 +519,10 @@ class LcapyTk(Tk):
 
         self.model.on_inspect_voltage()
 
+    def on_job_error(self, job, error):
+
+        self.show_error_dialog('%s failed: %s' % (job.description, error))
+
     def on_key_press_event(self, event):
 
         key = event.key
@@ -528,6 +576,10 @@ class LcapyTk(Tk):
 
         self.model.on_mesh_equations()
 
+    def on_monte_carlo(self, *args):
+
+        self.show_monte_carlo_dialog()
+
     def on_mouse_event(self, event):
 
         if self.debug:
@@ -538,6 +590,15 @@ class LcapyTk(Tk):
         if event.button == 1:
             self.model.on_mouse_drag(event.xdata, event.ydata)
 
+    def on_release_event(self, event):
+
+        if self.debug:
+            print('release: button=%d, x=%d, y=%d' %
+                  (event.button, event.x, event.y))
+
+        if event.button == 1:
+            self.model.on_mouse_release(event.xdata, event.ydata)
+
     def on_netlist(self, *args):
 
         self.model.on_netlist()
@@ -586,6 +647,10 @@ class LcapyTk(Tk):
 
         self.model.on_simple_netlist()
 
+    def on_sweep(self, *args):
+
+        self.show_sweep_dialog()
+
     def on_tab_selected(self, event):
 
         notebook = event.widget
@@ -612,10 +677,49 @@ class LcapyTk(Tk):
 
         self.canvas.drawing.refresh()
 
+    def poll_jobs(self):
+
+        active = True
+        try:
+            active = self.jobs.poll() > 0
+
+            for dialog in list(self.working_dialogs):
+                if dialog.job.active:
+                    dialog.refresh()
+                else:
+                    self.working_dialogs.remove(dialog)
+                    if dialog.winfo_exists():
+                        dialog.on_close()
+        finally:
+            # Keep polling even if something failed so that the
+            # working dialogs of later jobs are closed.
+            self.polling_jobs = False
+            if active:
+                self.start_polling_jobs()
+
     def quit(self):
 
+        self.jobs.shutdown()
         exit()
 
+    def run_job(self, description, func, args=(), on_done=None,
+                on_error=None):
+        """Run func(*args) in a worker process showing its progress.
+        on_done is called with the result from the event loop."""
+
+        job = self.jobs.submit(func, *args, description=description,
+                               on_done=on_done, on_error=on_error)
+        self.show_working_dialog(job)
+        self.start_polling_jobs()
+        return job
+
+    def start_polling_jobs(self):
+        """Poll the job scheduler until there are no active jobs."""
+
+        if not self.polling_jobs:
+            self.polling_jobs = True
+            self.after(self.job_poll_interval, self.poll_jobs)
+
     def save(self, pathname):
 
         name = basename(pathname)
@@ -663,11 +767,11 @@ class LcapyTk(Tk):
 
         showerror('', message)
 
-    def show_expr_dialog(self, expr, title=''):
+    def show_expr_dialog(self, expr, title='', numeric=None):
 
         from .expr_dialog import ExprDialog
 
-        self.expr_dialog = ExprDialog(expr, self, title)
+        self.expr_dialog = ExprDialog(expr, self, title, numeric)
         return self.expr_dialog
 
     def show_expr_attributes_dialog(self, expr, title=''):
@@ -723,6 +827,14 @@ class LcapyTk(Tk):
 
         self.message_dialog = MessageDialog(message, title)
 
+    def show_monte_carlo_dialog(self):
+
+        from .monte_carlo_dialog import MonteCarloDialog
+
+        if not MonteCarloDialog.check(self):
+            return
+        self.monte_carlo_dialog = MonteCarloDialog(self)
+
     def show_multiplot_dialog(self):
 
         from .multiplot_dialog import MultiplotDialog
@@ -740,11 +852,12 @@ class LcapyTk(Tk):
             dialog = NodePropertiesDialog(self, node, on_changed, title)
             self.dialogs[name] = dialog
 
-    def show_plot_properties_dialog(self, expr):
+    def show_plot_properties_dialog(self, expr, numeric=None):
 
         from .plot_properties_dialog import PlotPropertiesDialog
 
-        self.plot_properties_dialog = PlotPropertiesDialog(expr, self)
+        self.plot_properties_dialog = PlotPropertiesDialog(expr, self,
+                                                           numeric)
 
     def show_preferences_dialog(self, on_changed=None):
 
@@ -758,12 +871,13 @@ class LcapyTk(Tk):
 
         self.python_dialog = PythonDialog(expr, self)
 
-    def show_working_dialog(self, expr):
+    def show_working_dialog(self, job):
 
         from .working_dialog import WorkingDialog
 
-        self.working_dialog = WorkingDialog(expr, self)
-        return self.working_dialog
+        dialog = WorkingDialog(job, self)
+        self.working_dialogs.append(dialog)
+        return dialog
 
     def show_state_space_dialog(self, cpt):
 
@@ -777,6 +891,14 @@ class LcapyTk(Tk):
 
         self.subs_dialog = SubsDialog(expr, self, title)
 
+    def show_sweep_dialog(self):
+
+        from .sweep_dialog import SweepDialog
+
+        if not SweepDialog.check(self):
+            return
+        self.sweep_dialog = SweepDialog(self)
+
     def show_transfer_function_dialog(self, cpt):
 
         from .transfer_function_dialog import TransferFunctionDialog
@@ -2,7 +2,7 @@ from matplotlib.pyplot import subplots, rcParams, show
 from matplotlib.backend_tools import ToolBase
 from numpy import arange
 from sys import exit
-from .sketcher import Layer
+from ..sketcher import Layer
 
 
 class Tool(ToolBase):
@@ -224,11 +224,26 @@ class LcapyTkM:
 
         exit()
 
-    def show_expr_dialog(self, expr, title=''):
+    def run_job(self, description, func, args=(), on_done=None,
+                on_error=None):
+        """Run func(*args) synchronously; there is no event loop here
+        to deliver results from a worker process."""
+
+        try:
+            result = func(*args)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return
+        if on_done is not None:
+            on_done(result)
+
+    def show_expr_dialog(self, expr, title='', numeric=None):
 
         from .expr_dialog import ExprDialog
 
-        self.expr_dialog = ExprDialog(expr, self, title)
+        self.expr_dialog = ExprDialog(expr, self, title, numeric)
 
     def show_inspect_dialog(self, cpt, title=''):
 
@@ -250,11 +265,12 @@ class LcapyTkM:
         self.node_properties_dialog = NodePropertiesDialog(node,
                                                            on_changed, title)
 
-    def show_plot_properties_dialog(self, expr):
+    def show_plot_properties_dialog(self, expr, numeric=None):
 
         from .plot_properties_dialog import PlotPropertiesDialog
 
-        self.plot_properties_dialog = PlotPropertiesDialog(expr, self)
+        self.plot_properties_dialog = PlotPropertiesDialog(expr, self,
+                                                           numeric)
 
     def show_preferences_dialog(self, on_changed=None):
 
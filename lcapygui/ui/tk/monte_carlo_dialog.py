@@ -0,0 +1,82 @@
+from lcapy import Circuit
+from .labelentries import LabelEntry
+from .sweep_dialog import SweepDialog
+from ...monte_carlo import (MonteCarlo, Tolerance, nominal_values,
+                            toleranced_netlist)
+
+
+class MonteCarloDialog(SweepDialog):
+    """Monte Carlo tolerance analysis.  Each component value or symbol
+    is specified by a nominal value, an optional tolerance, and an
+    optional distribution (uniform or normal), say `1e3 5%` or
+    `1e-6 10% normal`.  After the analysis, the percentile envelope
+    and a histogram at the chosen time or frequency are plotted."""
+
+    def __init__(self, ui, title='Monte Carlo analysis'):
+
+        self.nominal = nominal_values(ui.model.circuit)
+
+        super(MonteCarloDialog, self).__init__(ui, title)
+
+    def parameter_entries(self):
+
+        entries = []
+        for key, value in self.nominal.items():
+            entries.append(LabelEntry(key, key, '%g 5%%' % value))
+        for key in self.symbols:
+            entries.append(LabelEntry(key, key, ''))
+        return entries
+
+    def extra_entries(self):
+
+        return [LabelEntry('samples', 'Samples', 1000),
+                LabelEntry('seed', 'Seed', 0),
+                LabelEntry('point', 'Histogram at', 1e-3)]
+
+    def parse_option(self, name, cls, minimum):
+
+        text = self.labelentries.get_text(name)
+        try:
+            value = cls(text)
+        except (TypeError, ValueError):
+            raise ValueError('Bad value %s for %s' % (text, name))
+        if value < minimum:
+            raise ValueError('Bad value %s for %s, must be at least %s' %
+                             (text, name, minimum))
+        return value
+
+    def parse_parameters(self):
+        """Return dictionary of the tolerances for each component value
+        or symbol.  This also checks the number of samples, seed, and
+        histogram point."""
+
+        tolerances = {}
+        for key in list(self.nominal) + list(self.symbols):
+            try:
+                tolerances[key] = Tolerance.parse(
+                    self.labelentries.get_text(key) or '')
+            except ValueError as e:
+                raise ValueError('Bad tolerance for %s: %s' % (key, e))
+
+        self.num_samples = self.parse_option('samples', int, 1)
+        self.seed = self.parse_option('seed', int, 0)
+        self.point = self.parse_option('point', float, 0)
+        return tolerances
+
+    def analysis_circuit(self, parameters):
+
+        return Circuit(toleranced_netlist(self.circuit, self.nominal))
+
+    def choose_pathname(self):
+
+        return None
+
+    def make_sweep(self, expr, parameters, points, pathname):
+
+        return MonteCarlo(expr, parameters, self.num_samples, points,
+                          self.seed, pathname)
+
+    def on_sweep_done(self, sweep):
+
+        sweep.plot_envelope().figure.show()
+        sweep.plot_histogram(self.point).figure.show()
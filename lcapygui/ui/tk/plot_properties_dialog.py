@@ -1,16 +1,20 @@
 from tkinter import Button
-from numpy import linspace
+from numpy import linspace, angle, log10, unwrap
+from numpy.linalg import LinAlgError
 from .labelentries import LabelEntry, LabelEntries
 from .window import Window
+from ...evaluate import evaluate
 
 
-class PlotPropertiesDialog:
+class PlotPropertiesDialog(Window):
 
-    def __init__(self, expr, ui):
+    def __init__(self, expr, ui, numeric=None):
 
         super().__init__(ui, None, 'Plot properties')
 
         self.expr = expr
+        # Numeric version of expr for fast frequency response plots.
+        self.numeric = numeric
 
         entries = [LabelEntry('min', 'Min', 0.0),
                    LabelEntry('max', 'Max', 1.0),
@@ -33,6 +37,11 @@ class PlotPropertiesDialog:
                 kinds.append(key)
 
         entries.append(LabelEntry('kind', 'Plot type', 'Plot', kinds))
+
+        if numeric is not None:
+            entries.append(LabelEntry('engine', 'Engine', 'Numeric',
+                                      ['Numeric', 'Symbolic']))
+
         self.labelentries = LabelEntries(self, ui, entries)
 
         button = Button(self, text="Plot", command=self.on_update)
@@ -53,9 +62,28 @@ class PlotPropertiesDialog:
             val = self.labelentries.get(key)
             defs[key] = val
 
+        kind = self.labelentries.get('kind')
+
+        if (self.numeric is not None and
+                self.labelentries.get('engine') == 'Numeric' and
+                kind in ('Bode', 'Nichols', 'Nyquist')):
+            try:
+                self.plot_numeric(kind, points, defs)
+                return
+            except (ValueError, ZeroDivisionError, LinAlgError):
+                # Say for a component value that is not numeric or a
+                # singular circuit.
+                pass
+
+        if kind == 'Plot':
+            try:
+                self.plot_vectorised(points, defs)
+                return
+            except ValueError:
+                pass
+
         expr = self.expr.subs(defs)
 
-        kind = self.labelentries.get('kind')
         if kind == 'Plot':
             im = expr.plot(points)
         elif kind == 'Bode':
@@ -73,3 +101,61 @@ class PlotPropertiesDialog:
             im = im[0]
 
         im.figure.show()
+
+    def plot_numeric(self, kind, f, defs):
+        """Plot frequency response using numeric MNA; this raises
+        ValueError if the circuit cannot be analysed numerically."""
+
+        from matplotlib.pyplot import subplots
+
+        if kind in ('Bode', 'Nichols'):
+            # Logarithmic frequency axis; skip DC.
+            f = f[f > 0]
+        H = self.numeric.frequency_response(f, defs)
+
+        dB = 20 * log10(abs(H))
+        phase = unwrap(angle(H))
+
+        fig, ax = subplots()
+        if kind == 'Bode':
+            ax.semilogx(f, dB)
+            ax.set_xlabel('Frequency (Hz)')
+            ax.set_ylabel('Magnitude (dB)')
+            ax2 = ax.twinx()
+            ax2.semilogx(f, phase, linestyle='--')
+            ax2.set_ylabel('Phase (radians)')
+        elif kind == 'Nichols':
+            ax.plot(phase, dB)
+            ax.set_xlabel('Phase (radians)')
+            ax.set_ylabel('Magnitude (dB)')
+        elif kind == 'Nyquist':
+            ax.plot(H.real, H.imag)
+            ax.plot(H.real, -H.imag, linestyle='--')
+            ax.set_xlabel('Real')
+            ax.set_ylabel('Imaginary')
+            ax.axis('equal')
+        ax.grid(True)
+        fig.show()
+
+    def plot_vectorised(self, points, defs):
+        """Plot real time or frequency domain expression using a compiled
+        function; this raises ValueError for other expressions."""
+
+        from matplotlib.pyplot import subplots
+
+        expr = self.expr
+        if not (expr.is_time_domain or expr.is_fourier_domain or
+                expr.is_angular_fourier_domain):
+            raise ValueError('Unhandled domain')
+
+        v = evaluate(expr, points, defs)
+        if v.dtype == complex:
+            raise ValueError('Complex expression')
+
+        fig, ax = subplots()
+        ax.plot(points, v)
+        ax.set_xlabel(expr.domain_label_with_units)
+        if expr.label_with_units:
+            ax.set_ylabel(expr.label_with_units)
+        ax.grid(True)
+        fig.show()
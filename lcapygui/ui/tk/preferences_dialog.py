@@ -59,6 +59,20 @@ class PreferencesDialog(Window):
                               self.model.preferences.snap_grid,
                               ('true', 'false'),
                               command=self.on_update),
+                   LabelEntry('renderer', 'Expression renderer',
+                              self.model.preferences.renderer,
+                              ('mathtext', 'latex'),
+                              command=self.on_update),
+                   LabelEntry('history_max_events', 'Undo events',
+                              self.model.preferences.history_max_events,
+                              command=self.on_update),
+                   LabelEntry('history_max_bytes', 'Undo memory (bytes)',
+                              self.model.preferences.history_max_bytes,
+                              command=self.on_update),
+                   LabelEntry('history_coalesce_time',
+                              'Merge moves within (s)',
+                              self.model.preferences.history_coalesce_time,
+                              command=self.on_update),
                    ]
 
         self.labelentries = LabelEntries(self, ui, entries)
@@ -86,6 +100,17 @@ class PreferencesDialog(Window):
         self.model.preferences.xsize = self.labelentries.get('xsize')
         self.model.preferences.ysize = self.labelentries.get('ysize')
         self.model.preferences.snap_grid = self.labelentries.get('snap_grid')
+        self.model.preferences.renderer = self.labelentries.get('renderer')
+
+        for key in ('history_max_events', 'history_max_bytes',
+                    'history_coalesce_time'):
+            value = self.labelentries.get(key)
+            if value is not None:
+                setattr(self.model.preferences, key, value)
+        self.model.history.set_limits(
+            self.model.preferences.history_max_events,
+            self.model.preferences.history_max_bytes,
+            self.model.preferences.history_coalesce_time)
 
         # Do not set show_units; this needs fixing in Lcapy since
         # str(expr) includes the units and this causes problems...
@@ -0,0 +1,212 @@
+from tkinter import Button, Label
+from .labelentries import LabelEntry, LabelEntries
+from .menu import MenuDropdown, MenuItem
+from .window import Window
+from .edit_values_dialog import undefined_symbols
+from ... import analysis
+from ...sweep import Sweep, make_grid, parse_values, load_values
+
+
+class SweepDialog(Window):
+    """Sweep a node voltage or transfer function over the values of the
+    undefined symbols in the circuit.  The values for each symbol are
+    a list, say `1, 2, 5`, or a range `start:stop:num` or
+    `start:stop:num:log`."""
+
+    refresh_interval = 200
+
+    def __init__(self, ui, title='Parameter sweep'):
+
+        super(SweepDialog, self).__init__(ui, None, title)
+
+        self.circuit = ui.model.circuit
+        try:
+            self.symbols = self.circuit.undefined_symbols
+        except AttributeError:
+            # Older versions of Lcapy
+            self.symbols = undefined_symbols(self.circuit)
+
+        self.sweep = None
+
+        menudropdowns = [
+            MenuDropdown('File', 0,
+                         [MenuItem('Load', self.on_load),
+                          ])]
+
+        self.add_menu(menudropdowns)
+
+        nodes, names = self.choices(self.circuit)
+
+        entries = self.parameter_entries()
+
+        entries.append(LabelEntry('quantity', 'Quantity', 'Node voltage',
+                                  ['Node voltage', 'Transfer function']))
+        entries.append(LabelEntry('node', 'Node', nodes[0], nodes))
+        entries.append(LabelEntry('input', 'Input', names[0], names))
+        entries.append(LabelEntry('output', 'Output', names[-1], names))
+        entries.append(LabelEntry('kind', 'Kind', 'Voltage ratio',
+                                  ['Voltage ratio', 'Current ratio',
+                                   'Transimpedance',
+                                   'Transadmittance']))
+        entries.append(LabelEntry('times', 'Times', '0:1e-3:11'))
+        entries.append(LabelEntry('frequencies', 'Frequencies',
+                                  '1:1e6:61:log'))
+        entries.extend(self.extra_entries())
+
+        self.labelentries = LabelEntries(self, ui, entries)
+
+        self.message_label = Label(self, text='')
+        self.message_label.grid(row=self.labelentries.row, columnspan=2)
+
+        button = Button(self, text="Run", command=self.on_run)
+        button.grid(row=self.labelentries.row + 1)
+
+    @classmethod
+    def check(cls, ui):
+        """Return True if the circuit can be swept; otherwise show
+        why not."""
+
+        nodes, names = cls.choices(ui.model.circuit)
+        if nodes == [] or names == []:
+            ui.show_info_dialog('Need a node and a component other than '
+                                'a source or wire')
+            return False
+        return True
+
+    @staticmethod
+    def choices(circuit):
+        """Return lists of the nodes and components that can be
+        chosen."""
+
+        nodes = [name for name in circuit.nodes if name != '0']
+        names = [elt.name for elt in circuit.elements.values()
+                 if elt.type not in ('W', 'O', 'V', 'I')]
+        return nodes, names
+
+    def on_load(self, arg):
+
+        pathname = self.ui.open_file_dialog(doc='Definitions', ext='.csv')
+        if pathname == '' or pathname == ():
+            return
+
+        for key, val in load_values(pathname).items():
+            if key in self.labelentries:
+                self.labelentries.get_var(key).set(val)
+
+    def parameter_entries(self):
+
+        return [LabelEntry(key, key, '') for key in self.symbols]
+
+    def extra_entries(self):
+
+        return []
+
+    def parse_parameters(self):
+        """Return dictionary of the values for each symbol."""
+
+        values = {}
+        for key in self.symbols:
+            try:
+                values[key] = parse_values(self.labelentries.get_text(key))
+            except ValueError as e:
+                raise ValueError('Bad values for %s: %s' % (key, e))
+        return values
+
+    def analysis_circuit(self, parameters):
+
+        return self.circuit
+
+    def choose_pathname(self):
+        """Return filename for the results, '' to abandon the sweep, or
+        None to keep the results in memory."""
+
+        pathname = self.ui.save_file_dialog('sweep.csv',
+                                            doc='Sweep results',
+                                            ext='.csv')
+        if pathname == ():
+            return ''
+        return pathname
+
+    def make_sweep(self, expr, parameters, points, pathname):
+
+        return Sweep(expr, list(parameters), make_grid(parameters),
+                     points, pathname)
+
+    def on_run(self):
+
+        if self.sweep is not None and not self.sweep.finished:
+            self.ui.show_error_dialog('Sweep in progress')
+            return
+
+        try:
+            parameters = self.parse_parameters()
+        except ValueError as e:
+            self.ui.show_error_dialog(str(e))
+            return
+
+        quantity = self.labelentries.get('quantity')
+        if quantity == 'Node voltage':
+            node = self.labelentries.get('node')
+            func, args = analysis.quantity, (node, 'v')
+            points = parse_values(self.labelentries.get_text('times'))
+        else:
+            func = analysis.transfer_function
+            args = (self.labelentries.get('input'),
+                    self.labelentries.get('output'),
+                    self.labelentries.get('kind'))
+            points = parse_values(self.labelentries.get_text('frequencies'))
+
+        pathname = self.choose_pathname()
+        if pathname == '':
+            return
+
+        def on_done(expr):
+            try:
+                self.sweep = self.make_sweep(expr, parameters, points,
+                                             pathname)
+            except ValueError as e:
+                self.ui.show_error_dialog(str(e))
+                return
+
+            jobs = getattr(self.ui, 'jobs', None)
+            self.sweep.run(jobs, on_done=self.on_sweep_done,
+                           on_error=self.on_error)
+            if jobs is not None:
+                self.ui.start_polling_jobs()
+            self.refresh()
+
+        self.ui.model.run_analysis('Solving for ' + quantity.lower(), func,
+                                   args, on_done,
+                                   cct=self.analysis_circuit(parameters))
+
+    def on_sweep_done(self, sweep):
+
+        pass
+
+    def on_error(self, error):
+
+        self.ui.show_error_dialog('Sweep failed: %s' % error)
+
+    def refresh(self):
+
+        if self.sweep is None or not self.winfo_exists():
+            return
+
+        sweep = self.sweep
+        if sweep.error is not None:
+            message = 'Failed'
+        elif sweep.finished:
+            message = 'Finished'
+            if sweep.writer.pathname is not None:
+                message = 'Written %s' % sweep.writer.pathname
+        else:
+            message = 'Evaluated %d of %d chunks' % (sweep.num_done,
+                                                     sweep.num_chunks)
+            self.after(self.refresh_interval, self.refresh)
+        self.message_label.config(text=message)
+
+    def on_close(self):
+
+        if self.sweep is not None and not self.sweep.finished:
+            self.sweep.cancel()
+        super(SweepDialog, self).on_close()
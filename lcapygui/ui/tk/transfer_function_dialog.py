@@ -1,6 +1,8 @@
 from tkinter import Button
 from .labelentries import LabelEntry, LabelEntries
 from .window import Window
+from ... import analysis
+from ...mna import NumericTransferFunction
 
 
 class TransferFunctionDialog(Window):
@@ -39,23 +41,15 @@ class TransferFunctionDialog(Window):
         output_cpt = self.labelentries.get('output')
         kind = self.labelentries.get('kind')
 
-        # Remove independent sources
-        cct = self.ui.model.circuit
-        cct = cct.copy()
-        values = list(cct.elements.values())
-        for cpt in values:
-            if cpt.is_independent_source:
-                cct.remove(cpt.name)
-
-        if kind == 'Voltage ratio':
-            H = cct.voltage_gain(input_cpt, output_cpt)
-        elif kind == 'Current ratio':
-            H = cct.current_gain(input_cpt, output_cpt)
-        elif kind == 'Transimpedance':
-            H = cct.transimpedance(input_cpt, output_cpt)
-        elif kind == 'Transadmittance':
-            H = cct.transadmittance(input_cpt, output_cpt)
-        else:
-            raise ValueError('Unknown kind')
-
-        self.ui.show_expr_dialog(H, kind)
+        model = self.ui.model
+
+        numeric = NumericTransferFunction(model.circuit.netlist(),
+                                          input_cpt, output_cpt, kind)
+
+        def on_done(H):
+            self.ui.show_expr_dialog(H, kind, numeric)
+
+        model.run_analysis('Calculating ' + kind.lower(),
+                           analysis.transfer_function,
+                           (input_cpt, output_cpt, kind), on_done,
+                           cct=model.circuit)
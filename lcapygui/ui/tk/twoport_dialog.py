@@ -1,6 +1,7 @@
 from tkinter import Button
 from .labelentries import LabelEntry, LabelEntries
 from .window import Window
+from ... import analysis
 
 
 class TwoportDialog(Window):
@@ -37,15 +38,12 @@ class TwoportDialog(Window):
         input_cpt = self.labelentries.get('input')
         output_cpt = self.labelentries.get('output')
 
-        # Remove independent sources
-        cct = self.ui.model.circuit
-        cct = cct.copy()
-        values = list(cct.elements.values())
-        for cpt in values:
-            if cpt.is_independent_source:
-                cct.remove(cpt.name)
+        model = self.ui.model
 
-        # Warn that might be slow
-        A = cct.twoport(input_cpt, output_cpt, model=self.kind)
+        def on_done(A):
+            self.ui.show_twoport_select_dialog(A, self.kind)
 
-        self.ui.show_twoport_select_dialog(A, self.kind)
+        # This can be slow so run in the background.
+        model.run_analysis('Calculating twoport', analysis.twoport,
+                           (input_cpt, output_cpt, self.kind), on_done,
+                           cct=model.circuit)
@@ -1,20 +1,45 @@
-from tkinter.messagebox import showinfo
+from tkinter import Button, Label
+from tkinter.ttk import Progressbar
 from .window import Window
 
 
 class WorkingDialog(Window):
+    """Non-modal dialog showing the progress of a background job with
+    a button to cancel it."""
 
-    def __init__(self, message, title=''):
+    def __init__(self, job, ui, title=''):
 
-        if False:
-            # Need to make this non-modal
-            super().__init__(None, None, title)
+        super().__init__(ui, None, title or job.description)
 
-            showinfo('', message)
+        self.job = job
 
-        # Marvellous if could display warning messages here...
+        self.description_label = Label(self, text=job.description)
+        self.description_label.pack(padx=10, pady=5)
 
-    def destroy(self):
+        self.progressbar = Progressbar(self, mode='indeterminate',
+                                       length=250)
+        self.progressbar.pack(padx=10)
+        self.progressbar.start()
 
-        if False:
-            self.on_close()
+        self.message_label = Label(self, text='')
+        self.message_label.pack(padx=10, pady=5)
+
+        button = Button(self, text='Cancel', command=self.on_cancel)
+        button.pack(pady=5)
+
+        self.refresh()
+
+    def refresh(self):
+
+        self.message_label.config(text='%s (%.0f s)' %
+                                  (self.job.message, self.job.elapsed))
+
+    def on_cancel(self):
+
+        self.on_close()
+
+    def on_close(self):
+
+        self.job.cancel()
+        self.progressbar.stop()
+        super().on_close()
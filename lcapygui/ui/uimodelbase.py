@@ -3,16 +3,21 @@ from ..annotations import Annotations
 from .preferences import Preferences
 from ..components.opamp import Opamp
 from ..components.cpt_maker import cpt_make_from_cpt, cpt_make_from_type
+from .history import History
 from .history_event import HistoryEvent
+from .spatial_index import SpatialIndex
+from .name_index import NameIndex
+from .. import analysis
+from ..analysis_cache import AnalysisCache
 
 from copy import copy
+from time import monotonic
+from weakref import WeakKeyDictionary
 from math import atan2, degrees, sqrt
-from numpy import nan, isnan
-from lcapy import Circuit, expr
-from lcapy.mnacpts import Cpt
-from lcapy.nodes import parse_nodes
-from lcapy.schemmisc import Pos
-from lcapy.opts import Opts
+from numpy import array, nan, isnan
+
+# Lcapy (and thus SymPy) is imported when first needed since it is
+# slow to import.
 
 
 class UIModelBase:
@@ -68,19 +73,34 @@ class UIModelBase:
 
     def __init__(self, ui):
 
+        from lcapy import Circuit
+
         self.circuit = Circuit()
         self.ui = ui
         self._analysis_circuit = None
+        self.analysis_cache = AnalysisCache()
         self.pathname = ''
         self.voltage_annotations = Annotations()
         self.selected = None
+        # Names of the components selected as a group (a dict to keep
+        # the order)
+        self.selection = {}
         self.last_expr = None
         self.preferences = Preferences()
         self.dirty = False
-        self.history = []
+        self.history = History(self.preferences.history_max_events,
+                               self.preferences.history_max_bytes,
+                               self.preferences.history_coalesce_time)
         self.clipboard = None
         self.select_pos = 0, 0
         self.dragged = False
+        self.spatial_index = SpatialIndex()
+        self.cpt_names = NameIndex(self.circuit.elements)
+        self.node_names = NameIndex(self.circuit.nodes)
+        # Names of components that need redrawing
+        self.dirty_cpts = set()
+        # State of each component when last drawn, keyed by gcpt
+        self.cpt_states = WeakKeyDictionary()
 
     @property
     def analysis_circuit(self):
@@ -111,6 +131,19 @@ class UIModelBase:
 
         return self._analysis_circuit
 
+    @property
+    def sketcher(self):
+        """The sketcher used to draw the components.  This is provided by
+        the user interface; see headless.py for user interfaces that do
+        not need a display."""
+
+        return self.ui.sketcher
+
+    @property
+    def sketchlib(self):
+
+        return self.ui.sketchlib
+
     def bounding_box(self):
 
         if len(self.circuit.nodes) == 0:
@@ -136,12 +169,7 @@ class UIModelBase:
         if cpt_type in ('opamp', 'fdopamp', 'inamp'):
             cpt_type = 'E'
 
-        num = 1
-        while True:
-            name = cpt_type + str(num)
-            if name not in self.circuit.elements:
-                return name
-            num += 1
+        return self.cpt_names.choose(cpt_type)
 
     def con_create(self, con_key, x1, y1, x2, y2):
         """Create a new connection."""
@@ -156,13 +184,36 @@ class UIModelBase:
 
         return self.thing_create(cpt_type, x1, y1, x2, y2, kind='-' + con_key)
 
-    def copy(self, cpt):
+    def circuit_add(self, netlist, names):
+        """Add the components `names` defined by `netlist` to the
+        circuit in one pass.  If this fails, none are added."""
+
+        try:
+            self.circuit.add(netlist)
+        except Exception:
+            for name in names:
+                if name in self.circuit.elements:
+                    self.circuit.remove(name)
+            raise
+        self.invalidate()
 
-        self.clipboard = cpt
+    def copy(self, cpts):
+        """Copy the component or list of components `cpts` to the
+        clipboard.  The node names and positions are saved so that the
+        components can be pasted after they are moved or deleted."""
+
+        if not isinstance(cpts, list):
+            cpts = [cpts]
+
+        self.clipboard = [(cpt, [node.name for node in cpt.nodes],
+                           [(node.x, node.y) for node in cpt.nodes])
+                          for cpt in cpts]
 
     @property
     def cpt_selected(self):
 
+        from lcapy.mnacpts import Cpt
+
         return isinstance(self.selected, Cpt)
 
     def cpt_create(self, cpt_key, x1, y1, x2, y2):
@@ -185,22 +236,100 @@ class UIModelBase:
 
     def cpt_delete(self, cpt):
 
+        self.cpts_delete([cpt])
+
+    def cpt_netline(self, cpt):
+        """Return the netlist line for the component.  Unlike str(cpt),
+        this names anonymous components, say wires, so that they can
+        be added again with the same name."""
+
+        parts = str(cpt).split(' ', 1)
+        parts[0] = cpt.name
+        return ' '.join(parts)
+
+    def cpts_add(self, netlist, names, positions):
+        """Add the components `names` defined by `netlist`, with the
+        node positions given by the dictionary `positions` keyed by
+        node name, and mark them as needing to be drawn.  This returns
+        the list of new components."""
+
+        from lcapy.schemmisc import Pos
+
+        self.circuit_add(netlist, names)
+
+        cpts = []
+        for name in names:
+            cpt = self.circuit.elements[name]
+            for node in cpt.nodes:
+                position = positions.get(node.name)
+                if position is not None:
+                    node.pos = Pos(float(position[0]), float(position[1]))
+            try:
+                cpt.gcpt = cpt_make_from_cpt(cpt)
+            except Exception as e:
+                cpt.gcpt = None
+                self.exception(e)
+                continue
+
+            self.index_cpt(cpt)
+            self.mark_dirty_nodes(cpt.nodes)
+            cpts.append(cpt)
+        return cpts
+
+    def cpts_delete(self, cpts):
+        """Delete the list of components `cpts` with a single redraw."""
+
         self.select(None)
+        self.select_group([])
 
-        redraw = True
-        try:
-            # This should also delete the annotations.
-            cpt.undraw()
-            redraw = False
-        except AttributeError:
-            pass
+        nodes = []
+        for cpt in cpts:
+            # This also deletes the annotations.
+            self.cpt_undraw(cpt)
 
-        self.circuit.remove(cpt.name)
+            self.circuit.remove(cpt.name)
+            self.cpt_names.release(cpt.name)
+            self.unindex_cpt(cpt)
+            nodes.extend(cpt.nodes)
         self.invalidate()
 
-        if redraw:
-            self.ui.clear()
-            self.redraw()
+        # The node markers of the neighbouring components may change.
+        self.mark_dirty_nodes(nodes)
+        self.redraw_dirty()
+
+    def cpts_nodes(self, cpts):
+        """Return list of the nodes of the components `cpts` without
+        duplicates."""
+
+        nodes = {}
+        for cpt in cpts:
+            for node in cpt.nodes:
+                if node.pos is not None:
+                    nodes[node.name] = node
+        return list(nodes.values())
+
+    def cpts_within(self, xmin, ymin, xmax, ymax):
+        """Return list of the components with all their nodes within
+        the rectangle (xmin, ymin, xmax, ymax)."""
+
+        def within(node):
+            return (node.pos is not None and xmin <= node.x <= xmax and
+                    ymin <= node.y <= ymax)
+
+        cpts = {}
+        for name in self.spatial_index.nodes_in(xmin, ymin, xmax, ymax):
+            node = self.circuit.nodes.get(name)
+            if node is None or not within(node):
+                continue
+            for cpt in node.connected:
+                if (cpt.name not in cpts and
+                        getattr(cpt, 'gcpt', None) is not None and
+                        all(within(node) for node in cpt.nodes)):
+                    cpts[cpt.name] = cpt
+
+        # Keep the netlist order.
+        elements = self.circuit.elements
+        return [cpt for name, cpt in elements.items() if name in cpts]
 
     def cpt_draw(self, cpt, **kwargs):
 
@@ -208,6 +337,11 @@ class UIModelBase:
         if gcpt is None:
             return
 
+        self.cpt_undraw(cpt)
+        self.dirty_cpts.discard(cpt.name)
+
+        self.sketcher.begin_group(gcpt)
+
         gcpt.draw(self, **kwargs)
 
         label_cpts = self.preferences.label_cpts
@@ -231,6 +365,8 @@ class UIModelBase:
             value = ''
             value_latex = ''
         else:
+            from lcapy import expr
+
             value_latex = '$' + expr(value).latex() + '$'
 
         label = ''
@@ -285,6 +421,26 @@ class UIModelBase:
                 ann.draw(fontsize=18)
                 gcpt.annotations.append(ann)
 
+        gcpt.artists = self.sketcher.end_group()
+        self.cpt_states[gcpt] = self.cpt_state(cpt)
+
+    def cpt_undraw(self, cpt):
+        """Remove the artists used to draw the component."""
+
+        gcpt = cpt.gcpt
+        if gcpt is None:
+            return
+
+        for artist in gcpt.artists:
+            try:
+                artist.remove()
+            except (NotImplementedError, ValueError):
+                # Artist already removed by clearing the axes.
+                pass
+        gcpt.artists = []
+        gcpt.annotations = []
+        self.sketcher.remove_group(gcpt)
+
     def cpt_find(self, node_name1, node_name2):
 
         fcpt = None
@@ -326,6 +482,7 @@ class UIModelBase:
             except Exception:
                 self.exception('Cannot change name for %s' % cpt.name)
                 return
+            self.cpt_names.release(cpt.name)
 
         if gcpt.mirror ^ ('mirror' in newcpt.opts):
             # TODO, add mirror method...
@@ -346,15 +503,50 @@ class UIModelBase:
 
         newcpt.gcpt = gcpt
 
-    def cut(self, cpt):
+    def cpt_state(self, cpt):
+        """Return the topology, value, geometry, and cosmetic state of
+        a component for classifying edits."""
 
-        self.delete(cpt)
-        self.clipboard = cpt
+        gcpt = cpt.gcpt
+
+        # Mirroring swaps the nodes of opamps and transistors.
+        topology = (cpt.name, gcpt.name, gcpt.cpt_kind, gcpt.control,
+                    gcpt.mirror, gcpt.invert,
+                    tuple(node.name for node in cpt.nodes))
+        value = tuple(str(arg) for arg in cpt.args)
+        geometry = tuple((node.x, node.y) for node in gcpt.nodes)
+        cosmetic = tuple(getattr(gcpt, k) for k in gcpt.fields) + \
+            (gcpt.symbol_kind, gcpt.style)
+
+        return {'topology': topology, 'value': value,
+                'geometry': geometry, 'cosmetic': cosmetic}
+
+    def cpt_changes(self, cpt):
+        """Return set of the kinds of change ('topology', 'value',
+        'geometry', 'cosmetic') made to a component since it was last
+        drawn.  All are assumed to have changed if it has not been
+        drawn."""
+
+        new = self.cpt_state(cpt)
+        old = self.cpt_states.get(cpt.gcpt)
+        if old is None:
+            return set(new)
+        return set(k for k in new if new[k] != old[k])
+
+    def cut(self, cpts):
 
-    def delete(self, cpt):
+        self.copy(cpts)
+        self.delete(cpts)
 
-        self.cpt_delete(cpt)
-        self.history.append(HistoryEvent('D', cpt))
+    def delete(self, cpts):
+        """Delete the component or list of components `cpts` as one
+        step to undo."""
+
+        if not isinstance(cpts, list):
+            cpts = [cpts]
+
+        self.history.append(self.cpts_event('D', cpts))
+        self.cpts_delete(cpts)
 
     def draw(self, cpt, **kwargs):
 
@@ -393,6 +585,8 @@ class UIModelBase:
 
     def load_from_circuit(self, circuit):
 
+        from lcapy.nodes import parse_nodes
+
         self.circuit = circuit
         positions = None
         for cpt in self.circuit.elements.values():
@@ -423,8 +617,8 @@ class UIModelBase:
             width, height = sch.width * self.STEP, sch.height * self.STEP
 
             # Centre the schematic.
-            xsize = self.ui.canvas.drawing.xsize
-            ysize = self.ui.canvas.drawing.ysize
+            xsize = self.preferences.xsize
+            ysize = self.preferences.ysize
             offsetx, offsety = self.snap_to_grid((xsize - width) / 2,
                                                  (ysize - height) / 2)
             for node in sch.nodes.values():
@@ -448,19 +642,145 @@ class UIModelBase:
 
             cpt.gcpt = gcpt
 
+        self.reindex()
         self.invalidate()
         self.redraw()
 
+    def mark_dirty(self, cpt):
+        """Mark component as needing to be redrawn."""
+
+        if cpt is not None:
+            self.dirty_cpts.add(cpt.name)
+
+    def mark_dirty_nodes(self, nodes):
+        """Mark components connected to nodes as needing to be redrawn."""
+
+        for node in nodes:
+            for cpt in node.connected:
+                self.dirty_cpts.add(cpt.name)
+
     def move(self, xshift, yshift):
-        # TODO
-        pass
+        """Move the selected components as one step to undo."""
+
+        cpts = self.selected_cpts
+        if cpts == []:
+            return
+
+        event = self.history.append(self.move_event(cpts))
+        self.nodes_move(self.cpts_nodes(cpts), xshift, yshift)
+        self.move_done(event)
+        self.redraw_dirty()
+
+    def move_done(self, event):
+        """Save the positions of the moved nodes in the history event
+        for redo."""
+
+        nodes = self.circuit.nodes
+        event.new_positions[:] = [(nodes[name].x, nodes[name].y)
+                                  for name in event.nodes]
+        event.time = monotonic()
+
+    def move_event(self, cpts):
+        """Return history event for moving the components `cpts`.  The
+        new positions are saved by move_done() for the event returned
+        by history.append() since this may merge the move with the
+        previous one."""
+
+        nodes = self.cpts_nodes(cpts)
+        positions = array([(node.x, node.y) for node in nodes], dtype=float)
+        return HistoryEvent('M', [cpt.name for cpt in cpts],
+                            nodes=[node.name for node in nodes],
+                            positions=positions,
+                            new_positions=positions.copy())
+
+    def nodes_move(self, nodes, xshift, yshift):
+        """Move the nodes and mark the components connected to them
+        as needing to be redrawn."""
+
+        for node in nodes:
+            # TODO: handle snap
+            node.pos.x += xshift
+            node.pos.y += yshift
+
+        self.index_nodes(nodes)
+        self.mark_dirty_nodes(nodes)
 
     def paste(self, x1, y1, x2, y2):
 
-        if self.clipboard is None:
+        if not self.clipboard:
             return
 
-        return self.thing_create(self.clipboard.type, x1, y1, x2, y2)
+        if len(self.clipboard) > 1:
+            return self.paste_group(x1, y1)
+
+        return self.thing_create(self.clipboard[0][0].type, x1, y1, x2, y2)
+
+    def paste_group(self, x=None, y=None):
+        """Paste the components on the clipboard with the lower left
+        corner of their nodes at (x, y), or offset from where they
+        were copied if x is None.  The components get new names and
+        new nodes, except where a node exists at a position.  They are
+        added with a single history event and redraw and selected as a
+        group.  This returns the list of new components."""
+
+        if not self.clipboard:
+            return []
+
+        xmin = min(px for _, _, positions in self.clipboard
+                   for px, py in positions)
+        ymin = min(py for _, _, positions in self.clipboard
+                   for px, py in positions)
+        if x is None:
+            x, y = xmin + self.STEP, ymin - self.STEP
+        xshift = x - xmin
+        yshift = y - ymin
+
+        # Names of the new nodes keyed by the copied node names.
+        node_map = {}
+        positions = {}
+        names = []
+        netlist = ''
+        try:
+            for cpt, node_names, node_positions in self.clipboard:
+                name = self.choose_cpt_name(cpt.type)
+                self.cpt_names.reserve(name)
+
+                new_node_names = []
+                for node_name, (px, py) in zip(node_names, node_positions):
+                    new_name = node_map.get(node_name)
+                    if new_name is None:
+                        position = px + xshift, py + yshift
+                        node = self.node_by_position(position)
+                        if node is None:
+                            new_name = self.node_names.choose()
+                            self.node_names.reserve(new_name)
+                        else:
+                            new_name = node.name
+                        node_map[node_name] = new_name
+                        positions[new_name] = position
+                    new_node_names.append(new_name)
+
+                # A value that is the component name, say R1, names
+                # the new component.
+                args = [name if str(arg) == cpt.name else arg
+                        for arg in cpt.args]
+                netlist += cpt._netmake1(name, nodes=new_node_names,
+                                         args=args) + '\n'
+                names.append(name)
+        finally:
+            self.cpt_names.clear_reserved()
+            self.node_names.clear_reserved()
+
+        if self.ui.debug:
+            print('Pasting ' + netlist)
+
+        cpts = self.cpts_add(netlist, names, positions)
+        self.history.append(self.cpts_event('A', cpts))
+
+        self.select_group(cpts)
+        self.redraw_dirty()
+
+        return cpts
 
     def possible_control_names(self):
 
@@ -524,13 +844,14 @@ class UIModelBase:
     def thing_create(self, cpt_type, x1, y1, x2, y2, kind=''):
 
         from lcapy.mnacpts import Cpt
+        from lcapy.opts import Opts
+        from lcapy.schemmisc import Pos
 
         cpt_name = self.choose_cpt_name(cpt_type)
         gcpt = cpt_make_from_type(cpt_type, cpt_name, kind=kind)
         if gcpt is None:
             return
 
-        all_node_names = list(self.circuit.nodes)
         node_names = []
         positions = gcpt.assign_positions(x1, y1, x2, y2)
 
@@ -538,13 +859,14 @@ class UIModelBase:
             if position is None:
                 continue
 
-            node = self.circuit.nodes.by_position(position)
+            node = self.node_by_position(position)
             if node is None:
-                node_name = gcpt.choose_node_name(m, all_node_names)
-                all_node_names.append(node_name)
+                node_name = gcpt.choose_node_name(m, self.node_names)
+                self.node_names.reserve(node_name)
             else:
                 node_name = node.name
             node_names.append(node_name)
+        self.node_names.clear_reserved()
 
         netitem = gcpt.netitem(node_names, x1, y1, x2, y2, self.STEP)
 
@@ -567,100 +889,329 @@ class UIModelBase:
         # Duck type
         cpt.gcpt = gcpt
 
+        self.index_cpt(cpt)
         self.cpt_draw(cpt)
 
-        self.history.append(HistoryEvent('A', cpt))
+        self.history.append(self.cpts_event('A', [cpt]))
 
         self.select(cpt)
 
+        # The node markers of the neighbouring components may change.
+        self.mark_dirty_nodes(cpt.nodes)
+        self.dirty_cpts.discard(cpt.name)
+        self.redraw_dirty()
+
         return cpt
 
-    def inspect_admittance(self, cpt):
+    def things_create(self, records):
+        """Create many components in one pass, say for a generated
+        schematic.  Each record is (cpt_type, (x1, y1, x2, y2), attrs)
+        where the optional dictionary attrs has `kind` (as for
+        thing_create), `value` (the value as an Lcapy expression, say
+        1e4 or R1), and other component attributes such as `color`.
+        The components are added to the circuit together, with a
+        single history event and redraw.  If any record is invalid,
+        none are added.  This returns the list of new components."""
+
+        from lcapy import expr
+        from lcapy.opts import Opts
+        from lcapy.schemmisc import Pos
+
+        # Names of the nodes created in this batch, keyed by position.
+        new_nodes = {}
+        items = []
+        try:
+            for record in records:
+                cpt_type, (x1, y1, x2, y2) = record[0:2]
+                attrs = dict(record[2]) if len(record) > 2 else {}
+                kind = attrs.pop('kind', '')
+                value = attrs.pop('value', None)
+                if value is not None:
+                    try:
+                        expr(value)
+                    except Exception:
+                        raise ValueError('Invalid value %s for %s' %
+                                         (value, cpt_type))
+
+                cpt_name = self.choose_cpt_name(cpt_type)
+                gcpt = cpt_make_from_type(cpt_type, cpt_name, kind=kind)
+                if gcpt is None:
+                    raise ValueError('Unknown component type %s' % cpt_type)
+                self.cpt_names.reserve(cpt_name)
+
+                for attr, val in attrs.items():
+                    if not hasattr(gcpt, attr):
+                        raise ValueError('Unknown attribute %s for %s' %
+                                         (attr, cpt_name))
+                    setattr(gcpt, attr, val)
+
+                node_names = []
+                positions = gcpt.assign_positions(x1, y1, x2, y2)
+                for m, position in enumerate(positions):
+                    if position is None:
+                        continue
+
+                    key = self.spatial_index.point_key(*position)
+                    node_name = new_nodes.get(key)
+                    if node_name is None:
+                        node = self.node_by_position(position)
+                        if node is None:
+                            node_name = gcpt.choose_node_name(
+                                m, self.node_names)
+                            self.node_names.reserve(node_name)
+                        else:
+                            node_name = node.name
+                        new_nodes[key] = node_name
+                    node_names.append(node_name)
+
+                netitem = gcpt.netitem(node_names, x1, y1, x2, y2, self.STEP)
+                if value is not None:
+                    name_nodes, attr_string = netitem.split(';', 1)
+                    netitem = '%s %s;%s' % (name_nodes, value, attr_string)
+                items.append((gcpt, positions, netitem))
+        finally:
+            self.cpt_names.clear_reserved()
+            self.node_names.clear_reserved()
+
+        if items == []:
+            return []
+
+        if self.ui.debug:
+            print('Adding %d components' % len(items))
 
+        self.circuit_add(''.join(netitem for _, _, netitem in items),
+                         [gcpt.name for gcpt, _, _ in items])
+
+        cpts = []
         try:
-            self.last_expr = self.analysis_circuit[cpt.name].Y
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s admittance' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+            for gcpt, positions, netitem in items:
+                cpt = self.circuit.elements[gcpt.name]
+                for m, position in enumerate(positions):
+                    cpt.nodes[m].pos = Pos(position)
+
+                attr_string = netitem.split(';', 1)[1]
+                gcpt.update(nodes=cpt.nodes, opts=Opts(attr_string))
+
+                # Duck type
+                cpt.gcpt = gcpt
+
+                self.index_cpt(cpt)
+                cpts.append(cpt)
+        except Exception:
+            for gcpt, _, _ in items:
+                cpt = self.circuit.elements[gcpt.name]
+                self.circuit.remove(gcpt.name)
+                self.unindex_cpt(cpt)
+            self.invalidate()
+            raise
+
+        self.history.append(self.cpts_event('A', cpts))
+
+        self.select(None)
+
+        # Draw the new components and those whose node markers may
+        # change.
+        for cpt in cpts:
+            self.mark_dirty_nodes(cpt.nodes)
+        self.redraw_dirty()
+        self.ui.refresh()
+
+        return cpts
+
+    def index_cpt(self, cpt):
+        """Add or update component and its nodes in the spatial index."""
+
+        gcpt = cpt.gcpt
+        if gcpt is None:
+            return
+
+        try:
+            self.spatial_index.add_cpt(cpt.name, gcpt.bbox)
+        except (AttributeError, ValueError, IndexError):
+            # Component not fully defined.
+            pass
+
+        for node in cpt.nodes:
+            if node.pos is not None:
+                self.spatial_index.add_node(node.name, node.x, node.y)
+
+    def index_nodes(self, nodes):
+        """Update spatial index for moved nodes and the components
+        connected to them."""
+
+        cpts = {}
+        for node in nodes:
+            if node.pos is not None:
+                self.spatial_index.add_node(node.name, node.x, node.y)
+            for cpt in node.connected:
+                cpts[cpt.name] = cpt
+
+        for cpt in cpts.values():
+            if getattr(cpt, 'gcpt', None) is not None:
+                self.index_cpt(cpt)
+
+    def reindex(self):
+        """Rebuild spatial and name indexes from scratch."""
+
+        self.spatial_index.clear()
+        self.cpt_names = NameIndex(self.circuit.elements)
+        self.node_names = NameIndex(self.circuit.nodes)
+        for cpt in self.circuit.elements.values():
+            if getattr(cpt, 'gcpt', None) is not None:
+                self.index_cpt(cpt)
+
+    def unindex_cpt(self, cpt):
+
+        self.spatial_index.remove_cpt(cpt.name)
+        for node in cpt.nodes:
+            if node.name not in self.circuit.nodes:
+                self.spatial_index.remove_node(node.name)
+                self.node_names.release(node.name)
+
+    def cpts_event(self, code, cpts):
+        """Return history event for adding ('A') or deleting ('D') the
+        components `cpts`."""
+
+        nodes = self.cpts_nodes(cpts)
+        return HistoryEvent(code, [cpt.name for cpt in cpts],
+                            ''.join(self.cpt_netline(cpt) + '\n'
+                                    for cpt in cpts),
+                            [node.name for node in nodes],
+                            array([(node.x, node.y) for node in nodes],
+                                  dtype=float))
+
+    def inspect_admittance(self, cpt):
+
+        self.inspect_quantity(cpt.name, 'Y', '%s admittance' % cpt.name)
 
     def inspect_current(self, cpt):
 
         # TODO: FIXME for wire current
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].i
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s current' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'i', '%s current' % cpt.name)
 
     def inspect_impedance(self, cpt):
 
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].Z
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s impe' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'Z', '%s impedance' % cpt.name)
 
     def inspect_noise_current(self, cpt):
 
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].V.n
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s noise current' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'I.n',
+                              '%s noise current' % cpt.name)
 
     def inspect_noise_voltage(self, cpt):
 
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].V.n
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s noise voltage' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'V.n',
+                              '%s noise voltage' % cpt.name)
 
     def inspect_norton_admittance(self, cpt):
 
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].dpY
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s Norton admittance' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'dpY',
+                              '%s Norton admittance' % cpt.name)
+
+    def inspect_quantity(self, name, attr, title):
+        """Calculate attribute attr of the component or node name in
+        the background and show the result."""
+
+        def on_done(result):
+            self.last_expr = result
+            self.ui.show_expr_dialog(result, title)
+
+        self.run_analysis('Calculating ' + title, analysis.quantity,
+                          (name, attr), on_done)
+
+    def run_analysis(self, description, func, args=(), on_done=None,
+                     cct=None):
+        """Run analysis func(netlist, *args) for the circuit cct (default
+        the analysis circuit) in the background.  Results are cached
+        so the analysis is only repeated if the circuit changes
+        electrically."""
+
+        if cct is None:
+            cct = self.analysis_circuit
+            if cct is None:
+                return
+
+        key = self.analysis_cache.key(cct, func, args)
+        found, result = self.analysis_cache.lookup(key)
+        if found:
+            if on_done is not None:
+                on_done(result)
+            return
+
+        def on_result(result):
+            self.analysis_cache.save(key, result)
+            if on_done is not None:
+                on_done(result)
+
+        self.ui.run_job(description, func, (cct.netlist(), ) + tuple(args),
+                        on_result, self.exception)
 
     def inspect_thevenin_impedance(self, cpt):
 
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].dpZ
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s Thevenin impedance' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'dpZ',
+                              '%s Thevenin impedance' % cpt.name)
 
     def inspect_voltage(self, cpt):
 
-        try:
-            self.last_expr = self.analysis_circuit[cpt.name].v
-            self.ui.show_expr_dialog(self.last_expr,
-                                     '%s potential difference' % cpt.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(cpt.name, 'v',
+                              '%s potential difference' % cpt.name)
 
     def show_node_voltage(self, node):
 
-        try:
-            self.last_expr = self.analysis_circuit[node.name].v
-            self.ui.show_expr_dialog(self.last_expr,
-                                     'Node %s potential' % node.name)
-        except (AttributeError, ValueError, RuntimeError) as e:
-            self.exception(e)
+        self.inspect_quantity(node.name, 'v', 'Node %s potential' % node.name)
 
     def select(self, thing):
 
+        # Redraw previously and newly selected components to change
+        # their highlighting.
+        if self.cpt_selected:
+            self.mark_dirty(self.selected)
+
         self.selected = thing
 
+        if self.cpt_selected:
+            self.mark_dirty(self.selected)
+
+    def select_group(self, cpts):
+        """Select the list of components `cpts` as a group; an empty
+        list clears the group."""
+
+        self.select(None)
+
+        # Redraw to change the highlighting.
+        self.dirty_cpts.update(self.selection)
+        self.selection = dict((cpt.name, True) for cpt in cpts)
+        self.dirty_cpts.update(self.selection)
+
+    def select_names(self, names):
+        """Select the components `names`, as a group if there is more
+        than one."""
+
+        elements = self.circuit.elements
+        cpts = [elements[name] for name in names if name in elements]
+        if len(cpts) == 1:
+            self.select_group([])
+            self.select(cpts[0])
+        else:
+            self.select_group(cpts)
+
+    @property
+    def selected_cpts(self):
+        """List of the selected components.  This is the group if one
+        is selected, otherwise the selected component if any."""
+
+        if self.selection:
+            elements = self.circuit.elements
+            return [elements[name] for name in self.selection
+                    if name in elements]
+        if self.cpt_selected:
+            return [self.selected]
+        return []
+
+    def is_selected(self, cpt):
+
+        return cpt == self.selected or cpt.name in self.selection
+
     def is_close_to(self, x, xc):
 
         return abs(x - xc) < 0.3
@@ -700,6 +1251,8 @@ class UIModelBase:
 
     def view(self):
 
+        from lcapy import Circuit
+
         cct = Circuit(self.schematic())
         cct.draw()
 
@@ -725,64 +1278,104 @@ class UIModelBase:
             return
 
         if node.port:
-            self.ui.sketcher.stroke_circle(
+            self.sketcher.stroke_circle(
                 node.x, node.y, self.preferences.node_size,
                 color=self.preferences.node_color, alpha=1)
         else:
-            self.ui.sketcher.stroke_filled_circle(
+            self.sketcher.stroke_filled_circle(
                 node.x, node.y, self.preferences.node_size,
                 color=self.preferences.node_color, alpha=1)
 
-    def node_find(self, nodename):
+    def node_by_position(self, position):
+        """Return the node at `position` or None."""
 
-        for node in self.circuit.nodes.values():
-            if node.name == nodename:
+        x, y = position
+        for name in self.spatial_index.nodes_at(x, y):
+            node = self.circuit.nodes.get(name)
+            if (node is not None and node.pos is not None and
+                    abs(node.x - x) < 1e-5 and abs(node.y - y) < 1e-5):
                 return node
         return None
 
+    def node_find(self, nodename):
+
+        return self.circuit.nodes.get(nodename)
+
     def redo(self):
 
-        # TODO
-        pass
+        event = self.history.redo_event()
+        if event is None:
+            return
+        self.apply_event(event, undo=False)
 
     def redraw(self):
 
+        self.dirty_cpts.clear()
+
         for cpt in self.circuit.elements.values():
-            if cpt == self.selected:
+            if self.is_selected(cpt):
                 self.cpt_draw(cpt, color='red')
             else:
                 self.cpt_draw(cpt)
 
+        self.sketcher.flush()
+
         # Should redraw nodes on top to blank out wires on top of ports
 
+    def redraw_dirty(self):
+        """Redraw only the components marked as dirty."""
+
+        dirty_cpts = self.dirty_cpts
+        self.dirty_cpts = set()
+
+        for name in dirty_cpts:
+            cpt = self.circuit.elements.get(name)
+            if cpt is None:
+                continue
+            if self.is_selected(cpt):
+                self.cpt_draw(cpt, color='red')
+            else:
+                self.cpt_draw(cpt)
+
+        self.sketcher.flush()
+
     def undo(self):
 
-        if self.history == []:
+        event = self.history.undo_event()
+        if event is None:
             return
-        event = self.history.pop()
-        cpt = event.cpt
-        if event.code == 'D':
-            self.circuit.add(str(cpt))
-
-            # Copy node positions
-            new_cpt = self.circuit.elements[cpt.name]
-            for m, node in enumerate(cpt.nodes):
-                new_cpt.nodes[m].pos = node.pos
-            new_cpt.gcpt = cpt.gcpt
-
-            self.cpt_draw(cpt)
-            self.select(cpt)
-        elif event.code == 'M':
-
-            for node, pos in zip(cpt.nodes, event.nodes):
-                node.pos.x = pos[0]
-                node.pos.y = pos[1]
-
-            self.select(cpt)
-            self.on_redraw()
-        elif event.code == 'A':
-            self.cpt_delete(cpt)
-        else:
+        self.apply_event(event, undo=True)
+
+    def apply_event(self, event, undo):
+        """Undo or redo a history event.  Only the components and
+        nodes in the event are changed and redrawn."""
+
+        if event.code not in ('A', 'D', 'M'):
             raise RuntimeError('Unknown event code ' + event.code)
 
+        if event.code == 'M':
+            positions = event.positions if undo else event.new_positions
+            nodes = []
+            for name, (x, y) in zip(event.nodes, positions):
+                node = self.circuit.nodes.get(name)
+                if node is not None and node.pos is not None:
+                    node.pos.x = float(x)
+                    node.pos.y = float(y)
+                    nodes.append(node)
+            self.index_nodes(nodes)
+            self.mark_dirty_nodes(nodes)
+            self.select_names(event.names)
+
+        elif (event.code == 'A') == undo:
+            # Remove added components or delete again.
+            elements = self.circuit.elements
+            self.cpts_delete([elements[name] for name in event.names
+                              if name in elements])
+        else:
+            # Restore deleted components or add again.
+            positions = dict(zip(event.nodes, event.positions))
+            self.cpts_add(event.netlist, event.names, positions)
+            self.select_names(event.names)
+
         self.invalidate()
+        self.redraw_dirty()
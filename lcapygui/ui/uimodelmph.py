@@ -1,9 +1,6 @@
 from .uimodelbase import UIModelBase
-from .history_event import HistoryEvent
-from lcapy.mnacpts import Cpt
-from lcapy import Circuit
+from .. import analysis
 from os.path import basename
-from warnings import warn
 
 
 class Cursor:
@@ -12,6 +9,7 @@ class Cursor:
 
         self.sketcher = ui.sketcher
         self.patch = None
+        self.color = 'red'
         self.x = x
         self.y = y
 
@@ -22,14 +20,24 @@ class Cursor:
 
     def draw(self, color='red', radius=0.3):
 
+        self.color = color
         self.patch = self.sketcher.stroke_filled_circle(self.x, self.y,
                                                         radius,
                                                         color=color,
                                                         alpha=0.5)
 
+    def move(self, xshift, yshift):
+
+        self.remove()
+        self.x += xshift
+        self.y += yshift
+        self.draw(self.color)
+
     def remove(self):
 
-        self.patch.remove()
+        if self.patch is not None:
+            self.patch.remove()
+            self.patch = None
 
 
 class Cursors(list):
@@ -62,6 +70,14 @@ class UIModelMPH(UIModelBase):
 
         self.cursors = Cursors()
         self.node_cursor = None
+        # Sketcher batching mode to restore after dragging
+        self.drag_batch = False
+        # History event for the current drag
+        self.drag_event = None
+        # Corners (x1, y1, x2, y2) of the rubber band used to select
+        # a group and its patch
+        self.band = None
+        self.band_patch = None
 
         self.key_bindings = {
             'ctrl+c': self.on_copy,
@@ -134,30 +150,40 @@ class UIModelMPH(UIModelBase):
 
     def closest_cpt(self, x, y):
 
-        for cpt in self.circuit.elements.values():
+        # Overlapping components are chosen by the distance to their
+        # midpoint and then by name so that the choice does not depend
+        # on the order of the spatial index.
+        closest = None
+        for name in self.spatial_index.cpts_near(x, y):
+
+            cpt = self.circuit.elements.get(name)
+            if cpt is None:
+                continue
 
             gcpt = cpt.gcpt
             if gcpt is None:
                 continue
 
             if gcpt.is_within_bbox(x, y):
-                return cpt
+                midpoint = gcpt.midpoint
+                key = (midpoint.x - x)**2 + (midpoint.y - y)**2, name
+                if closest is None or key < closest[0]:
+                    closest = key, cpt
 
-        return None
+        return None if closest is None else closest[1]
 
     def closest_node(self, x, y):
 
-        for node in self.circuit.nodes.values():
-            if node.pos is None:
-                # This happens with opamps.  Node 0 is the default
-                # reference pin.
-                warn('Ignoring node %s with no position' % node.name)
+        closest = None
+        for name in self.spatial_index.nodes_near(x, y):
+            node = self.circuit.nodes.get(name)
+            if node is None or node.pos is None:
                 continue
             x1, y1 = node.pos.x, node.pos.y
             rsq = (x1 - x)**2 + (y1 - y)**2
-            if rsq < 0.1:
-                return node
-        return None
+            if rsq < 0.1 and (closest is None or (rsq, name) < closest[0]):
+                closest = (rsq, name), node
+        return None if closest is None else closest[1]
 
     def create_state_space(self, cpt):
 
@@ -298,31 +324,50 @@ class UIModelMPH(UIModelBase):
 
     def on_copy(self):
 
-        if self.selected is None:
-            return
-        if not self.cpt_selected:
+        cpts = self.selected_cpts
+        if cpts == []:
             return
 
-        self.copy(self.selected)
+        self.copy(cpts)
 
     def on_cpt_changed(self, cpt):
 
-        self.invalidate()
-        # Component name may have changed
-        self.clear()
-
-        if isinstance(cpt, Cpt):
+        from lcapy.mnacpts import Cpt
 
-            # If kind has changed need to remake the sketch
-            # and remake the cpt.
-            # If name changed need to remake the cpt.
-            self.cpt_remake(cpt)
-        else:
+        if not isinstance(cpt, Cpt):
             # Node name may have changed...
-            pass
+            self.invalidate()
+            self.mark_dirty_nodes([cpt])
+            self.reindex()
+            self.redraw_dirty()
+            self.ui.refresh()
+            return
 
-        self.redraw()
-        self.cursors.draw()
+        changes = self.cpt_changes(cpt)
+        if changes == set():
+            return
+
+        # Only electrical changes need a new analysis.
+        if 'topology' in changes or 'value' in changes:
+            self.invalidate()
+
+        # If kind has changed need to remake the sketch
+        # and remake the cpt.
+        # If name changed need to remake the cpt.
+        # Otherwise, this only updates the opts.
+        self.cpt_remake(cpt)
+        # The component name may have changed.
+        newcpt = self.circuit.elements.get(cpt.gcpt.name, cpt)
+        self.mark_dirty(newcpt)
+
+        if 'topology' in changes:
+            self.mark_dirty_nodes(newcpt.nodes)
+            self.reindex()
+        elif 'geometry' in changes:
+            self.mark_dirty_nodes(newcpt.nodes)
+            self.index_nodes(newcpt.nodes)
+
+        self.redraw_dirty()
         self.ui.refresh()
 
     def on_create_state_space(self):
@@ -339,14 +384,11 @@ class UIModelMPH(UIModelBase):
 
     def on_cut(self):
 
-        if self.selected is None:
-            return
-        if not self.cpt_selected:
+        cpts = self.selected_cpts
+        if cpts == []:
             return
 
-        self.cut(self.selected)
-
-        self.cursors.draw()
+        self.cut(cpts)
 
         self.ui.refresh()
 
@@ -361,19 +403,18 @@ class UIModelMPH(UIModelBase):
         s += self.cursors.debug() + '\n'
         s += 'Selected.........\n'
         s += str(self.selected) + '\n'
+        s += 'History..........\n'
+        s += str(self.history.stats()) + '\n'
         self.ui.show_message_dialog(s, 'Debug')
 
     def on_delete(self):
 
-        if self.selected is None:
-            return
-        if not self.cpt_selected:
-            # Handle node deletion later
+        # Handle node deletion later
+        cpts = self.selected_cpts
+        if cpts == []:
             return
 
-        self.delete(self.selected)
-
-        self.cursors.draw()
+        self.delete(cpts)
 
         self.ui.refresh()
 
@@ -427,27 +468,25 @@ class UIModelMPH(UIModelBase):
                 return
             cpt = self.selected
 
-        win = self.ui.show_working_dialog('Calculating voltage')
         self.inspect_current(cpt)
-        win.destroy()
 
-    def on_inspect_noise_current(self):
+    def on_inspect_noise_current(self, cpt=None):
 
-        if not self.selected or not self.cpt_selected:
-            return
+        if cpt is None:
+            if not self.selected or not self.cpt_selected:
+                return
+            cpt = self.selected
 
-        win = self.ui.show_working_dialog('Calculating noise current')
-        self.inspect_noise_current(self.selected)
-        win.destroy()
+        self.inspect_noise_current(cpt)
 
-    def on_inspect_noise_voltage(self):
+    def on_inspect_noise_voltage(self, cpt=None):
 
-        if not self.selected or not self.cpt_selected:
-            return
+        if cpt is None:
+            if not self.selected or not self.cpt_selected:
+                return
+            cpt = self.selected
 
-        win = self.ui.show_working_dialog('Calculating noise voltage')
-        self.inspect_noise_voltage(self.selected)
-        win.destroy()
+        self.inspect_noise_voltage(cpt)
 
     def on_inspect_norton_admittance(self, cpt=None):
 
@@ -477,9 +516,7 @@ class UIModelMPH(UIModelBase):
                 return
             cpt = self.selected
 
-        win = self.ui.show_working_dialog('Calculating voltage')
         self.inspect_voltage(cpt)
-        win.destroy()
 
     def on_laplace_model(self):
 
@@ -490,6 +527,10 @@ class UIModelMPH(UIModelBase):
 
         self.on_select(x, y)
 
+        if self.selection:
+            # Clicked on the group, say to drag it.
+            return
+
         if self.cpt_selected:
             cpt = self.selected
             if self.ui.debug:
@@ -545,28 +586,111 @@ class UIModelMPH(UIModelBase):
         if self.ground_node is None:
             self.ui.show_info_dialog('Suggest adding a ground node.')
 
-        try:
-            la = self.analysis_circuit.loop_analysis()
-        except Exception as e:
-            self.exception(e)
+        def on_done(eqns):
+            self.ui.show_equations_dialog(eqns, 'Mesh equations')
+
+        self.run_analysis('Calculating mesh equations',
+                          analysis.mesh_equations, (), on_done)
+
+    def drag_artists(self, cpts):
+        """Return the artists that change when dragging the components
+        cpts.  These are for the components sharing their nodes and
+        the cursors."""
+
+        ncpts = {}
+        for node in self.cpts_nodes(cpts):
+            for ncpt in node.connected:
+                ncpts[ncpt.name] = ncpt
+
+        artists = []
+        for ncpt in ncpts.values():
+            gcpt = getattr(ncpt, 'gcpt', None)
+            if gcpt is not None:
+                artists.extend(gcpt.artists)
+
+        for cursor in self.cursors:
+            if cursor.patch is not None:
+                artists.append(cursor.patch)
+        return artists
+
+    def drag_band(self, x, y):
+        """Drag out the rubber band for selecting a group."""
+
+        x0, y0 = self.select_pos
+        self.band = x0, y0, x, y
+        path = ((x0, y0), (x, y0), (x, y), (x0, y))
+
+        if not self.dragged:
+            self.dragged = True
+            self.band_patch = self.sketcher.stroke_polygon(
+                path, color='gray', alpha=0.2, fill=True)
+            self.ui.begin_animation(self.band_artists())
+        elif self.band_patch is not None:
+            self.band_patch.set_xy(path)
+
+        self.ui.animate(self.band_artists())
+
+    def band_artists(self):
+
+        artists = [cursor.patch for cursor in self.cursors
+                   if cursor.patch is not None]
+        if self.band_patch is not None:
+            artists.append(self.band_patch)
+        return artists
+
+    def release_band(self):
+        """Select the components within the rubber band."""
+
+        x0, y0, x1, y1 = self.band
+        self.band = None
+        if self.band_patch is not None:
+            self.band_patch.remove()
+            self.band_patch = None
+        self.ui.end_animation()
+
+        cpts = self.cpts_within(min(x0, x1), min(y0, y1),
+                                max(x0, x1), max(y0, y1))
+        if cpts == []:
             return
 
-        eqns = la.mesh_equations()
-        self.ui.show_equations_dialog(eqns, 'Mesh equations')
+        self.cursors.remove()
+        if len(cpts) == 1:
+            self.select(cpts[0])
+        else:
+            self.select_group(cpts)
+        self.redraw_dirty()
+        self.ui.refresh()
 
     def on_mouse_drag(self, x, y):
 
-        # Perhaps allow multiple cpts to be selected at once for dragging?
+        if x is None or y is None:
+            # Outside axes
+            return
 
-        if not self.selected or not self.cpt_selected:
+        if self.band is not None or (self.selected is None and
+                                     not self.selection):
+            self.drag_band(x, y)
             return
-        cpt = self.selected
+
+        cpts = self.selected_cpts
+        if cpts == []:
+            return
+        nodes = self.cpts_nodes(cpts)
 
         if not self.dragged:
             self.dragged = True
             self.last_pos = self.select_pos
-            node_positions = [(node.pos.x, node.pos.y) for node in cpt.nodes]
-            self.history.append(HistoryEvent('M', cpt, node_positions))
+            # The group is moved as one step to undo.
+            self.drag_event = self.history.append(self.move_event(cpts))
+
+            # Draw the components that move with their own artists
+            # rather than in the batched collections and cache
+            # everything else for blitting.
+            self.drag_batch = self.sketcher.batch
+            self.sketcher.batch = False
+            self.mark_dirty_nodes(nodes)
+            self.redraw_dirty()
+            self.ui.begin_animation(self.drag_artists(cpts))
 
         x0, y0 = self.last_pos
         self.last_pos = x, y
@@ -574,13 +698,39 @@ class UIModelMPH(UIModelBase):
         xshift = x - x0
         yshift = y - y0
 
-        for node in cpt.nodes:
-            # TODO: handle snap
-            node.pos.x += xshift
-            node.pos.y += yshift
+        # Move the cursors at the components' nodes.
+        positions = [(node.pos.x, node.pos.y) for node in nodes]
+        for cursor in self.cursors:
+            if cursor.position in positions:
+                cursor.move(xshift, yshift)
+
+        # The components sharing the nodes are redrawn in one pass.
+        self.nodes_move(nodes, xshift, yshift)
+        self.redraw_dirty()
+        self.ui.animate(self.drag_artists(cpts))
+
+    def on_mouse_release(self, x, y):
+
+        if not self.dragged:
+            return
+
+        self.dragged = False
+
+        if self.band is not None:
+            self.release_band()
+            return
+
+        if self.drag_event is not None:
+            self.move_done(self.drag_event)
+            self.drag_event = None
 
-        # TODO: only redraw cpts that have moved
-        self.on_redraw()
+        # Return the moved components to the batched collections.
+        self.sketcher.batch = self.drag_batch
+        cpts = self.selected_cpts
+        if cpts != []:
+            self.mark_dirty_nodes(self.cpts_nodes(cpts))
+            self.redraw_dirty()
+        self.ui.end_animation()
 
     def on_move(self, xshift, yshift):
 
@@ -606,14 +756,11 @@ class UIModelMPH(UIModelBase):
         if self.ground_node is None:
             self.ui.show_info_dialog('Suggest adding a ground node.')
 
-        try:
-            na = self.analysis_circuit.nodal_analysis()
-        except Exception as e:
-            self.exception(e)
-            return
+        def on_done(eqns):
+            self.ui.show_equations_dialog(eqns, 'Nodal equations')
 
-        eqns = na.nodal_equations()
-        self.ui.show_equations_dialog(eqns, 'Nodal equations')
+        self.run_analysis('Calculating nodal equations',
+                          analysis.nodal_equations, (), on_done)
 
     def on_new(self):
 
@@ -626,9 +773,21 @@ class UIModelMPH(UIModelBase):
 
     def on_paste(self):
 
-        if len(self.cursors) < 2:
-            # TODO, place cpt where mouse is...
+        if not self.clipboard:
             return
+
+        if len(self.clipboard) > 1 or len(self.cursors) < 2:
+            # Paste at the positive cursor or, without one, offset
+            # from where the components were copied.
+            # TODO, place cpts where mouse is...
+            if len(self.cursors) > 0:
+                self.paste_group(self.cursors[0].x, self.cursors[0].y)
+            else:
+                self.paste_group()
+            self.cursors.remove()
+            self.ui.refresh()
+            return
+
         x1 = self.cursors[0].x
         y1 = self.cursors[0].y
         x2 = self.cursors[1].x
@@ -662,6 +821,8 @@ class UIModelMPH(UIModelBase):
 
         self.clear()
         self.redraw()
+        # Clearing the axes also removes the cursors.
+        self.cursors.draw()
         self.ui.refresh()
 
     def on_right_click(self, x, y):
@@ -713,24 +874,32 @@ class UIModelMPH(UIModelBase):
 
     def on_select(self, x, y):
 
-        self.dragged = False
+        if self.dragged:
+            # Missed the button release
+            self.on_mouse_release(x, y)
         self.select_pos = x, y
 
         cpt = self.closest_cpt(x, y)
 
+        if cpt is not None and cpt.name in self.selection:
+            # Keep the group selected so that it can be dragged.
+            return
+        self.select_group([])
+
         if cpt is None:
             node = self.closest_node(x, y)
 
         if cpt:
             self.select(cpt)
-            # TODO: only redraw selected component
-            # Redraw to highlight selected component
-            self.on_redraw()
         elif node:
             self.select(node)
         else:
             self.select(None)
 
+        # Redraw to change highlighting of selected component
+        self.redraw_dirty()
+        self.ui.refresh()
+
     def on_show_new_circuit(self, cct):
 
         model = self.ui.new()
@@ -756,6 +925,7 @@ class UIModelMPH(UIModelBase):
 
     def on_view_macros(self):
 
+        from lcapy import Circuit
         from lcapy.system import tmpfilename
         from os import remove
 
@@ -783,7 +953,8 @@ class UIModelMPH(UIModelBase):
 
     def unselect(self):
 
-        self.selected = None
+        self.select(None)
+        self.select_group([])
         self.cursors.remove()
-        self.redraw()
+        self.redraw_dirty()
         self.ui.refresh()
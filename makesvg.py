@@ -1,6 +1,7 @@
 from lcapygui.ui.uimodelbase import UIModelBase
 from lcapygui.components.sketch import Sketch
 from lcapygui.components.cpt_maker import cpt_make_from_type
+from lcapygui.sketch_bundle import build_bundle
 
 
 def cpt_sketch_make(cpt, dstyle):
@@ -46,3 +47,6 @@ def make_all():
 
         cpt_type = v[2]
         make(cpt_type)
+
+    # Repack the sketches since the SVG files have changed.
+    build_bundle()
@@ -43,10 +43,13 @@ setup(
     entry_points={
         'console_scripts': [
             'lcapy-tk=lcapygui.scripts.lcapytk:main',
+            'lcapy-batch=lcapygui.scripts.lcapybatch:main',
+            'lcapy-server=lcapygui.scripts.lcapyserver:main',
             'sketchview=lcapygui.scripts.sketchview:main',
         ],
     },
     include_package_data=True,
-    package_data={'': ['data/svg/*/*.svg', 'data/lib/*/*.sch']},
+    package_data={'': ['data/svg/*/*.svg', 'data/lib/*/*.sch',
+                      'data/sketches.bundle']},
     python_requires=">=3.7"  # matched with lcapy
 )